@@ -1,8 +1,8 @@
 import json
 import os
 import re
-import requests
 import sys
+import time
 from urllib.parse import quote
 
 from bs4 import BeautifulSoup
@@ -11,6 +11,12 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Confirm, IntPrompt, Prompt
 from rich.table import Table
+from tmdb.shared.budget_ledger import BudgetLedger, QuotaExceeded, ensure_gemini_quota, gemini_usage
+from tmdb.shared.catalog_cache import load_catalog
+from tmdb.shared.catalog_index import CatalogIdIndex
+from tmdb.shared.io_utils import catalog_saved
+from tmdb.shared.http_transport import get_transport
+from tmdb.shared.snapshots import snapshot_catalog
 
 console = Console()
 
@@ -25,12 +31,14 @@ HEADERS = {
 
 load_dotenv(ENV_FILE)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "").strip()
+GEMINI_MODEL = "gemini-2.5-flash-preview-09-2025"
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta").strip().rstrip("/")
 
 def search_imdb(query):
     safe_query = query.strip()
     first_letter = safe_query[0].lower() if safe_query else "a"
     url = f"{IMDB_SUGGEST_URL}/{first_letter}/{quote(safe_query)}.json"
-    response = requests.get(url, headers=HEADERS, timeout=10)
+    response = get_transport().get(url, headers=HEADERS, timeout=10)
     response.raise_for_status()
     data = response.json()
 
@@ -62,7 +70,7 @@ def parse_duration(duration_str):
 
 def get_movie_details(imdb_id):
     url = f"https://www.imdb.com/title/{imdb_id}/"
-    response = requests.get(url, headers=HEADERS, timeout=10)
+    response = get_transport().get(url, headers=HEADERS, timeout=10)
 
     soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -173,32 +181,40 @@ Fields required:
 - stimulation_level (string): "Low", "Medium", or "High".
 """
 
+    ledger = BudgetLedger()
     try:
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-preview-09-2025:generateContent?key={GEMINI_API_KEY}"
+        ensure_gemini_quota(ledger)
+        url = f"{GEMINI_BASE_URL}/models/{GEMINI_MODEL}:generateContent?key={GEMINI_API_KEY}"
         payload = {
             "contents": [{"parts": [{"text": system_prompt}]}],
             "generationConfig": {"responseMimeType": "application/json"}
         }
 
-        response = requests.post(url, json=payload, headers={"Content-Type": "application/json"}, timeout=15)
+        started = time.perf_counter()
+        response = get_transport().post(url, json=payload, headers={"Content-Type": "application/json"}, timeout=15)
+        usage = gemini_usage(response.json()) if response.ok else {}
+        ledger.record("gemini", requests=1, model=GEMINI_MODEL, latency_seconds=time.perf_counter() - started, **usage)
         response.raise_for_status()
 
         result = response.json()
         raw_text = result["candidates"][0]["content"]["parts"][0]["text"]
         return json.loads(raw_text)
+    except QuotaExceeded as e:
+        console.print(f"[yellow]{e}. Skipping AI assessment.[/]")
+        return None
     except Exception as e:
         console.print(f"[red]AI Assessment Failed: {e}[/]")
         return None
 
 def load_shows():
-    if not os.path.exists(DATA_FILE):
-        return []
-    with open(DATA_FILE, 'r') as f:
-        return json.load(f)
+    # Parsed-catalog cache: no re-parse of shows.json per added show
+    return load_catalog(DATA_FILE) or []
 
 def save_shows(shows):
+    snapshot_catalog(load_shows(), "before-add_show")
     with open(DATA_FILE, 'w') as f:
         json.dump(shows, f, indent=2)
+    catalog_saved(shows, DATA_FILE)
 
 def main():
     use_ai = "--no-ai" not in sys.argv
@@ -324,9 +340,12 @@ def main():
         # 4. Save (check for duplicates by ID or by title+year)
         shows = load_shows()
 
-        # Check for existing entry by ID or by title+year
-        existing_by_id = next((s for s in shows if s['id'] == new_show['id']), None)
-        existing_by_title = next((s for s in shows if s['title'].lower() == new_show['title'].lower() and s.get('releaseYear', '').startswith(release_year[:4])), None)
+        # Check for existing entry by ID or by title+year (row lookups via the sidecar index)
+        catalog_index = CatalogIdIndex.load(DATA_FILE)
+        id_row = catalog_index.imdb_rows.get(new_show['id'])
+        existing_by_id = shows[id_row] if id_row is not None else None
+        existing_by_title = next((shows[row] for row in catalog_index.rows_for_title(new_show['title'])
+                                  if str(shows[row].get('releaseYear', '')).startswith(release_year[:4])), None)
         existing = existing_by_id or existing_by_title
 
         if existing:
@@ -0,0 +1,81 @@
+// Runs the TypeScript policy (src/utils/filter.ts) and title search
+// (src/utils/search.ts) against the parity cases shared with
+// scripts/tmdb/shared/classification.py and search_index.py. The Python side
+// runs with `python scripts/tmdb/7_export.py --verify`.
+//
+//   npm run check:parity
+//
+// The modules are bundled in memory with esbuild (installed with vite).
+import { readFileSync } from "node:fs";
+import { dirname, join } from "node:path";
+import { fileURLToPath } from "node:url";
+import { build } from "esbuild";
+
+const root = join(dirname(fileURLToPath(import.meta.url)), "..");
+
+const loadModule = async (entry) => {
+  const result = await build({
+    entryPoints: [join(root, entry)],
+    bundle: true,
+    format: "esm",
+    platform: "neutral",
+    write: false,
+    logLevel: "silent",
+  });
+  const source = Buffer.from(result.outputFiles[0].text).toString("base64");
+  return import(`data:text/javascript;base64,${source}`);
+};
+
+const { classifyShow, lookupRating } = await loadModule("src/utils/filter.ts");
+const { normalizeTitle, searchTitles, titleMatches } = await loadModule("src/utils/search.ts");
+const readFixture = (name) =>
+  JSON.parse(readFileSync(join(root, "scripts/tmdb/fixtures", name), "utf-8"));
+const fixture = readFixture("policy_cases.json");
+const searchFixture = readFixture("search_cases.json");
+
+const mismatches = [];
+const check = (label, actual, expected) => {
+  if (actual !== expected) {
+    mismatches.push(`${label}: ${JSON.stringify(actual)} fixture=${JSON.stringify(expected)}`);
+  }
+};
+
+for (const testCase of fixture.cases) {
+  const { codes, ...show } = fixture.shows[testCase.name];
+  const age = testCase.age ?? undefined;
+  const label = `${testCase.name} @ ${testCase.age}`;
+
+  // Policy path (no precomputed table)
+  const direct = classifyShow(show, age);
+  check(`${label} rating`, direct.rating, testCase.rating);
+  check(`${label} reasoning`, direct.reasoning, testCase.reasoning);
+
+  // Fast path with the table the export stage would emit
+  const ratingTable = { breakpoints: fixture.breakpoints, codes };
+  check(`${label} lookupRating`, lookupRating(ratingTable, age), testCase.rating);
+  const tabled = classifyShow({ ...show, ratingTable }, age);
+  check(`${label} table rating`, tabled.rating, testCase.rating);
+  check(`${label} table reasoning`, tabled.reasoning, testCase.reasoning);
+}
+
+const { titles, index } = searchFixture;
+for (const { title, key } of searchFixture.normalize) {
+  check(`normalize ${JSON.stringify(title)}`, normalizeTitle(title), key);
+}
+
+for (const { query, rows } of searchFixture.search) {
+  const label = `search ${JSON.stringify(query)}`;
+  check(label, JSON.stringify(searchTitles(index, (row) => titles[row], query)), JSON.stringify(rows));
+  const scanned = titles.flatMap((title, row) => (titleMatches(title, query) ? [row] : []));
+  check(`${label} (linear)`, JSON.stringify(scanned), JSON.stringify(rows));
+}
+
+if (mismatches.length) {
+  console.error(`${mismatches.length} parity mismatches:`);
+  for (const line of mismatches) console.error(`  - ${line}`);
+  process.exit(1);
+}
+console.log(
+  `TypeScript matches ${fixture.cases.length} policy and ` +
+    `${searchFixture.normalize.length + searchFixture.search.length} search parity cases`,
+);
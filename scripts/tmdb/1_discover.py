@@ -1,38 +1,22 @@
-import json
-import os
 from rich.console import Console
 from rich.progress import track
+from shared.catalog_index import CatalogIdIndex
 from shared.tmdb_client import TMDBClient
 from shared.config import TMDB_API_KEY, TMDB_BASE_URL, TMDB_IMAGE_BASE, TV_DISCOVERY_FILTERS, MOVIE_DISCOVERY_FILTERS, DISCOVERED_FILE
-from shared.io_utils import save_json
+from shared.io_utils import save_json, normalize_title
 from shared.models import DiscoveredItem
 
 console = Console()
 
-# Path to existing data
-SHOWS_DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "src", "data", "shows.json")
-
 def load_existing_data():
-    """Load existing shows to build exclusion and legacy sets"""
-    if not os.path.exists(SHOWS_DATA_FILE):
-        return set(), set()
-
+    """
+    Exclusion and legacy sets from the catalog's sidecar index (no shows.json
+    parse unless the index is stale). Shows with a numeric tmdbId are fully
+    managed; shows without one are legacy/manual entries we may "upgrade".
+    """
     try:
-        with open(SHOWS_DATA_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        existing_tmdb_ids = set()
-        legacy_titles = set()
-
-        for item in data:
-            # If it has a numeric tmdbId, it's fully managed
-            if item.get('tmdbId'):
-                existing_tmdb_ids.add(int(item['tmdbId']))
-            # If it has no tmdbId but has value, it's legacy/manual -> we might want to "upgrade" it if we find it
-            else:
-                legacy_titles.add(item['title'].lower().strip())
-
-        return existing_tmdb_ids, legacy_titles
+        index = CatalogIdIndex.load()
+        return index.tmdb_ids, index.legacy_titles()
     except Exception as e:
         console.print(f"[yellow]Warning: Could not load existing data: {e}[/]")
         return set(), set()
@@ -79,7 +63,7 @@ def discover_content(
 
                     # 2. Check overlap with existing DB
                     title = result.get('name') or result.get('title')
-                    is_legacy_upgrade = title and title.lower().strip() in legacy_titles
+                    is_legacy_upgrade = title and normalize_title(title) in legacy_titles
 
                     # If we ALREADY have this TMDB ID, skip it... UNLESS we want to force update (not implemented yet)
                     if tmdb_id in existing_ids:
@@ -2,9 +2,14 @@ from rich.console import Console
 from rich.progress import track
 from typing import Optional
 from shared.tmdb_client import TMDBClient
-from shared.config import TMDB_API_KEY, TMDB_BASE_URL, TMDB_IMAGE_BASE, DISCOVERED_FILE, ENRICHED_FILE
-from shared.io_utils import load_json, save_json
+from shared.budget_ledger import BudgetLedger
+from shared.config import (
+    TMDB_API_KEY, TMDB_BASE_URL, TMDB_IMAGE_BASE, TMDB_DAILY_REQUEST_BUDGET, DISCOVERED_FILE, ENRICHED_FILE
+)
+from shared.io_utils import load_json, save_json, normalize_title
 from shared.models import DiscoveredItem, EnrichedItem
+from shared.catalog_index import CatalogIdIndex
+from shared.work_scheduler import order_by_priority, priority_score
 
 console = Console()
 
@@ -107,8 +112,24 @@ def main():
     if len(enriched_items) > 0:
         console.print(f"[yellow]Resuming: {len(enriched_items)} already enriched, {len(remaining_items)} remaining.[/]\n")
 
+    # Most valuable titles first, so a budget stop leaves the long tail for tomorrow
+    legacy_titles = CatalogIdIndex.load().legacy_titles()  # Sidecar index, no shows.json parse
+    remaining_items = order_by_priority(remaining_items, lambda item: priority_score(
+        item.popularity, item.vote_average, item.release_date, normalize_title(item.title) in legacy_titles
+    ))
+
+    ledger = BudgetLedger()
+    budget = ledger.remaining("tmdb", TMDB_DAILY_REQUEST_BUDGET)
+    if budget is not None:
+        console.print(f"[dim]TMDB budget left today: {int(budget)} requests[/]")
+
     for index, item in enumerate(track(remaining_items, description="Fetching details"), start=1):
+        if ledger.exhausted("tmdb", TMDB_DAILY_REQUEST_BUDGET):
+            console.print(f"[yellow]Daily TMDB budget reached; {len(remaining_items) - index + 1} items left for the next run.[/]")
+            break
+
         enriched = enrich_item(client, item)
+        ledger.record("tmdb")
         if enriched:
             enriched_items.append(enriched)
 
@@ -1,20 +1,46 @@
+import sys
 from rich.console import Console
 from rich.progress import track
-from typing import Optional
+from typing import Dict, List, Optional
+from shared.budget_ledger import BudgetLedger, QuotaExceeded
+from shared.gemini_batch import BatchFailed, BatchJob
 from shared.gemini_client import GeminiClient
-from shared.config import GEMINI_API_KEY, ENRICHED_FILE, ASSESSED_FILE
-from shared.io_utils import load_json, save_json
-from shared.models import EnrichedItem, AIAssessment, AssessedItem
+from shared.http_transport import get_transport
+from shared.config import GEMINI_API_KEY, ENRICHED_FILE, ASSESSED_FILE, REVIEWED_FILE
+from shared.io_utils import load_json, save_json, normalize_title
+from shared.models import EnrichedItem, AIAssessment, AssessedItem, ReviewedItem
+from shared.preclassifier import MIN_CONFIDENCE, build_franchise_priors, item_key, preclassify
+from shared.similarity_index import SimilarityIndex
+from shared.catalog_index import CatalogIdIndex
+from shared.work_scheduler import order_by_priority, priority_score
 
 console = Console()
 SAVE_EVERY = 1
-BATCH_LIMIT = 500 # Max items to process in one run (set to 0 for unlimited)
+BATCH_LIMIT = 500 # Max items to process in one run (set to 0 for unlimited); daily budgets also apply
 
-def item_key(enriched: EnrichedItem) -> str:
-    """Stable key for resume logic."""
-    if enriched.imdb_id:
-        return enriched.imdb_id
-    return f"{enriched.media_type}:{enriched.tmdb_id}"
+def preclassify_item(enriched: EnrichedItem, priors) -> Optional[AssessedItem]:
+    """Rule-based assessment for obvious cases; None sends the item to Gemini"""
+    result = preclassify(enriched, priors)
+    if not result or result[1] < MIN_CONFIDENCE:
+        return None
+    assessment = result[0]
+    return AssessedItem(
+        enriched=enriched,
+        assessment=assessment,
+        flagged_for_review=assessment.needs_review()
+    )
+
+def derive_item(enriched: EnrichedItem, similarity: SimilarityIndex) -> Optional[AssessedItem]:
+    """Reuse a near-duplicate reviewed title's decision (sequels, specials, movie versions)"""
+    result = similarity.match(enriched)
+    if not result:
+        return None
+    assessment = result[0]
+    return AssessedItem(
+        enriched=enriched,
+        assessment=assessment,
+        flagged_for_review=assessment.needs_review()
+    )
 
 def assess_item(client: GeminiClient, enriched: EnrichedItem) -> Optional[AssessedItem]:
     """Request AI safety assessment"""
@@ -30,19 +56,7 @@ def assess_item(client: GeminiClient, enriched: EnrichedItem) -> Optional[Assess
         if not assessment_data:
             return None
 
-        assessment = AIAssessment(
-            rating=assessment_data.get('rating', 'Caution'),
-            min_age=float(assessment_data.get('min_age', 3)),
-            max_age=float(assessment_data.get('max_age', 99)),
-            stimulation_level=assessment_data.get('stimulation_level', 'Medium'),
-            has_lgbtq=bool(assessment_data.get('has_lgbtq', False)),
-            has_violence=bool(assessment_data.get('has_violence', False)),
-            has_scary=bool(assessment_data.get('has_scary', False)),
-            is_educational=bool(assessment_data.get('is_educational', False)),
-            reasoning=assessment_data.get('reasoning', ''),
-            safe_above_age=assessment_data.get('safe_above_age'),
-            is_episodic_issue=bool(assessment_data.get('is_episodic_issue', False))
-        )
+        assessment = AIAssessment.from_response(assessment_data)
 
         assessed = AssessedItem(
             enriched=enriched,
@@ -52,10 +66,66 @@ def assess_item(client: GeminiClient, enriched: EnrichedItem) -> Optional[Assess
 
         return assessed
 
+    except QuotaExceeded:
+        raise
     except Exception as e:
         console.print(f"[red]Error assessing {enriched.title}: {e}[/]")
         return None
 
+def run_batch(
+    client: GeminiClient,
+    batch: BatchJob,
+    items: List[EnrichedItem],
+    enriched_items: List[EnrichedItem],
+    assessed_items: List[AssessedItem],
+    assessed_by_key: Dict[str, AssessedItem]
+) -> int:
+    """
+    --batch: assess items in one Gemini batch job (or resume the pending one)
+    and merge the verdicts into assessed_items. Returns the number merged.
+    """
+    if batch.active:
+        console.print(f"[cyan]Resuming batch job ({batch.phase}, {batch.state['count']} requests).[/]")
+    else:
+        count = batch.write(client.model, (
+            (item_key(item), client.batch_request(
+                item.title, item.release_year or "", item.synopsis, item.genres, item.certification
+            ))
+            for item in items
+        ))
+        console.print(f"[cyan]Wrote {count} requests to {batch.input_path}[/]")
+
+    try:
+        batch.run(on_status=lambda state, stats: console.print(
+            f"[dim]{batch.state.get('batch_name', 'batch')}: {state} {stats or ''}[/]"
+        ))
+    except BatchFailed as e:
+        console.print(f"[red]{e}; items stay pending for the next run.[/]")
+        batch.finish()
+        return 0
+    except KeyboardInterrupt:
+        console.print(f"\n[yellow]Interrupted ({batch.phase}); run with --batch again to resume.[/]")
+        return 0
+
+    # Keys are looked up against everything enriched: the job may predate this run's pending list
+    enriched_by_key = {item_key(item): item for item in enriched_items}
+    merged = 0
+    for key, text in batch.results():
+        enriched = enriched_by_key.get(key)
+        if enriched is None or key in assessed_by_key:
+            continue
+        verdict = client.batch_verdict(enriched.title, text, batch.state["model"])
+        if not verdict:
+            continue
+        assessment = AIAssessment.from_response(verdict)
+        assessed = AssessedItem(enriched=enriched, assessment=assessment, flagged_for_review=assessment.needs_review())
+        assessed_items.append(assessed)
+        assessed_by_key[key] = assessed
+        merged += 1
+    save_json(ASSESSED_FILE, [entry.to_dict() for entry in assessed_items])
+    batch.finish()
+    return merged
+
 def main():
     console.rule("[bold blue]Stage 3: AI Safety Assessment[/]")
 
@@ -72,7 +142,16 @@ def main():
         console.print("[red]GEMINI_API_KEY not found in .env file. Please add it and try again.[/]")
         return
 
-    client = GeminiClient(GEMINI_API_KEY)
+    ledger = BudgetLedger()
+    client = GeminiClient(GEMINI_API_KEY, ledger=ledger)
+
+    # A submitted batch holds the pending items; interactive calls would assess them twice
+    batch = BatchJob("3_assess", GEMINI_API_KEY, ledger=ledger)
+    batch_mode = "--batch" in sys.argv
+    if batch.active and not batch_mode:
+        console.print(f"[yellow]A Gemini batch job is pending ({batch.phase}, {batch.state['count']} requests). "
+                      f"Run with --batch to resume it before assessing interactively.[/]")
+        return
 
     existing_assessed = load_json(ASSESSED_FILE) or []
     assessed_items = [AssessedItem.from_dict(item) for item in existing_assessed]
@@ -81,10 +160,56 @@ def main():
 
     remaining_items = [item for item in enriched_items if item_key(item) not in assessed_by_key]
 
-    if not remaining_items:
+    if not remaining_items and not batch.active:
         console.print("[green]All items already assessed. Nothing to do.[/]")
         return
 
+    # Obvious cases (preschool certifications, adult ratings) and near-duplicates of
+    # reviewed titles are decided without Gemini
+    reviewed_items = [ReviewedItem.from_dict(item) for item in load_json(REVIEWED_FILE) or []]
+    priors = build_franchise_priors(reviewed_items)
+    similarity = SimilarityIndex.load(reviewed_items)
+    similarity.save()
+    ambiguous_items = []
+    derived_count = 0
+    for item in remaining_items:
+        assessed = preclassify_item(item, priors)
+        if not assessed:
+            assessed = derive_item(item, similarity)
+            derived_count += bool(assessed)
+        if not assessed:
+            ambiguous_items.append(item)
+            continue
+        assessed_items.append(assessed)
+        assessed_by_key[item_key(item)] = assessed
+        if assessed.flagged_for_review:
+            flagged_count += 1
+    preclassified_count = len(remaining_items) - len(ambiguous_items) - derived_count
+    if preclassified_count:
+        console.print(f"[green]Pre-classified {preclassified_count} items from metadata (no Gemini call).[/]")
+    if derived_count:
+        console.print(f"[green]Reused {derived_count} reviewed assessments for near-duplicate titles.[/]")
+    if preclassified_count or derived_count:
+        save_json(ASSESSED_FILE, [entry.to_dict() for entry in assessed_items])
+    remaining_items = ambiguous_items
+
+    if not remaining_items and not batch.active:
+        console.print("[green]No ambiguous items left for Gemini.[/]")
+        return
+
+    # Most valuable titles first, so the day's quota goes to them
+    legacy_titles = CatalogIdIndex.load().legacy_titles()  # Sidecar index, no shows.json parse
+    remaining_items = order_by_priority(remaining_items, lambda item: priority_score(
+        item.popularity, item.vote_average, item.release_year, normalize_title(item.title) in legacy_titles
+    ))
+
+    if batch_mode:
+        # Offline batch job: no per-run limit, no tiering (batch pricing already halves the cost)
+        merged = run_batch(client, batch, remaining_items, enriched_items, assessed_items, assessed_by_key)
+        console.print(f"\n[green]Merged {merged} batch verdicts; {len(assessed_items)}/{len(enriched_items)} assessed.[/]")
+        console.print(f"[dim]Gemini responses: {client.repair_summary()}[/]")
+        return
+
     # Apply batch limit
     if BATCH_LIMIT > 0 and len(remaining_items) > BATCH_LIMIT:
         console.print(f"[yellow]Batch limit active: Processing {BATCH_LIMIT} of {len(remaining_items)} remaining items.[/]")
@@ -93,7 +218,11 @@ def main():
         console.print(f"[cyan]Resuming: {len(assessed_items)} already assessed, {len(remaining_items)} remaining.[/]\n")
 
     for index, item in enumerate(track(remaining_items, description="AI Assessment"), start=1):
-        assessed = assess_item(client, item)
+        try:
+            assessed = assess_item(client, item)
+        except QuotaExceeded as e:
+            console.print(f"[yellow]{e}; {len(remaining_items) - index + 1} items left for the next run.[/]")
+            break
         if assessed:
             assessed_items.append(assessed)
             assessed_by_key[item_key(item)] = assessed
@@ -102,9 +231,15 @@ def main():
 
         if index % SAVE_EVERY == 0:
             save_json(ASSESSED_FILE, [entry.to_dict() for entry in assessed_items])
+    client.close()  # Drop the rubric cache rather than pay storage until its TTL
 
     console.print(f"\n[green]Successfully assessed: {len(assessed_items)}/{len(enriched_items)}[/]")
     console.print(f"[yellow]Flagged for review: {flagged_count}[/]")
+    if client.latency:
+        console.print(f"[dim]Gemini latency: {client.latency_summary()}[/]")
+        console.print(f"[dim]Gemini responses: {client.repair_summary()}[/]")
+        console.print(f"[dim]Rubric context cache: {client.cache_summary()}[/]")
+        console.print(f"[dim]HTTP: {get_transport().summary()}[/]")
 
     # Save to staging
     save_json(ASSESSED_FILE, [item.to_dict() for item in assessed_items])
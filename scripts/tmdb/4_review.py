@@ -26,6 +26,14 @@ def display_item_details(item: AssessedItem):
     if ai.has_scary:
         suggested_tags.append("Scary Imagery")
 
+    # Where the verdict came from
+    if ai.source == "rules":
+        origin = " (rule-based, no Gemini call)"
+    elif ai.source == "derived":
+        origin = f" (derived from {ai.derived_from})"
+    else:
+        origin = f" ({ai.model})" if ai.model else ""
+
     details = f"""
 [bold cyan]Title:[/] {enriched.title} ({enriched.release_year})
 [bold cyan]TMDB ID:[/] {enriched.tmdb_id} | [bold cyan]IMDb ID:[/] {enriched.imdb_id or 'N/A'}
@@ -39,7 +47,7 @@ def display_item_details(item: AssessedItem):
 [bold yellow]Platforms:[/] {', '.join(enriched.platforms) or 'None found'}
 
 [bold green]AI Assessment:[/]
-  Rating: {ai.rating}
+  Rating: {ai.rating}{origin}
   Ages: {format_age_label(ai.min_age)} - {format_age_label(ai.max_age)}
   Stimulation: {ai.stimulation_level}
   Tags: {', '.join(suggested_tags) or 'None'}
@@ -1,16 +1,15 @@
-import re
 from rich.console import Console
 from rich.table import Table
 from rich.prompt import Confirm
-from shared.config import REVIEWED_FILE, SHOWS_FILE
+from shared.catalog_export import export_catalog
+from shared.catalog_index import CatalogIdIndex
+from shared.config import REVIEWED_FILE, SHOWS_FILE, CATALOG_EXPORT_DIR
 from shared.io_utils import load_json, save_json
 from shared.models import ReviewedItem
+from shared.snapshots import snapshot_catalog
 
 console = Console()
 
-def normalize_title(title: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "", (title or "").casefold())
-
 def main():
     console.rule("[bold blue]Stage 5: Import to shows.json[/]")
 
@@ -23,19 +22,9 @@ def main():
     reviewed_items = [ReviewedItem.from_dict(item) for item in reviewed_data]
     console.print(f"[cyan]Found {len(reviewed_items)} reviewed items[/]\n")
 
-    # Load existing shows
+    # Load existing shows; id/title matches come from the sidecar index
     shows = load_json(SHOWS_FILE) or []
-    existing_by_id = {}
-    existing_by_title = {}
-
-    for index, show in enumerate(shows):
-        show_id = show.get("id")
-        if show_id:
-            existing_by_id[show_id] = index
-
-        title_key = normalize_title(show.get("title", ""))
-        if title_key:
-            existing_by_title.setdefault(title_key, []).append(index)
+    catalog_index = CatalogIdIndex.load()
 
     overwrite_existing = Confirm.ask(
         "Overwrite existing shows when a match is found?",
@@ -52,13 +41,13 @@ def main():
         match_index = None
         action = "Add"
 
-        if show_data.get("id") and show_data["id"] in existing_by_id:
-            match_index = existing_by_id[show_data["id"]]
+        if show_data.get("id") and show_data["id"] in catalog_index.imdb_rows:
+            match_index = catalog_index.imdb_rows[show_data["id"]]
         else:
-            title_key = normalize_title(show_data.get("title", ""))
-            if title_key in existing_by_title and len(existing_by_title[title_key]) == 1:
-                match_index = existing_by_title[title_key][0]
-            elif title_key in existing_by_title and len(existing_by_title[title_key]) > 1:
+            title_rows = catalog_index.rows_for_title(show_data.get("title", ""))
+            if len(title_rows) == 1:
+                match_index = title_rows[0]
+            elif len(title_rows) > 1:
                 action = "Skip (ambiguous title)"
 
         if match_index is not None:
@@ -107,6 +96,11 @@ def main():
         console.print("[yellow]Import cancelled[/]")
         return
 
+    # Snapshot before the in-place changes below
+    snapshot_id = snapshot_catalog(shows, "before-5_import")
+    if snapshot_id:
+        console.print(f"[dim]Previous catalog kept as snapshot {snapshot_id}[/]")
+
     # Apply changes
     for show_data, action, match_index in preview_rows:
         if action == "Replace" and match_index is not None:
@@ -119,5 +113,8 @@ def main():
     console.print(f"[bold green]✓ Successfully imported {add_count} shows and replaced {replace_count} shows in {SHOWS_FILE}[/]")
     console.print(f"[green]Total shows in database: {len(shows)}[/]")
 
+    export_catalog(shows, CATALOG_EXPORT_DIR)
+    console.print(f"[green]Exported frontend catalog to {CATALOG_EXPORT_DIR}[/]")
+
 if __name__ == "__main__":
     main()
@@ -1,76 +1,223 @@
 """
 Stage 6: Re-assess existing shows.json entries
 
-Only re-assesses shows that:
-1. Have Violence or Scary Imagery tags (need safeAboveAge)
-2. Don't have safeAboveAge set yet
-3. Have rating of Caution or Unsafe (may benefit from age-aware logic)
+Selects shows through shared/reassess_rules.py: shows whose synopsis or the
+rubric changed since their recorded assessmentFingerprint, plus shows without
+a fingerprint that match the active rules (REASSESS_RULES, default "unsafe":
+targeting episodic false positives). Unchanged shows are skipped.
 
 Updates shows.json in place, preserving all other fields.
+
+    python 6_reassess.py                      # concurrent requests, journaled (resumable)
+    python 6_reassess.py --workers 8          # default 4
+    python 6_reassess.py --batch              # one offline Gemini batch job (resumable)
+    python 6_reassess.py --rules unsafe,violent-without-age
+    python 6_reassess.py --force              # ignore fingerprints for rule matches
+    python 6_reassess.py --dry-run            # list the selection and exit
 """
-import json
-from datetime import datetime
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
 from rich.console import Console
 from rich.progress import track
 from rich.prompt import Confirm
-from shared.gemini_client import GeminiClient
-from shared.config import GEMINI_API_KEY, SHOWS_FILE
+from shared.budget_ledger import BudgetLedger, QuotaExceeded
+from shared.catalog_cache import load_catalog
+from shared.gemini_batch import BatchFailed, BatchJob
+from shared.gemini_client import PROMPT_VERSION, GeminiClient
+from shared.http_transport import get_transport
+from shared.config import (
+    GEMINI_API_KEY, GEMINI_MODEL, GEMINI_FAST_MODEL, SHOWS_FILE, REASSESS_RULES, REASSESS_ON_MODEL_CHANGE, REASSESS_JOURNAL_FILE
+)
+from shared.io_utils import save_json_atomic
+from shared.journal import Journal
+from shared.reassess_rules import FINGERPRINT_FIELD, active_rules, fingerprint, selection_reason
+from shared.snapshots import snapshot_catalog
 
 console = Console()
+WORKERS = 4  # Concurrent requests; keep <= HTTP_POOL_MAXSIZE. The Gemini throttle still spaces request starts
+
+def cli_option(name: str) -> Optional[str]:
+    if name in sys.argv:
+        return sys.argv[sys.argv.index(name) + 1]
+    return None
+
+def tiered_show(show: dict) -> bool:
+    """
+    Shows now rated Caution/Unsafe would most likely get a Caution/Unsafe first-pass
+    verdict, which escalates anyway; Safe shows (re-selected because their synopsis or
+    the rubric changed) usually stay Safe, so the cheap first pass can settle them
+    """
+    return show.get('rating') == 'Safe'
+
+def routed_models(show: dict) -> tuple:
+    """Models whose verdict fetch_assessment() would keep for this show"""
+    if tiered_show(show) and GEMINI_FAST_MODEL and GEMINI_FAST_MODEL != GEMINI_MODEL:
+        return (GEMINI_FAST_MODEL, GEMINI_MODEL)
+    return (GEMINI_MODEL,)
+
+def reassessment_reason(show: dict) -> Optional[str]:
+    """Why a show needs re-assessment (see shared/reassess_rules.py), or None"""
+    return selection_reason(
+        show,
+        active_rules(cli_option("--rules") or REASSESS_RULES),
+        PROMPT_VERSION,
+        models=routed_models(show) if REASSESS_ON_MODEL_CHANGE else (),
+        force="--force" in sys.argv
+    )
 
 def needs_reassessment(show: dict) -> bool:
     """Determine if a show needs re-assessment."""
-    tags = show.get('tags', [])
-    has_concerning_tags = 'Violence' in tags or 'Scary Imagery' in tags
-    missing_safe_above = show.get('safeAboveAge') is None
-    is_caution = show.get('rating') == 'Caution'
-    is_unsafe = show.get('rating') == 'Unsafe'
-
-    # Re-assess if:
-    # 1. Currently Unsafe (Targeting episodic false positives per user request)
-    return is_unsafe
-
-def reassess_show(client: GeminiClient, show: dict) -> dict:
-    """Re-assess a single show and update its fields."""
-    try:
-        # Build genres from tags (approximate)
-        genres = []
-        if 'Educational' in show.get('tags', []):
-            genres.append('Family')
-        if 'Fantasy' in show.get('tags', []):
-            genres.append('Fantasy')
-        if 'Action' in show.get('tags', []):
-            genres.append('Action')
+    return reassessment_reason(show) is not None
+
+def show_genres(show: dict) -> list:
+    """Build genres from tags (approximate)"""
+    genres = []
+    if 'Educational' in show.get('tags', []):
+        genres.append('Family')
+    if 'Fantasy' in show.get('tags', []):
+        genres.append('Fantasy')
+    if 'Action' in show.get('tags', []):
+        genres.append('Action')
+    return genres
+
+def apply_assessment(show: dict, assessment: dict) -> dict:
+    """Update only the relevant fields, preserve everything else"""
+    updated = show.copy()
+    updated['safeAboveAge'] = assessment.get('safe_above_age')
+    updated['isEpisodicIssue'] = assessment.get('is_episodic_issue', False)
+
+    # Optionally update rating based on new assessment if it makes sense
+    new_rating = assessment.get('rating', show['rating'])
+    if new_rating != show['rating']:
+        console.print(f"  [dim]{show['title']}: {show['rating']} → {new_rating}[/]")
+    updated['rating'] = new_rating
+    updated['reasoning'] = assessment.get('reasoning', show.get('reasoning', ''))
+    updated[FINGERPRINT_FIELD] = fingerprint(show, PROMPT_VERSION, assessment.get('model'))
 
+    return updated
+
+def show_key(show: dict) -> str:
+    """Journal and batch key (ids can be ints in older entries)"""
+    return str(show.get('id') or show.get('tmdbId'))
+
+def fetch_assessment(client: GeminiClient, show: dict) -> Optional[dict]:
+    """Gemini verdict for a single show, or None (runs on worker threads)"""
+    try:
         assessment = client.assess_content_safety(
             title=show['title'],
             year=show.get('releaseYear', ''),
             synopsis=show.get('synopsis', ''),
-            genres=genres,
-            certification=None
+            genres=show_genres(show),
+            certification=None,
+            tiered=tiered_show(show)
         )
 
         if not assessment:
             console.print(f"[yellow]Warning: No assessment for {show['title']}[/]")
-            return show
+        return assessment
 
-        # Update only the relevant fields, preserve everything else
-        updated = show.copy()
-        updated['safeAboveAge'] = assessment.get('safe_above_age')
-        updated['isEpisodicIssue'] = assessment.get('is_episodic_issue', False)
+    except QuotaExceeded:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error reassessing {show['title']}: {e}[/]")
+        return None
 
-        # Optionally update rating based on new assessment if it makes sense
-        new_rating = assessment.get('rating', show['rating'])
-        if new_rating != show['rating']:
-            console.print(f"  [dim]{show['title']}: {show['rating']} → {new_rating}[/]")
-        updated['rating'] = new_rating
-        updated['reasoning'] = assessment.get('reasoning', show.get('reasoning', ''))
+def run_concurrent(client: GeminiClient, to_reassess: list, shows_by_id: dict, journal: Journal, workers: int):
+    """
+    Re-assess shows on a bounded worker pool, journaling each verdict as it
+    arrives. Verdicts already in the journal (from an interrupted run) are
+    applied without a request. Returns the number of shows updated, or None
+    when interrupted (the journal is kept for the next run).
+    """
+    keys = {str(key): key for key in shows_by_id}
+    updated_count = 0
+    recovered = journal.load()
+    for key, assessment in recovered.items():
+        if key in keys:
+            shows_by_id[keys[key]] = apply_assessment(shows_by_id[keys[key]], assessment)
+            updated_count += 1
+    if recovered:
+        console.print(f"[cyan]Resuming: {updated_count} re-assessments recovered from {journal.path}[/]")
 
-        return updated
+    pending = [show for show in to_reassess if show_key(show) not in recovered]
+    stop = threading.Event()  # Set on quota exhaustion or Ctrl-C: queued shows are not sent
 
-    except Exception as e:
-        console.print(f"[red]Error reassessing {show['title']}: {e}[/]")
-        return show
+    def work(show: dict):
+        if stop.is_set():
+            return show, None
+        assessment = fetch_assessment(client, show)
+        if assessment:
+            journal.append(show_key(show), assessment)
+        return show, assessment
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reassess")
+    futures = [pool.submit(work, show) for show in pending]
+    try:
+        for future in track(as_completed(futures), total=len(futures), description="Re-assessing"):
+            try:
+                show, assessment = future.result()
+            except QuotaExceeded as e:
+                if not stop.is_set():
+                    console.print(f"[yellow]{e}; saving what was re-assessed so far.[/]")
+                    stop.set()
+                continue
+            if assessment:
+                shows_by_id[keys[show_key(show)]] = apply_assessment(show, assessment)
+                updated_count += 1
+    except KeyboardInterrupt:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+        console.print(f"\n[yellow]Interrupted; completed re-assessments are in {journal.path}. "
+                      f"Run again to resume.[/]")
+        return None
+    pool.shutdown()
+    return updated_count
+
+def run_batch(client: GeminiClient, batch: BatchJob, to_reassess: list, shows_by_id: dict):
+    """
+    --batch: re-assess shows in one Gemini batch job (or resume the pending
+    one), updating shows_by_id. Returns (job, shows updated), or (None, 0)
+    when there is nothing to save yet.
+    """
+    if batch.active:
+        console.print(f"[cyan]Resuming batch job ({batch.phase}, {batch.state['count']} requests).[/]")
+    else:
+        count = batch.write(client.model, (
+            (str(show.get('id') or show.get('tmdbId')), client.batch_request(
+                show['title'], show.get('releaseYear', ''), show.get('synopsis', ''), show_genres(show), None
+            ))
+            for show in to_reassess
+        ))
+        console.print(f"[cyan]Wrote {count} requests to {batch.input_path}[/]")
+
+    try:
+        batch.run(on_status=lambda state, stats: console.print(
+            f"[dim]{batch.state.get('batch_name', 'batch')}: {state} {stats or ''}[/]"
+        ))
+    except BatchFailed as e:
+        console.print(f"[red]{e}; run again to resubmit.[/]")
+        batch.finish()
+        return None, 0
+    except KeyboardInterrupt:
+        console.print(f"\n[yellow]Interrupted ({batch.phase}); run with --batch again to resume.[/]")
+        return None, 0
+
+    keys = {str(key): key for key in shows_by_id}
+    updated_count = 0
+    for key, text in batch.results():
+        show = shows_by_id.get(keys.get(key))
+        if show is None:
+            continue
+        assessment = client.batch_verdict(show['title'], text, batch.state["model"])
+        if not assessment:
+            console.print(f"[yellow]Warning: No assessment for {show['title']}[/]")
+            continue
+        shows_by_id[keys[key]] = apply_assessment(show, assessment)
+        updated_count += 1
+    return batch, updated_count
 
 def main():
     console.rule("[bold blue]Stage 6: Re-assess Existing Shows[/]")
@@ -79,45 +226,71 @@ def main():
         console.print("[red]GEMINI_API_KEY not found in .env file.[/]")
         return
 
-    # Load shows.json
-    try:
-        with open(SHOWS_FILE, 'r', encoding='utf-8') as f:
-            shows = json.load(f)
-    except FileNotFoundError:
+    # Load shows.json (parsed-catalog cache when unchanged)
+    shows = load_catalog()
+    if shows is None:
         console.print(f"[red]Shows file not found: {SHOWS_FILE}[/]")
         return
 
     console.print(f"[cyan]Loaded {len(shows)} shows from shows.json[/]")
 
+    # A submitted batch holds the selected shows; interactive calls would assess them twice
+    ledger = BudgetLedger()
+    batch = BatchJob("6_reassess", GEMINI_API_KEY, ledger=ledger)
+    batch_mode = "--batch" in sys.argv
+    if batch.active and not batch_mode:
+        console.print(f"[yellow]A Gemini batch job is pending ({batch.phase}, {batch.state['count']} requests). "
+                      f"Run with --batch to resume it before re-assessing interactively.[/]")
+        return
+
     # Find shows needing re-assessment
-    to_reassess = [s for s in shows if needs_reassessment(s)]
+    try:
+        reasons = {id(s): reassessment_reason(s) for s in shows}
+    except ValueError as e:
+        console.print(f"[red]{e}[/]")
+        return
+    to_reassess = [s for s in shows if reasons[id(s)]]
 
-    if not to_reassess:
+    if not to_reassess and not batch.active:
         console.print("[green]No shows need re-assessment![/]")
         return
 
+    if batch.active:
+        console.print(f"[cyan]A batch job is pending ({batch.phase}, {batch.state['count']} requests); "
+                      f"it is resumed instead of submitting the shows below.[/]")
     console.print(f"[yellow]Found {len(to_reassess)} shows needing re-assessment:[/]")
-    for show in to_reassess[:10]:
-        console.print(f"  - {show['title']} ({show.get('rating', 'N/A')})")
-    if len(to_reassess) > 10:
-        console.print(f"  ... and {len(to_reassess) - 10} more")
+    for reason, count in Counter(reasons[id(s)] for s in to_reassess).most_common():
+        console.print(f"  [dim]{reason}: {count}[/]")
+    listed = to_reassess if "--dry-run" in sys.argv else to_reassess[:10]
+    for show in listed:
+        console.print(f"  - {show['title']} ({show.get('rating', 'N/A')}; {reasons[id(show)]})")
+    if len(to_reassess) > len(listed):
+        console.print(f"  ... and {len(to_reassess) - len(listed)} more")
+    if "--dry-run" in sys.argv:
+        return
 
     if not Confirm.ask("\nProceed with re-assessment?", default=True):
         console.print("[dim]Cancelled.[/]")
         return
 
     # Initialize client and process
-    client = GeminiClient(GEMINI_API_KEY)
+    workers = int(cli_option("--workers") or WORKERS)
+    client = GeminiClient(GEMINI_API_KEY, ledger=ledger, concurrency=1 if batch_mode else workers)
+    journal = Journal(REASSESS_JOURNAL_FILE)
 
     # Build lookup for quick updates
     shows_by_id = {s.get('id') or s.get('tmdbId'): s for s in shows}
 
     updated_count = 0
-    for show in track(to_reassess, description="Re-assessing"):
-        show_key = show.get('id') or show.get('tmdbId')
-        updated_show = reassess_show(client, show)
-        shows_by_id[show_key] = updated_show
-        updated_count += 1
+    if batch_mode:
+        job, updated_count = run_batch(client, batch, to_reassess, shows_by_id)
+        if job is None:
+            return
+    else:
+        updated_count = run_concurrent(client, to_reassess, shows_by_id, journal, workers)
+        client.close()  # Drop the rubric cache rather than pay storage until its TTL
+        if updated_count is None:
+            return
 
     # Rebuild list preserving order
     updated_shows = []
@@ -128,16 +301,23 @@ def main():
             updated_shows.append(shows_by_id.get(key, show))
             seen_keys.add(key)
 
-    # Backup and save
-    backup_file = SHOWS_FILE.replace('.json', f'_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
-    with open(backup_file, 'w', encoding='utf-8') as f:
-        json.dump(shows, f, indent=2, ensure_ascii=False)
-    console.print(f"[dim]Backup saved to {backup_file}[/]")
+    # Snapshot (only shows changed since the period's base are stored) and save
+    snapshot_id = snapshot_catalog(shows, "before-6_reassess")
+    if snapshot_id:
+        console.print(f"[dim]Previous catalog kept as snapshot {snapshot_id}[/]")
 
-    with open(SHOWS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(updated_shows, f, indent=2, ensure_ascii=False)
+    # Single atomic swap; only then are the journal and batch results disposable
+    save_json_atomic(SHOWS_FILE, updated_shows)
+    journal.clear()
+    if batch_mode:
+        batch.finish()
 
     console.print(f"\n[bold green]✓ Re-assessed {updated_count} shows[/]")
+    if client.latency:
+        console.print(f"[dim]Gemini latency: {client.latency_summary()}[/]")
+        console.print(f"[dim]Gemini responses: {client.repair_summary()}[/]")
+        console.print(f"[dim]Rubric context cache: {client.cache_summary()}[/]")
+        console.print(f"[dim]HTTP: {get_transport().summary()}[/]")
     console.print(f"[bold green]✓ Updated {SHOWS_FILE}[/]")
 
 if __name__ == "__main__":
@@ -0,0 +1,77 @@
+"""
+Stage 7: Export shows.json for the frontend
+
+Writes a compact card-grid payload (list.json) plus detail chunks bucketed
+by id, each precompressed as gzip and (when available) brotli. The list
+carries per-show rating tables (see shared/classification.py) and a
+trigram title index is written next to it (see shared/search_index.py).
+
+Pass --verify to check the policy and title search against the parity cases
+they share with src/utils/filter.ts and search.ts (the TypeScript side runs
+with `npm run check:parity`), that the rating tables decode back to the
+policy, and the search index against a linear title scan.
+"""
+import os
+import sys
+from rich.console import Console
+from shared.catalog_export import export_catalog
+from shared.classification import build_rating_tables, verify_policy_fixture, verify_rating_tables
+from shared.search_index import build_search_index, verify_search, verify_search_fixture
+from shared.config import SHOWS_FILE, CATALOG_EXPORT_DIR
+from shared.io_utils import load_json
+
+console = Console()
+
+def main():
+    console.rule("[bold blue]Stage 7: Export Catalog[/]")
+
+    shows = load_json(SHOWS_FILE)
+    if not shows:
+        console.print(f"[red]No shows found in {SHOWS_FILE}[/]")
+        return
+
+    if "--verify" in sys.argv:
+        mismatches = verify_policy_fixture()
+        if mismatches:
+            console.print(f"[red]{len(mismatches)} policy parity mismatches:[/]")
+            for line in mismatches[:20]:
+                console.print(f"  - {line}")
+            return
+        console.print("[green]Python policy matches fixtures/policy_cases.json "
+                      "(run `npm run check:parity` for the TypeScript side)[/]")
+
+        breakpoints, tables = build_rating_tables(shows)
+        mismatches = verify_rating_tables(shows, breakpoints, tables)
+        if mismatches:
+            console.print(f"[red]{len(mismatches)} rating table mismatches:[/]")
+            for line in mismatches[:20]:
+                console.print(f"  - {line}")
+            return
+        console.print(f"[green]Rating tables decode to the Python policy ({len(breakpoints)} age breakpoints)[/]")
+
+        mismatches = verify_search_fixture()
+        if mismatches:
+            console.print(f"[red]{len(mismatches)} search parity mismatches:[/]")
+            for line in mismatches[:20]:
+                console.print(f"  - {line}")
+            return
+        console.print("[green]Title search matches fixtures/search_cases.json[/]")
+
+        titles = [show["title"] for show in shows if show.get("id")]
+        mismatches = verify_search(build_search_index(titles), titles)
+        if mismatches:
+            console.print(f"[red]{len(mismatches)} search index mismatches:[/]")
+            for line in mismatches[:20]:
+                console.print(f"  - {line}")
+            return
+        console.print("[green]Search index matches a linear title scan[/]")
+
+    list_bytes, detail_files = export_catalog(shows, CATALOG_EXPORT_DIR)
+    source_bytes = os.path.getsize(SHOWS_FILE)
+
+    console.print(f"[cyan]List payload: {list_bytes / 1024:.0f} KB (shows.json: {source_bytes / 1024:.0f} KB)[/]")
+    console.print(f"[cyan]Detail chunks: {detail_files}[/]")
+    console.print(f"[bold green]✓ Exported {len(shows)} shows to {CATALOG_EXPORT_DIR}[/]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Catalog snapshots: list, create, restore and diff (see shared/snapshots.py).
+
+5_import.py, 6_reassess.py and add_show.py snapshot shows.json before they
+replace it. Snapshots are referenced by id, a unique id prefix, "latest"
+or "latest~N"; "current" in a diff means the shows.json on disk.
+
+    python catalog_snapshots.py list
+    python catalog_snapshots.py create [label]
+    python catalog_snapshots.py diff latest~1 latest     # or: diff latest current
+    python catalog_snapshots.py restore <snapshot> [--output path]
+    python catalog_snapshots.py import-backups           # shows_backup_*.json -> snapshots
+"""
+import glob
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from rich.console import Console
+from rich.table import Table
+from shared.config import SHOWS_FILE
+from shared.io_utils import load_json, save_json_atomic
+from shared.snapshots import SnapshotStore, changed_fields, content_hash, keyed
+
+console = Console()
+BACKUP_PATTERN = re.compile(r"shows_backup_(\d{8}_\d{6})\.json$")
+
+
+def list_snapshots(store: SnapshotStore):
+    manifests = store.list()
+    if not manifests:
+        console.print("[yellow]No snapshots yet.[/]")
+        return
+    table = Table(title=f"{len(manifests)} snapshots, {store.size() / 1024:.0f} KB on disk")
+    for column in ("Id", "Shows", "Changed vs base", "Removed", "Base"):
+        table.add_column(column, justify="left" if column == "Id" else "right")
+    for manifest in manifests:
+        table.add_row(manifest["id"], str(manifest["count"]), str(len(manifest["changed"])),
+                      str(len(manifest["removed"])), manifest["base"])
+    console.print(table)
+
+
+def hashes_for(store: SnapshotStore, ref: str):
+    """(label, key -> hash, record loader) for a snapshot reference or "current\""""
+    if ref == "current":
+        shows = load_json(SHOWS_FILE) or []
+        by_key = dict(keyed(shows))
+        return "shows.json", {key: content_hash(record) for key, record in by_key.items()}, by_key.get
+    snapshot_id = store.resolve(ref)
+    return snapshot_id, store.hashes(snapshot_id), lambda key: store.record(snapshot_id, key)
+
+
+def diff_snapshots(store: SnapshotStore, old_ref: str, new_ref: str):
+    old_label, old_hashes, old_record = hashes_for(store, old_ref)
+    new_label, new_hashes, new_record = hashes_for(store, new_ref)
+    changes = store.diff(old_hashes, new_hashes)
+    console.rule(f"{old_label} → {new_label}")
+    console.print(f"Added {len(changes['added'])} | Removed {len(changes['removed'])} | "
+                  f"Changed {len(changes['changed'])}")
+    for key in changes["added"]:
+        console.print(f"[green]+ {new_record(key).get('title')} ({key})[/]")
+    for key in changes["removed"]:
+        console.print(f"[red]- {old_record(key).get('title')} ({key})[/]")
+    for key in changes["changed"]:
+        old, new = old_record(key), new_record(key)
+        fields = changed_fields(old, new)
+        detail = ", ".join(
+            f"{field}: {old.get(field)} → {new.get(field)}" if field in ("rating", "minAge", "maxAge", "safeAboveAge")
+            else field
+            for field in fields
+        )
+        console.print(f"[yellow]~ {new.get('title')} ({key})[/] [dim]{detail}[/]")
+
+
+def restore_snapshot(store: SnapshotStore, ref: str, output: str):
+    snapshot_id = store.resolve(ref)
+    started = time.perf_counter()
+    shows = store.restore(snapshot_id)
+    elapsed = time.perf_counter() - started
+    if output == SHOWS_FILE:
+        current = load_json(SHOWS_FILE) or []
+        if current:
+            saved_id, _ = store.create(current, "before-restore")
+            console.print(f"[dim]Current catalog kept as snapshot {saved_id}[/]")
+    save_json_atomic(output, shows)
+    console.print(f"[green]✓ Restored {snapshot_id} ({len(shows)} shows, {elapsed * 1000:.0f} ms) to {output}[/]")
+
+
+def import_backups(store: SnapshotStore):
+    """Fold full shows_backup_*.json copies into the store (oldest first); the files are left in place"""
+    pattern = os.path.join(os.path.dirname(SHOWS_FILE), "shows_backup_*.json")
+    paths = sorted(glob.glob(pattern), key=lambda path: BACKUP_PATTERN.search(path).group(1))
+    if not paths:
+        console.print("[yellow]No shows_backup_*.json files found.[/]")
+        return
+    before = store.size()
+    for path in paths:
+        created_at = datetime.strptime(BACKUP_PATTERN.search(path).group(1), "%Y%m%d_%H%M%S")
+        snapshot_id, stored = store.create(load_json(path) or [], "backup", created_at=created_at)
+        state = "stored" if stored else "identical to the previous snapshot"
+        console.print(f"  {os.path.basename(path)} → {snapshot_id} [dim]({state})[/]")
+    source_size = sum(os.path.getsize(path) for path in paths)
+    console.print(f"[green]✓ {source_size / 1024:.0f} KB of backups stored in "
+                  f"{(store.size() - before) / 1024:.0f} KB. Delete the backup files once checked.[/]")
+
+
+def main():
+    console.rule("[bold blue]Catalog Snapshots[/]")
+    store = SnapshotStore()
+    output = sys.argv[sys.argv.index("--output") + 1] if "--output" in sys.argv else SHOWS_FILE
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--") and arg != output]
+    command = args[0] if args else "list"
+
+    try:
+        if command == "list":
+            list_snapshots(store)
+        elif command == "create":
+            started = time.perf_counter()
+            snapshot_id, stored = store.create(load_json(SHOWS_FILE) or [], args[1] if len(args) > 1 else "manual")
+            elapsed = (time.perf_counter() - started) * 1000
+            if stored:
+                console.print(f"[green]✓ Snapshot {snapshot_id} ({elapsed:.0f} ms)[/]")
+            else:
+                console.print(f"[dim]Unchanged since {snapshot_id}; nothing stored.[/]")
+        elif command == "diff":
+            diff_snapshots(store, args[1] if len(args) > 1 else "latest", args[2] if len(args) > 2 else "current")
+        elif command == "restore":
+            restore_snapshot(store, args[1] if len(args) > 1 else "latest", output)
+        elif command == "import-backups":
+            import_backups(store)
+        else:
+            console.print(f"[red]Unknown command '{command}'[/]")
+    except (ValueError, FileNotFoundError) as e:
+        console.print(f"[red]{e}[/]")
+
+
+if __name__ == "__main__":
+    main()
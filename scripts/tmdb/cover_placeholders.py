@@ -0,0 +1,131 @@
+"""
+Precompute cover placeholders (BlurHash, dominant colour).
+
+Stores coverBlurhash / coverColor on every show so the grid can paint
+instantly (the cover boxes have fixed sizes, so nothing shifts on load). Results are cached by image content hash, so reruns
+only process new or changed covers. Local mirrored covers are read from
+public/, remote ones are fetched (skipped when mirror_covers.py already
+knows their hash). Encoding runs in a process pool.
+
+    python cover_placeholders.py [--workers 8]
+"""
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, Optional, Tuple
+from rich.console import Console
+from rich.progress import Progress
+from mirror_covers import build_session
+from shared.catalog_export import export_catalog
+from shared.config import (
+    ROOT_DIR, SHOWS_FILE, COVERS_PUBLIC_PATH, COVER_MANIFEST_FILE,
+    COVER_PLACEHOLDERS_FILE, CATALOG_EXPORT_DIR
+)
+from shared.io_utils import load_json, save_json
+from shared.placeholders import compute_placeholder
+
+console = Console()
+DOWNLOAD_WORKERS = 16
+
+
+def read_cover(session, cover: str) -> bytes:
+    if cover.startswith(f"{COVERS_PUBLIC_PATH}/"):
+        with open(os.path.join(ROOT_DIR, "public", cover.lstrip("/")), "rb") as f:
+            return f.read()
+    response = session.get(cover, timeout=20)
+    response.raise_for_status()
+    return response.content
+
+
+def known_hash(show: Dict, mirror_manifest: Dict) -> Optional[str]:
+    """Content hash without downloading, when the mirror already recorded it"""
+    cover = show.get("coverImage") or ""
+    if cover.startswith("http"):
+        entry = mirror_manifest.get(cover)
+        return entry["sha256"] if entry else None
+    return None
+
+
+def main():
+    console.rule("[bold blue]Cover Placeholders[/]")
+
+    workers = os.cpu_count() or 4
+    if "--workers" in sys.argv:
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
+
+    shows = load_json(SHOWS_FILE)
+    if not shows:
+        console.print(f"[red]No shows found in {SHOWS_FILE}[/]")
+        return
+
+    cache: Dict[str, Dict] = load_json(COVER_PLACEHOLDERS_FILE) or {}
+    mirror_manifest: Dict[str, Dict] = load_json(COVER_MANIFEST_FILE) or {}
+    session = build_session(DOWNLOAD_WORKERS)
+
+    # 1. Resolve each distinct cover to a content hash, reading bytes only when needed
+    covers = sorted({show["coverImage"] for show in shows if show.get("coverImage")})
+    hash_by_cover: Dict[str, str] = {}
+    pending: Dict[str, bytes] = {}  # hash -> image bytes still to encode
+    failures = 0
+
+    def resolve(cover: str) -> Tuple[str, str, Optional[bytes]]:
+        digest = known_hash({"coverImage": cover}, mirror_manifest)
+        if digest and digest in cache:
+            return cover, digest, None
+        data = read_cover(session, cover)
+        digest = hashlib.sha256(data).hexdigest()
+        return cover, digest, None if digest in cache else data
+
+    with Progress(console=console) as progress:
+        task = progress.add_task("Reading covers", total=len(covers))
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+            for future in as_completed([pool.submit(resolve, cover) for cover in covers]):
+                try:
+                    cover, digest, data = future.result()
+                    hash_by_cover[cover] = digest
+                    if data is not None:
+                        pending[digest] = data
+                except Exception as e:
+                    failures += 1
+                    console.print(f"[red]Could not read cover: {e}[/]")
+                progress.advance(task)
+
+        # 2. Encode only new images, in parallel across processes
+        if pending:
+            task = progress.add_task("Encoding placeholders", total=len(pending))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(compute_placeholder, data): digest for digest, data in pending.items()}
+                for future in as_completed(futures):
+                    try:
+                        cache[futures[future]] = future.result()
+                    except Exception as e:
+                        failures += 1
+                        console.print(f"[red]Could not encode cover: {e}[/]")
+                    progress.advance(task)
+            save_json(COVER_PLACEHOLDERS_FILE, cache)
+
+    # 3. Store on the shows
+    updated = 0
+    for show in shows:
+        placeholder = cache.get(hash_by_cover.get(show.get("coverImage") or "", ""))
+        if not placeholder:
+            continue
+        fields = {
+            "coverBlurhash": placeholder["blurhash"],
+            "coverColor": placeholder["color"],
+        }
+        if any(show.get(key) != value for key, value in fields.items()):
+            show.update(fields)
+            updated += 1
+
+    if updated:
+        save_json(SHOWS_FILE, shows)
+        export_catalog(shows, CATALOG_EXPORT_DIR)
+
+    console.print(f"Encoded: {len(pending) - failures} | Cached: {len(covers) - len(pending)} | Failed: {failures}")
+    console.print(f"[bold green]✓ Updated placeholders on {updated} shows[/]")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,43 @@
+"""
+Sync streaming-provider logos from logo.dev and pack them into a sprite sheet.
+
+Logos are fetched concurrently over one pooled session with retries and
+conditional requests (ETag / Last-Modified); unchanged content is not
+rewritten. Every logo is then re-encoded as an optimized PNG and packed into
+public/assets/providers/sprite.png with a coordinate map keyed by slug
+(src/constants/providerSprite.json), so the app needs a single image request.
+
+    python download_provider_logos.py            # sync + sprite
+    python download_provider_logos.py --sprite   # rebuild sprite from local files only
+"""
+import hashlib
+import json
+import math
 import os
+import sys
 import urllib.parse
-import urllib.request
-from typing import Dict, Tuple, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+from typing import Dict, Tuple, List, Optional
+import requests
 from dotenv import load_dotenv
+from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 OUTPUT_DIR = os.path.join(ROOT_DIR, "public", "assets", "providers")
+MANIFEST_FILE = os.path.join(OUTPUT_DIR, "manifest.json")
+SPRITE_FILE = os.path.join(OUTPUT_DIR, "sprite.png")
+SPRITE_MAP_FILE = os.path.join(ROOT_DIR, "src", "constants", "providerSprite.json")
+SPRITE_PUBLIC_PATH = "/assets/providers/sprite.png"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 load_dotenv(os.path.join(ROOT_DIR, ".env"))
 
+LOGO_SIZE = 64
+SPRITE_COLUMNS = 8
+WORKERS = 16
+
 LOGOS: Dict[str, Tuple[str, str]] = {
     "netflix": ("Netflix", "netflix.com"),
     "disneyplus": ("Disney+", "disneyplus.com"),
@@ -58,51 +87,162 @@ LOGOS: Dict[str, Tuple[str, str]] = {
 }
 
 
-def download_logo(api_key: str, slug: str, name: str, domain: str) -> Tuple[bool, str]:
-    if domain:
-        query = domain
-    else:
-        query = name
+def build_session() -> requests.Session:
+    session = requests.Session()
+    retry = Retry(total=4, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=WORKERS, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+
+def load_manifest() -> Dict[str, Dict]:
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+    with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path: str, data: Dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def optimize_png(data: bytes) -> bytes:
+    """Re-encode at the logo size with zlib optimization; keep the smaller result"""
+    with Image.open(BytesIO(data)) as source:
+        image = source.convert("RGBA")
+    if image.size != (LOGO_SIZE, LOGO_SIZE):
+        image.thumbnail((LOGO_SIZE, LOGO_SIZE), Image.LANCZOS)
+    if image.getextrema()[3] == (255, 255):
+        image = image.convert("RGB")  # Fully opaque: drop the alpha channel
+    output = BytesIO()
+    image.save(output, format="PNG", optimize=True)
+    optimized = output.getvalue()
+    return optimized if len(optimized) < len(data) else data
+
+
+def download_logo(
+    session: requests.Session,
+    api_key: str,
+    slug: str,
+    name: str,
+    domain: str,
+    entry: Optional[Dict]
+) -> Tuple[str, Dict, str]:
+    """Returns (slug, manifest entry, status) where status is new/updated/unchanged"""
+    query = domain or name
     encoded_query = urllib.parse.quote(query)
-    url = f"https://img.logo.dev/{encoded_query}?token={api_key}&size=64&format=png"
+    url = f"https://img.logo.dev/{encoded_query}?token={api_key}&size={LOGO_SIZE}&format=png"
     output_path = os.path.join(OUTPUT_DIR, f"{slug}.png")
 
-    try:
-        with urllib.request.urlopen(url, timeout=15) as response:
-            if response.status != 200:
-                return False, f"{name} (HTTP {response.status})"
+    headers = {}
+    if entry and os.path.exists(output_path):
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
 
-            data = response.read()
-            if not data:
-                return False, f"{name} (empty response)"
+    response = session.get(url, headers=headers, timeout=15)
+    if response.status_code == 304:
+        return slug, entry, "unchanged"
+    response.raise_for_status()
+    if not response.content:
+        raise ValueError("empty response")
 
-            with open(output_path, "wb") as file_handle:
-                file_handle.write(data)
+    # The hash is of the source bytes, so it stays stable across optimizer changes
+    digest = hashlib.sha256(response.content).hexdigest()
+    new_entry = {
+        "sha256": digest,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    if entry and entry.get("sha256") == digest and os.path.exists(output_path):
+        return slug, new_entry, "unchanged"
 
-        return True, output_path
-    except Exception as exc:
-        return False, f"{name} ({exc})"
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as file_handle:
+        file_handle.write(optimize_png(response.content))
+    os.replace(tmp_path, output_path)
+    return slug, new_entry, "updated" if entry else "new"
 
 
-def main() -> None:
-    api_key = os.getenv("LOGO_DEV_API_KEY", "").strip()
-    if not api_key:
-        print("LOGO_DEV_API_KEY is missing. Add it to your .env or environment.")
-        return
+def build_sprite() -> Tuple[int, int]:
+    """Pack every local logo into one sheet; returns (logos packed, sprite bytes)"""
+    slugs = [slug for slug in LOGOS if os.path.exists(os.path.join(OUTPUT_DIR, f"{slug}.png"))]
+    columns = min(SPRITE_COLUMNS, len(slugs)) or 1
+    rows = math.ceil(len(slugs) / columns)
+    sheet = Image.new("RGBA", (columns * LOGO_SIZE, rows * LOGO_SIZE), (0, 0, 0, 0))
+
+    icons: Dict[str, Dict[str, int]] = {}
+    for index, slug in enumerate(slugs):
+        with Image.open(os.path.join(OUTPUT_DIR, f"{slug}.png")) as source:
+            logo = source.convert("RGBA")
+        logo.thumbnail((LOGO_SIZE, LOGO_SIZE), Image.LANCZOS)
+        x, y = (index % columns) * LOGO_SIZE, (index // columns) * LOGO_SIZE
+        # Centre logos that aren't square
+        sheet.paste(logo, (x + (LOGO_SIZE - logo.width) // 2, y + (LOGO_SIZE - logo.height) // 2))
+        icons[slug] = {"x": x, "y": y}
+
+    # Flat logo artwork survives a 256-colour palette well and it's ~5x smaller
+    output = BytesIO()
+    sheet.quantize(colors=256, method=Image.Quantize.FASTOCTREE).save(output, format="PNG", optimize=True)
+    data = output.getvalue()
+    with open(SPRITE_FILE, "wb") as f:
+        f.write(data)
 
+    write_json(SPRITE_MAP_FILE, {
+        # Version query busts caches when the sheet changes
+        "url": f"{SPRITE_PUBLIC_PATH}?v={hashlib.sha256(data).hexdigest()[:10]}",
+        "width": sheet.width,
+        "height": sheet.height,
+        "size": LOGO_SIZE,
+        "icons": icons,
+    })
+    return len(icons), len(data)
+
+
+def sync_logos(api_key: str) -> List[str]:
+    manifest = load_manifest()
+    session = build_session()
+    counts = {"new": 0, "updated": 0, "unchanged": 0}
     failures: List[str] = []
 
-    for slug, (name, domain) in LOGOS.items():
-        success, message = download_logo(api_key, slug, name, domain)
-        if not success:
-            failures.append(message)
-
-    if failures:
-        print("Some logos failed to download:")
-        for item in failures:
-            print(f"- {item}")
-    else:
-        print("All logos downloaded successfully.")
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        futures = {
+            pool.submit(download_logo, session, api_key, slug, name, domain, manifest.get(slug)): name
+            for slug, (name, domain) in LOGOS.items()
+        }
+        for future in as_completed(futures):
+            try:
+                slug, entry, status = future.result()
+                manifest[slug] = entry
+                counts[status] += 1
+            except Exception as exc:
+                failures.append(f"{futures[future]} ({exc})")
+
+    write_json(MANIFEST_FILE, manifest)
+    print(f"New: {counts['new']} | Updated: {counts['updated']} | Unchanged: {counts['unchanged']}")
+    return failures
+
+
+def main() -> None:
+    if "--sprite" not in sys.argv:
+        api_key = os.getenv("LOGO_DEV_API_KEY", "").strip()
+        if not api_key:
+            print("LOGO_DEV_API_KEY is missing. Add it to your .env or environment.")
+            return
+
+        failures = sync_logos(api_key)
+        if failures:
+            print("Some logos failed to download:")
+            for item in failures:
+                print(f"- {item}")
+        else:
+            print("All logos downloaded successfully.")
+
+    packed, size = build_sprite()
+    print(f"Sprite: {packed} logos, {size / 1024:.1f} KB -> {SPRITE_FILE}")
 
 
 if __name__ == "__main__":
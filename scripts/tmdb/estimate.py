@@ -0,0 +1,253 @@
+"""
+Preflight estimate: API calls, tokens and wall-clock time for pending work.
+
+Reads the backlog each stage would process next (stage 2: discovered but
+not enriched, stage 3: enriched but not assessed, stage 6: shows selected
+for re-assessment) and predicts the cost under the current throttling,
+model routing and worker settings, plus what the same Gemini work costs as
+a --batch job. Token and latency figures come from the usage ledger when it
+has history, otherwise from conservative defaults.
+
+    python estimate.py
+    python estimate.py --workers 8   # stage 6 worker count to plan for (default 6_reassess.WORKERS)
+"""
+import importlib
+import math
+from typing import Dict, List, Optional, Tuple
+from rich.console import Console
+from rich.table import Table
+from shared.budget_ledger import BudgetLedger, today
+from shared.config import (
+    DISCOVERED_FILE, ENRICHED_FILE, ASSESSED_FILE, REVIEWED_FILE, SHOWS_FILE, GEMINI_MIN_DELAY_SECONDS,
+    TMDB_DAILY_REQUEST_BUDGET, GEMINI_DAILY_REQUEST_BUDGET, GEMINI_DAILY_TOKEN_BUDGET
+)
+from shared.gemini_client import GeminiClient
+from shared.io_utils import load_json
+from shared.models import DiscoveredItem, EnrichedItem, AssessedItem, ReviewedItem
+from shared.preclassifier import build_franchise_priors, item_key
+from shared.similarity_index import SimilarityIndex
+
+console = Console()
+
+TMDB_REQUEST_INTERVAL_SECONDS = 0.25  # TMDBClient.min_request_interval
+DEFAULT_TMDB_LATENCY_SECONDS = 0.3
+DEFAULT_GEMINI_LATENCY_SECONDS = 4.0
+DEFAULT_OUTPUT_TOKENS = 300
+CHARS_PER_TOKEN = 4  # Rough English average until the ledger has real counts
+DEFAULT_ESCALATION_SHARE = 0.5  # Until 3_assessed.json has verdicts to learn from
+BATCH_TURNAROUND_SECONDS = 24 * 3600  # Gemini's batch target; most jobs finish much sooner
+
+
+def stage_module(name: str):
+    """Stage scripts start with a digit, so they can't be imported by statement"""
+    return importlib.import_module(name)
+
+
+def average(history: Dict[str, float], metric: str) -> Optional[float]:
+    """Per successful response; failed requests (429s etc.) carry no token counts"""
+    completed = history.get("completed", 0)
+    if not completed or not history.get(metric):
+        return None
+    return history[metric] / completed
+
+
+def format_duration(seconds: float) -> str:
+    if seconds < 90:
+        return f"{seconds:.0f}s"
+    if seconds < 5400:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+def days_needed(amount: float, remaining_today: Optional[float], daily_budget: int) -> int:
+    """Days (1 = today) until the work fits under a daily budget"""
+    if daily_budget <= 0 or amount <= (remaining_today or 0):
+        return 1
+    return 1 + math.ceil((amount - (remaining_today or 0)) / daily_budget)
+
+
+def escalation_share(assessed: List[AssessedItem]) -> float:
+    """
+    Share of Gemini verdicts the careful model would be asked for: flagged
+    items are exactly the ones GeminiClient.should_escalate() re-asks
+    """
+    verdicts = [item for item in assessed if item.assessment.source == "gemini"]
+    if not verdicts:
+        return DEFAULT_ESCALATION_SHARE
+    return sum(1 for item in verdicts if item.flagged_for_review) / len(verdicts)
+
+
+def routed_prompts(client: GeminiClient, requests: List[Tuple], share: float) -> List[str]:
+    """
+    Prompts sent for (title, year, synopsis, genres, certification, tiered)
+    requests: tiered ones get the lean first pass when a fast model is
+    configured, and ~share of those are asked again with the full prompt
+    """
+    fast = client.fast_model and client.fast_model != client.model
+    prompts, escalations = [], []
+    for *fields, tiered in requests:
+        if fast and tiered:
+            prompts.append(client._build_lean_prompt(*fields))
+            escalations.append(client._build_prompt(*fields))
+        else:
+            prompts.append(client._build_prompt(*fields))
+    return prompts + escalations[:round(len(escalations) * share)]
+
+
+def gemini_estimate(
+    client: GeminiClient,
+    prompts: List[str],
+    history: Dict[str, float],
+    workers: int = 1
+) -> Dict[str, float]:
+    calls = len(prompts)
+    prompt_tokens = average(history, "prompt_tokens")
+    if prompt_tokens is None:
+        prompt_total = sum(len(prompt) for prompt in prompts) / CHARS_PER_TOKEN
+    else:
+        prompt_total = prompt_tokens * calls
+    output_total = (average(history, "output_tokens") or DEFAULT_OUTPUT_TOKENS) * calls
+    latency = average(history, "latency_seconds") or DEFAULT_GEMINI_LATENCY_SECONDS
+    # Up to `workers` requests are in flight; the throttle still spaces their starts
+    seconds = calls * max(latency / workers, client.min_delay_seconds)
+    return {
+        "calls": calls,
+        "prompt_tokens": prompt_total,
+        "output_tokens": output_total,
+        "seconds": seconds,
+    }
+
+
+def gemini_row(
+    client: GeminiClient,
+    prompts: List[str],
+    history: Dict[str, float],
+    ledger: BudgetLedger,
+    workers: int = 1
+):
+    estimate = gemini_estimate(client, prompts, history, workers)
+    tokens = estimate["prompt_tokens"] + estimate["output_tokens"]
+    by_requests = days_needed(
+        estimate["calls"], ledger.remaining("gemini", GEMINI_DAILY_REQUEST_BUDGET), GEMINI_DAILY_REQUEST_BUDGET
+    )
+    by_tokens = days_needed(
+        tokens, ledger.remaining("gemini", GEMINI_DAILY_TOKEN_BUDGET, "tokens"), GEMINI_DAILY_TOKEN_BUDGET
+    )
+    # Whichever ceiling binds first
+    days = max(by_requests, by_tokens)
+    return estimate["calls"], estimate["prompt_tokens"], estimate["output_tokens"], estimate["seconds"], days
+
+
+def batch_row(client: GeminiClient, prompts: List[str], history: Dict[str, float], ledger: BudgetLedger):
+    """
+    The same requests as one batch job: the full prompt on the careful model,
+    no throttle, and no per-request quota (only the token budget applies)
+    """
+    estimate = gemini_estimate(client, prompts, history)
+    tokens = estimate["prompt_tokens"] + estimate["output_tokens"]
+    days = days_needed(
+        tokens, ledger.remaining("gemini", GEMINI_DAILY_TOKEN_BUDGET, "tokens"), GEMINI_DAILY_TOKEN_BUDGET
+    )
+    return estimate["calls"], estimate["prompt_tokens"], estimate["output_tokens"], None, days
+
+
+def main():
+    console.rule("[bold blue]Preflight Estimate[/]")
+
+    ledger = BudgetLedger()
+    gemini_history = ledger.history("gemini")
+    client = GeminiClient("", ledger=ledger)
+    rows = []
+
+    # Stage 2: one TMDB detail call per pending discovered item
+    discovered = [DiscoveredItem.from_dict(item) for item in load_json(DISCOVERED_FILE) or []]
+    enriched = [EnrichedItem.from_dict(item) for item in load_json(ENRICHED_FILE) or []]
+    enriched_ids = {item.tmdb_id for item in enriched}
+    pending_enrich = [item for item in discovered if item.tmdb_id not in enriched_ids]
+    tmdb_seconds = len(pending_enrich) * max(TMDB_REQUEST_INTERVAL_SECONDS, DEFAULT_TMDB_LATENCY_SECONDS)
+    rows.append((
+        "2 Enrich (TMDB)", len(pending_enrich), len(pending_enrich), None, None, tmdb_seconds,
+        days_needed(len(pending_enrich), ledger.remaining("tmdb", TMDB_DAILY_REQUEST_BUDGET), TMDB_DAILY_REQUEST_BUDGET),
+    ))
+
+    # Stage 3: one Gemini call per pending enriched item the rules and the similarity
+    # index can't decide, capped by BATCH_LIMIT
+    assess = stage_module("3_assess")
+    assessed = [AssessedItem.from_dict(item) for item in load_json(ASSESSED_FILE) or []]
+    assessed_keys = {item_key(item.enriched) for item in assessed}
+    reviewed = [ReviewedItem.from_dict(item) for item in load_json(REVIEWED_FILE) or []]
+    priors = build_franchise_priors(reviewed)
+    similarity = SimilarityIndex.load(reviewed)
+    pending_assess = [
+        item for item in enriched
+        if item_key(item) not in assessed_keys
+        and not assess.preclassify_item(item, priors)
+        and not assess.derive_item(item, similarity)
+    ]
+    if assess.BATCH_LIMIT > 0:
+        pending_assess = pending_assess[:assess.BATCH_LIMIT]
+    # Every item gets the lean first pass; escalations repeat the full prompt
+    share = escalation_share(assessed)
+    requests = [
+        (item.title, item.release_year or "", item.synopsis, item.genres, item.certification, True)
+        for item in pending_assess
+    ]
+    if client.fast_model and client.fast_model != client.model:
+        console.print(f"[dim]Model routing: {client.fast_model} first, ~{share:.0%} escalated to {client.model}.[/]")
+    prompts = routed_prompts(client, requests, share)
+    rows.append(("3 Assess (Gemini)", len(pending_assess), *gemini_row(client, prompts, gemini_history, ledger)))
+    prompts = [client._build_prompt(*fields) for *fields, _ in requests]
+    rows.append(("3 Assess (--batch)", len(pending_assess), *batch_row(client, prompts, gemini_history, ledger)))
+
+    # Stage 6: one Gemini call per show selected for re-assessment, on WORKERS threads;
+    # Safe shows get the lean first pass like stage 3, the rest go to the careful model
+    reassess = stage_module("6_reassess")
+    workers = int(reassess.cli_option("--workers") or reassess.WORKERS)
+    to_reassess = [show for show in load_json(SHOWS_FILE) or [] if reassess.needs_reassessment(show)]
+    requests = [
+        (show["title"], show.get("releaseYear", ""), show.get("synopsis", ""), reassess.show_genres(show), None,
+         reassess.tiered_show(show))
+        for show in to_reassess
+    ]
+    prompts = routed_prompts(client, requests, share)
+    rows.append(("6 Reassess (Gemini)", len(to_reassess),
+                 *gemini_row(client, prompts, gemini_history, ledger, workers)))
+    prompts = [client._build_prompt(*fields) for *fields, _ in requests]
+    rows.append(("6 Reassess (--batch)", len(to_reassess), *batch_row(client, prompts, gemini_history, ledger)))
+
+    table = Table(title="Pending work")
+    for column in ("Stage", "Pending", "API calls", "Prompt tokens", "Output tokens", "Est. time", "Budget"):
+        table.add_column(column, justify="left" if column == "Stage" else "right")
+    for stage, pending, calls, prompt_tokens, output_tokens, seconds, budget in rows:
+        table.add_row(
+            stage, str(pending), str(calls),
+            "-" if prompt_tokens is None else f"{prompt_tokens:,.0f}",
+            "-" if output_tokens is None else f"{output_tokens:,.0f}",
+            f"up to {format_duration(BATCH_TURNAROUND_SECONDS)}" if seconds is None else format_duration(seconds),
+            "today" if budget == 1 else f"{budget} days",
+        )
+    console.print(table)
+
+    console.print(
+        f"[dim]Gemini throttle: {GEMINI_MIN_DELAY_SECONDS}s between request starts; stage 3 is sequential, "
+        f"stage 6 runs {workers} workers. Batch jobs skip the throttle and the request budget. "
+        f"Estimates exclude retries.[/]"
+    )
+    if not gemini_history.get("prompt_tokens"):
+        console.print(f"[dim]No Gemini usage history yet: prompt tokens estimated at ~{CHARS_PER_TOKEN} chars/token.[/]")
+
+    console.print(
+        f"Used today: TMDB {int(ledger.used('tmdb'))}/{TMDB_DAILY_REQUEST_BUDGET or '∞'} requests | "
+        f"Gemini {int(ledger.used('gemini'))}/{GEMINI_DAILY_REQUEST_BUDGET or '∞'} requests, "
+        f"{int(ledger.used('gemini', 'tokens')):,}/{GEMINI_DAILY_TOKEN_BUDGET or '∞'} tokens"
+    )
+    for model, usage in ledger.days.get(today(), {}).get("gemini", {}).get("models", {}).items():
+        console.print(
+            f"[dim]  {model}: {int(usage.get('requests', 0))} requests, "
+            f"{int(usage.get('prompt_tokens', 0)):,} prompt ({int(usage.get('cached_tokens', 0)):,} from the rubric cache) "
+            f"+ {int(usage.get('output_tokens', 0)):,} output tokens[/]"
+        )
+
+
+if __name__ == "__main__":
+    main()
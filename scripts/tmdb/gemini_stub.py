@@ -0,0 +1,357 @@
+"""
+Local stand-in for the Gemini REST API, for exercising the pipeline offline.
+
+Implements the endpoints GeminiClient uses, with usageMetadata counted at
+~4 characters per token so prompt and cached token counts can be compared:
+
+    POST   /models/<model>:generateContent
+    POST   /cachedContents             (systemInstruction + ttl)
+    GET    /cachedContents/<id>
+    DELETE /cachedContents/<id>
+    POST   /upload/files               (resumable protocol: start, then upload + finalize)
+    POST   /models/<model>:batchGenerateContent
+    GET    /batches/<id>               (PENDING, RUNNING, then SUCCEEDED after --batch-seconds)
+    GET    /download/files/<id>:download
+    GET    /stats                      (request and token totals)
+
+Verdicts are deterministic keyword rules over the request text, restricted
+to the fields of generationConfig.responseSchema when one is sent.
+
+    python gemini_stub.py [--port 8766] [--min-cache-tokens 1024]
+                          [--latency-ms 50] [--error-rate 0.05] [--batch-seconds 5]
+    GEMINI_BASE_URL=http://127.0.0.1:8766 GEMINI_API_KEY=stub python 3_assess.py
+
+--min-cache-tokens rejects smaller caches like the real API does (default
+1024, the 2.5 Flash minimum; 0 accepts any size to exercise the cached path).
+"""
+import gzip
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from rich.console import Console
+from shared.assessment_schema import RESPONSE_SCHEMA
+
+console = Console()
+DEFAULT_PORT = 8766
+CHARS_PER_TOKEN = 4
+MIN_CACHE_TOKENS = 1024  # Real API minimum for explicit caches on the 2.5 Flash models
+UNSAFE_WORDS = re.compile(r"\b(horror|murder|slasher|gore|possessed|demonic)\b", re.IGNORECASE)
+CAUTION_WORDS = re.compile(r"\b(fight|battle|monster|villain|war|ghost|danger|sword)\w*", re.IGNORECASE)
+EDUCATIONAL_WORDS = re.compile(r"\b(learn|count|letters|science|school|curious)\w*", re.IGNORECASE)
+
+
+def count_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def parts_text(content: Optional[Dict]) -> str:
+    return "".join(part.get("text", "") for part in (content or {}).get("parts", []))
+
+
+def verdict_for(text: str) -> Dict:
+    if UNSAFE_WORDS.search(text):
+        rating, min_age, safe_above = "Unsafe", 13, None
+    elif CAUTION_WORDS.search(text):
+        rating, min_age, safe_above = "Caution", 4, 7
+    else:
+        rating, min_age, safe_above = "Safe", 2, None
+    return {
+        "rating": rating,
+        "min_age": min_age,
+        "max_age": 10,
+        "safe_above_age": safe_above,
+        "is_episodic_issue": False,
+        "stimulation_level": "Medium" if rating == "Safe" else "High",
+        "has_lgbtq": False,
+        "has_violence": rating != "Safe",
+        "has_scary": rating == "Unsafe",
+        "is_educational": bool(EDUCATIONAL_WORDS.search(text)),
+        "reasoning": f"Stand-in verdict: keyword rules over the request text rate this title {rating}.",
+    }
+
+
+class StubState:
+    def __init__(self, min_cache_tokens: int, latency_ms: float, error_rate: float, batch_seconds: float = 5):
+        self.min_cache_tokens = min_cache_tokens
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.batch_seconds = batch_seconds
+        self.caches: Dict[str, Dict] = {}  # "cachedContents/<id>" -> {model, text, tokens, expires_at}
+        self.files: Dict[str, bytes] = {}  # "files/<id>" -> content (pending uploads keyed by upload id)
+        self.batches: Dict[str, Dict] = {}  # "batches/<id>" -> {model, input, submitted_at, output}
+        self.lock = threading.Lock()
+        self.stats = {
+            "generate_requests": 0, "prompt_tokens": 0, "cached_tokens": 0, "output_tokens": 0,
+            "caches_created": 0, "caches_rejected": 0, "caches_deleted": 0, "errors_injected": 0,
+            "batches_created": 0, "batch_requests": 0,
+        }
+
+    def count(self, **metrics: int) -> None:
+        with self.lock:
+            for metric, value in metrics.items():
+                self.stats[metric] += value
+
+    def live_cache(self, name: str) -> Optional[Dict]:
+        with self.lock:
+            cache = self.caches.get(name)
+            if cache and cache["expires_at"] <= time.time():
+                del self.caches[name]  # Expired, as far as clients can tell
+                cache = None
+            return cache
+
+    def create_cache(self, body: Dict) -> Tuple[int, Dict]:
+        text = parts_text(body.get("systemInstruction")) + "".join(
+            parts_text(content) for content in body.get("contents", [])
+        )
+        tokens = count_tokens(text)
+        if tokens < self.min_cache_tokens:
+            self.count(caches_rejected=1)
+            return 400, error_body(400, f"Cached content is too small. total_token_count={tokens}, "
+                                        f"min_total_token_count={self.min_cache_tokens}", "INVALID_ARGUMENT")
+        ttl = float(str(body.get("ttl", "3600s")).rstrip("s") or 3600)
+        name = f"cachedContents/{uuid.uuid4().hex[:12]}"
+        expires_at = time.time() + ttl
+        with self.lock:
+            self.caches[name] = {"model": body.get("model", ""), "text": text, "tokens": tokens, "expires_at": expires_at}
+            self.stats["caches_created"] += 1
+        return 200, {
+            "name": name,
+            "model": body.get("model", ""),
+            "displayName": body.get("displayName", ""),
+            "expireTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(expires_at)),
+            "usageMetadata": {"totalTokenCount": tokens},
+        }
+
+    def generate(self, model: str, body: Dict) -> Tuple[int, Dict]:
+        prompt = "".join(parts_text(content) for content in body.get("contents", []))
+        instruction = parts_text(body.get("systemInstruction"))
+        cached_tokens = 0
+        if body.get("cachedContent"):
+            cache = self.live_cache(body["cachedContent"])
+            if cache is None:
+                return 404, error_body(404, f"CachedContent not found (or expired): {body['cachedContent']}", "NOT_FOUND")
+            if cache["model"] != f"models/{model}":
+                return 400, error_body(400, "Model does not match the cached content's model", "INVALID_ARGUMENT")
+            cached_tokens = cache["tokens"]
+
+        verdict = verdict_for(prompt)
+        schema = (body.get("generationConfig") or {}).get("responseSchema") or RESPONSE_SCHEMA
+        verdict = {field: verdict[field] for field in schema.get("properties", {}) if field in verdict}
+        text = json.dumps(verdict)
+
+        prompt_tokens = count_tokens(prompt) + count_tokens(instruction) + cached_tokens
+        output_tokens = count_tokens(text)
+        self.count(generate_requests=1, prompt_tokens=prompt_tokens, cached_tokens=cached_tokens,
+                   output_tokens=output_tokens)
+        usage = {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens,
+        }
+        if cached_tokens:
+            usage["cachedContentTokenCount"] = cached_tokens
+        return 200, {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}],
+            "usageMetadata": usage,
+            "modelVersion": model,
+        }
+
+    def create_batch(self, model: str, body: Dict) -> Tuple[int, Dict]:
+        file_name = ((body.get("batch") or {}).get("input_config") or {}).get("file_name")
+        if file_name not in self.files:
+            return 400, error_body(400, f"Input file not found: {file_name}", "INVALID_ARGUMENT")
+        name = f"batches/{uuid.uuid4().hex[:12]}"
+        with self.lock:
+            self.batches[name] = {"model": model, "input": file_name, "submitted_at": time.time(), "output": None}
+            self.stats["batches_created"] += 1
+        return 200, {"name": name, "metadata": {"state": "BATCH_STATE_PENDING", "model": f"models/{model}"}}
+
+    def batch_status(self, name: str) -> Tuple[int, Dict]:
+        batch = self.batches.get(name)
+        if batch is None:
+            return 404, error_body(404, f"Batch not found: {name}", "NOT_FOUND")
+        elapsed = time.time() - batch["submitted_at"]
+        if elapsed < self.batch_seconds / 2:
+            return 200, {"name": name, "metadata": {"state": "BATCH_STATE_PENDING"}}
+        if elapsed < self.batch_seconds:
+            return 200, {"name": name, "metadata": {"state": "BATCH_STATE_RUNNING"}}
+        if batch["output"] is None:
+            batch["output"] = self._run_batch(batch)
+        stats = {"requestCount": batch["count"], "successfulRequestCount": batch["count"]}
+        output = {"responsesFile": batch["output"]}
+        return 200, {
+            "name": name,
+            "metadata": {"state": "BATCH_STATE_SUCCEEDED", "batchStats": stats, "output": output},
+            "done": True,
+            "response": output,
+        }
+
+    def _run_batch(self, batch: Dict) -> str:
+        lines = []
+        for line in self.files[batch["input"]].decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            status, response = self.generate(batch["model"], entry["request"])
+            result = {"key": entry["key"], "response": response} if status == 200 else {"key": entry["key"], **response}
+            lines.append(json.dumps(result))
+        name = f"files/{uuid.uuid4().hex[:12]}"
+        with self.lock:
+            self.files[name] = ("\n".join(lines) + "\n").encode("utf-8")
+            self.stats["batch_requests"] += len(lines)
+        batch["count"] = len(lines)
+        return name
+
+
+def error_body(code: int, message: str, status: str) -> Dict:
+    return {"error": {"code": code, "message": message, "status": status}}
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like the real endpoint
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, body: Dict) -> None:
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _read_body(self) -> bytes:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            if self.headers.get("Content-Encoding") == "gzip":
+                raw = gzip.decompress(raw)
+            return raw
+
+        def _path(self) -> List[str]:
+            """Path segments without the API version ("/upload/v1beta/files" -> ["upload", "files"])"""
+            path = urlsplit(self.path).path
+            return [segment for segment in path.split("/") if segment and segment not in ("v1beta", "v1")]
+
+        def do_GET(self):
+            path = self._path()
+            if path == ["stats"]:
+                with state.lock:
+                    self._send_json(200, dict(state.stats, live_caches=len(state.caches)))
+            elif len(path) == 2 and path[0] == "batches":
+                self._send_json(*state.batch_status("/".join(path)))
+            elif len(path) == 3 and path[:2] == ["download", "files"] and path[2].endswith(":download"):
+                content = state.files.get(f"files/{path[2].rsplit(':', 1)[0]}")
+                if content is None:
+                    self._send_json(404, error_body(404, "File not found", "NOT_FOUND"))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/jsonl")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+            elif len(path) == 2 and path[0] == "cachedContents":
+                cache = state.live_cache("/".join(path))
+                if cache is None:
+                    self._send_json(404, error_body(404, "CachedContent not found", "NOT_FOUND"))
+                else:
+                    self._send_json(200, {"name": "/".join(path), "model": cache["model"],
+                                          "usageMetadata": {"totalTokenCount": cache["tokens"]}})
+            else:
+                self._send_json(404, error_body(404, "Not found", "NOT_FOUND"))
+
+        def do_DELETE(self):
+            path = self._path()
+            name = "/".join(path)
+            with state.lock:
+                found = state.caches.pop(name, None)
+            if found:
+                state.count(caches_deleted=1)
+                self._send_json(200, {})
+            else:
+                self._send_json(404, error_body(404, "CachedContent not found", "NOT_FOUND"))
+
+        def do_POST(self):
+            path = self._path()
+            raw = self._read_body()
+            if path == ["upload", "files"]:
+                self._upload(raw)
+                return
+            try:
+                body = json.loads(raw or b"{}")
+            except ValueError:
+                self._send_json(400, error_body(400, "Invalid JSON payload", "INVALID_ARGUMENT"))
+                return
+            if state.latency_ms:
+                time.sleep(random.expovariate(1000.0 / state.latency_ms))
+            if path == ["cachedContents"]:
+                self._send_json(*state.create_cache(body))
+            elif len(path) == 2 and path[0] == "models" and path[1].endswith(":generateContent"):
+                if state.error_rate and random.random() < state.error_rate:
+                    state.count(errors_injected=1)
+                    self._send_json(503, error_body(503, "The model is overloaded.", "UNAVAILABLE"))
+                    return
+                self._send_json(*state.generate(path[1].rsplit(":", 1)[0], body))
+            elif len(path) == 2 and path[0] == "models" and path[1].endswith(":batchGenerateContent"):
+                self._send_json(*state.create_batch(path[1].rsplit(":", 1)[0], body))
+            else:
+                self._send_json(404, error_body(404, "Not found", "NOT_FOUND"))
+
+        def _upload(self, raw: bytes) -> None:
+            """Files API resumable protocol: "start" hands out an upload URL, "upload, finalize" stores the bytes"""
+            command = self.headers.get("X-Goog-Upload-Command", "")
+            if command == "start":
+                upload_id = uuid.uuid4().hex[:12]
+                host = self.headers.get("Host", "127.0.0.1")
+                self.send_response(200)
+                self.send_header("X-Goog-Upload-URL", f"http://{host}/upload/v1beta/files?upload_id={upload_id}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            upload_id = (parse_qs(urlsplit(self.path).query).get("upload_id") or [""])[0]
+            if "finalize" not in command or not upload_id:
+                self._send_json(400, error_body(400, "Unsupported upload command", "INVALID_ARGUMENT"))
+                return
+            name = f"files/{upload_id}"
+            with state.lock:
+                state.files[name] = raw
+            self._send_json(200, {"file": {"name": name, "sizeBytes": str(len(raw)), "state": "ACTIVE"}})
+
+    return Handler
+
+
+def option(name: str, default: float) -> float:
+    if name in sys.argv:
+        return float(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def main():
+    port = int(option("--port", DEFAULT_PORT))
+    state = StubState(
+        min_cache_tokens=int(option("--min-cache-tokens", MIN_CACHE_TOKENS)),
+        latency_ms=option("--latency-ms", 0),
+        error_rate=option("--error-rate", 0),
+        batch_seconds=option("--batch-seconds", 5),
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    console.rule("[bold blue]Gemini Stand-in[/]")
+    console.print(f"[green]Listening on http://127.0.0.1:{port}[/]")
+    console.print(f"[dim]GEMINI_BASE_URL=http://127.0.0.1:{port}  (stats: /stats)[/]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print(f"\n[dim]Stopped. {json.dumps(state.stats)}[/]")
+
+
+if __name__ == "__main__":
+    main()
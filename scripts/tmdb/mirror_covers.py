@@ -0,0 +1,265 @@
+"""
+Mirror cover images into public/ as resized WebP (optionally AVIF) variants.
+
+Downloads every remote coverImage concurrently over a pooled session,
+revalidates with ETag/Last-Modified, skips images whose content hash is
+unchanged, stores each distinct image once (files are named by content
+hash) and rewrites shows.json to point at the local variants:
+
+    coverImage           -> card-sized variant
+    coverImageLarge      -> modal-sized variant
+    coverImageAvif       -> card-sized AVIF, when one was written (--avif)
+    coverImageLargeAvif  -> modal-sized AVIF
+    coverSource          -> original remote URL (used for revalidation)
+
+The frontend offers the AVIF variants through <picture> and falls back to
+WebP where the browser can't decode them.
+
+    python mirror_covers.py [--revalidate] [--avif] [--workers 16]
+"""
+import hashlib
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+import requests
+from PIL import Image, features
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from rich.console import Console
+from rich.progress import Progress
+from shared.catalog_export import export_catalog
+from shared.config import SHOWS_FILE, COVERS_DIR, COVERS_PUBLIC_PATH, COVER_MANIFEST_FILE, CATALOG_EXPORT_DIR
+from shared.io_utils import load_json, save_json
+
+console = Console()
+
+# Widths in px (posters are 2:3). Card covers the 16:9 grid tile at ~2x density,
+# modal matches the 240px-wide detail cover at 2x.
+VARIANT_WIDTHS = {"card": 342, "modal": 480}
+FORMAT_QUALITY = {"webp": 78, "avif": 55}
+DEFAULT_WORKERS = 16
+
+
+def build_session(workers: int) -> requests.Session:
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=workers, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def variant_path(digest: str, variant: str, extension: str) -> Tuple[str, str]:
+    """(filesystem path, public URL) for a content-addressed variant"""
+    filename = f"{digest[:16]}-{variant}.{extension}"
+    return os.path.join(COVERS_DIR, filename), f"{COVERS_PUBLIC_PATH}/{filename}"
+
+
+def wanted_formats(avif: bool) -> List[str]:
+    return ["webp", "avif"] if avif else ["webp"]
+
+
+def variant_urls(digest: str) -> Dict[str, str]:
+    """Public URLs of the variants on disk: card/modal (WebP) plus card_avif/modal_avif"""
+    urls = {}
+    for variant in VARIANT_WIDTHS:
+        for extension in FORMAT_QUALITY:
+            path, url = variant_path(digest, variant, extension)
+            if os.path.exists(path):
+                urls[variant if extension == "webp" else f"{variant}_{extension}"] = url
+    return urls
+
+
+def has_variants(digest: str, avif: bool) -> bool:
+    return all(
+        os.path.exists(variant_path(digest, variant, extension)[0])
+        for variant in VARIANT_WIDTHS for extension in wanted_formats(avif)
+    )
+
+
+def write_variants(data: bytes, digest: str, avif: bool) -> Dict[str, str]:
+    """Resize into every variant (skipping files that already exist for this hash)"""
+    image = None
+
+    for variant, width in VARIANT_WIDTHS.items():
+        for extension in wanted_formats(avif):
+            quality = FORMAT_QUALITY[extension]
+            path, _ = variant_path(digest, variant, extension)
+            if os.path.exists(path):
+                continue  # Identical image already mirrored (possibly for another show)
+
+            if image is None:
+                image = Image.open(BytesIO(data))
+                image = image.convert("RGB")
+            resized = image
+            if image.width > width:
+                height = round(image.height * width / image.width)
+                resized = image.resize((width, height), Image.LANCZOS)
+
+            # Unique temp name: two shows can share an image and race on it
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            if extension == "webp":
+                resized.save(tmp_path, format="WEBP", quality=quality, method=6)
+            else:
+                resized.save(tmp_path, format="AVIF", quality=quality)
+            os.replace(tmp_path, path)
+
+    return variant_urls(digest)
+
+
+def mirror_one(
+    session: requests.Session,
+    source: str,
+    entry: Optional[Dict],
+    revalidate: bool,
+    avif: bool
+) -> Tuple[str, Dict, str]:
+    """Returns (source, manifest entry, status) where status is new/updated/unchanged/cached"""
+    if entry and not revalidate and has_variants(entry["sha256"], avif):
+        return source, {**entry, "variants": variant_urls(entry["sha256"])}, "cached"
+
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = session.get(source, headers=headers, timeout=20)
+    now = datetime.now(timezone.utc).isoformat()
+
+    if response.status_code == 304 and entry:
+        entry = {**entry, "checked_at": now}
+        entry["variants"] = write_variants_if_missing(session, source, entry, avif)
+        return source, entry, "unchanged"
+
+    response.raise_for_status()
+    data = response.content
+    digest = hashlib.sha256(data).hexdigest()
+    status = "new" if not entry else ("unchanged" if entry.get("sha256") == digest else "updated")
+
+    return source, {
+        "sha256": digest,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "variants": write_variants(data, digest, avif),
+        "checked_at": now,
+    }, status
+
+
+def write_variants_if_missing(session: requests.Session, source: str, entry: Dict, avif: bool) -> Dict[str, str]:
+    """A 304 means the bytes are unchanged, but variants may have been deleted locally (or --avif is new)"""
+    if has_variants(entry["sha256"], avif):
+        return variant_urls(entry["sha256"])
+    response = session.get(source, timeout=20)
+    response.raise_for_status()
+    return write_variants(response.content, entry["sha256"], avif)
+
+
+def prune_unreferenced(manifest: Dict[str, Dict]) -> int:
+    """Delete variants of images no longer referenced by any cover URL"""
+    prefixes = {entry["sha256"][:16] for entry in manifest.values()}
+    removed = 0
+    for filename in os.listdir(COVERS_DIR):
+        if filename.split("-", 1)[0] not in prefixes:
+            os.remove(os.path.join(COVERS_DIR, filename))
+            removed += 1
+    return removed
+
+
+def main():
+    console.rule("[bold blue]Mirror Cover Images[/]")
+
+    revalidate = "--revalidate" in sys.argv
+    avif = "--avif" in sys.argv
+    workers = DEFAULT_WORKERS
+    if "--workers" in sys.argv:
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
+
+    if avif and not features.check("avif"):
+        console.print("[yellow]This Pillow build has no AVIF support; writing WebP only.[/]")
+        avif = False
+
+    shows = load_json(SHOWS_FILE)
+    if not shows:
+        console.print(f"[red]No shows found in {SHOWS_FILE}[/]")
+        return
+
+    manifest: Dict[str, Dict] = load_json(COVER_MANIFEST_FILE) or {}
+    os.makedirs(COVERS_DIR, exist_ok=True)
+
+    # Remote source per show: a fresh import resets coverImage to the TMDB URL
+    for show in shows:
+        cover = show.get("coverImage") or ""
+        if cover.startswith("http"):
+            show["coverSource"] = cover
+
+    sources = sorted({show["coverSource"] for show in shows if show.get("coverSource")})
+    console.print(f"[cyan]{len(sources)} distinct cover URLs ({len(manifest)} in manifest)[/]")
+
+    session = build_session(workers)
+    counts = {"new": 0, "updated": 0, "unchanged": 0, "cached": 0, "failed": 0}
+
+    with Progress(console=console) as progress:
+        task = progress.add_task("Mirroring covers", total=len(sources))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(mirror_one, session, source, manifest.get(source), revalidate, avif): source
+                for source in sources
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    _, entry, status = future.result()
+                    manifest[source] = entry
+                    counts[status] += 1
+                except Exception as e:
+                    counts["failed"] += 1
+                    console.print(f"[red]Failed {source}: {e}[/]")
+                progress.advance(task)
+
+    # Forget URLs no show uses anymore, then drop their orphaned files
+    manifest = {source: entry for source, entry in manifest.items() if source in sources}
+    save_json(COVER_MANIFEST_FILE, manifest)
+    pruned = prune_unreferenced(manifest)
+
+    rewritten = 0
+    for show in shows:
+        entry = manifest.get(show.get("coverSource") or "")
+        if not entry:
+            continue
+        variants = entry["variants"]
+        changed = False
+        for field, value in (
+            ("coverImage", variants["card"]),
+            ("coverImageLarge", variants["modal"]),
+            ("coverImageAvif", variants.get("card_avif")),
+            ("coverImageLargeAvif", variants.get("modal_avif")),
+        ):
+            if value and show.get(field) != value:
+                show[field] = value
+                changed = True
+            elif not value and field in show:
+                del show[field]
+                changed = True
+        rewritten += changed
+
+    if rewritten:
+        save_json(SHOWS_FILE, shows)
+        export_catalog(shows, CATALOG_EXPORT_DIR)
+
+    distinct = len({entry["sha256"] for entry in manifest.values()})
+    console.print(
+        f"New: {counts['new']} | Updated: {counts['updated']} | Unchanged: {counts['unchanged']} "
+        f"| Cached: {counts['cached']} | Failed: {counts['failed']}"
+    )
+    console.print(f"[dim]{distinct} distinct images for {len(manifest)} URLs, pruned {pruned} stale files[/]")
+    console.print(f"[bold green]✓ Rewrote {rewritten} shows to local covers[/]")
+
+
+if __name__ == "__main__":
+    main()
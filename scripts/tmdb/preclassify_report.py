@@ -0,0 +1,84 @@
+"""
+Precision report for the rule-based pre-classifier (shared/preclassifier.py).
+
+Replays every reviewed item in 4_reviewed.json through the rules and compares
+the verdicts with the audited Gemini suggestion (`ai_suggestion`) and the
+final human rating. Franchise priors are built leave-one-out, so an item
+never votes for itself.
+
+    python preclassify_report.py                 # sweep of thresholds
+    python preclassify_report.py --threshold 0.8 # plus the decided items at 0.8
+
+"Unsafe misses" counts items the rules called Safe that a reviewer rated
+Caution or Unsafe; keep it at zero for the threshold used by 3_assess.py.
+"""
+import sys
+from collections import Counter
+from rich.console import Console
+from rich.table import Table
+from shared.config import REVIEWED_FILE
+from shared.io_utils import load_json
+from shared.models import ReviewedItem
+from shared.preclassifier import MIN_CONFIDENCE, build_franchise_priors, preclassify
+
+console = Console()
+
+THRESHOLDS = (0.5, 0.6, 0.7, 0.8, 0.9)
+
+
+def main():
+    console.rule("[bold blue]Pre-classifier Precision[/]")
+
+    threshold = None
+    if "--threshold" in sys.argv:
+        threshold = float(sys.argv[sys.argv.index("--threshold") + 1])
+
+    reviewed = [ReviewedItem.from_dict(item) for item in load_json(REVIEWED_FILE) or []]
+    reviewed = [item for item in reviewed if item.ai_suggestion and item.ai_suggestion.source == "gemini"]
+    if not reviewed:
+        console.print("[red]No reviewed items with a Gemini suggestion. Run stages 3-4 first.[/]")
+        return
+
+    priors = build_franchise_priors(reviewed)
+    verdicts = []  # (item, assessment, confidence)
+    for item in reviewed:
+        result = preclassify(item.enriched, priors)
+        if result:
+            verdicts.append((item, *result))
+
+    table = Table(title=f"{len(reviewed)} reviewed items")
+    for column in ("Threshold", "Decided", "Coverage", "= Gemini", "= Reviewer", "Unsafe misses"):
+        table.add_column(column, justify="right")
+    for level in sorted(set(THRESHOLDS) | {MIN_CONFIDENCE} | ({threshold} if threshold else set())):
+        decided = [(item, assessment) for item, assessment, confidence in verdicts if confidence >= level]
+        agree_ai = sum(1 for item, assessment in decided if assessment.rating == item.ai_suggestion.rating)
+        agree_human = sum(1 for item, assessment in decided if assessment.rating == item.rating)
+        misses = sum(1 for item, assessment in decided if assessment.rating == "Safe" and item.rating != "Safe")
+        table.add_row(
+            f"{level:.2f}{' *' if level == MIN_CONFIDENCE else ''}",
+            str(len(decided)),
+            f"{len(decided) / len(reviewed):.0%}",
+            f"{agree_ai / len(decided):.0%}" if decided else "-",
+            f"{agree_human / len(decided):.0%}" if decided else "-",
+            f"[red]{misses}[/]" if misses else "0",
+        )
+    console.print(table)
+    console.print("[dim]* current MIN_CONFIDENCE; Gemini calls saved = coverage at that threshold[/]")
+
+    by_rating = Counter(assessment.rating for _, assessment, confidence in verdicts if confidence >= MIN_CONFIDENCE)
+    console.print(f"Decided at {MIN_CONFIDENCE}: " + ", ".join(f"{rating} {count}" for rating, count in by_rating.items()))
+
+    if threshold is not None:
+        for item, assessment, confidence in sorted(verdicts, key=lambda verdict: -verdict[2]):
+            if confidence < threshold:
+                continue
+            marker = "[green]✓[/]" if assessment.rating == item.rating else "[red]✗[/]"
+            console.print(
+                f"{marker} {confidence:.2f} {item.enriched.title} "
+                f"[dim]({item.enriched.certification or 'no cert'}; rules {assessment.rating}, "
+                f"reviewer {item.rating})[/]"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Refresh stale catalog fields within a daily TMDB request budget.
+
+Each field group (platforms, releaseYear, details) has a TTL and a
+last-fetched timestamp per show. The scheduler plans the fewest calls that
+bring the most popular overdue titles back within their TTLs, then runs
+the plan with TMDBClient. Titles that don't fit today's budget are picked
+up on the next run.
+
+    python refresh_catalog.py --plan     # show the plan only
+    python refresh_catalog.py [--budget 500] [--region US]
+"""
+import sys
+from typing import Dict, Optional, Tuple
+from rich.console import Console
+from rich.progress import track
+from rich.table import Table
+from refresh_platforms import MEDIA_TYPES, apply_availability, collect_availability, select_providers, record_refresh
+from shared.budget_ledger import BudgetLedger
+from shared.catalog_export import export_catalog
+from shared.config import (
+    TMDB_API_KEY, TMDB_BASE_URL, TMDB_IMAGE_BASE, TMDB_DAILY_REQUEST_BUDGET,
+    SHOWS_FILE, ENRICHED_FILE, REFRESH_STATE_FILE, CATALOG_EXPORT_DIR
+)
+from shared.io_utils import load_json, save_json
+from shared.refresh_scheduler import FIELD_GROUPS, RefreshPlan, RefreshTask, mark_fetched, now_iso, plan_refresh
+from shared.tmdb_client import TMDBClient
+
+console = Console()
+SAVE_EVERY = 25
+
+
+def fetch_details(client: TMDBClient, task: RefreshTask) -> Tuple[Optional[str], Optional[Dict], int]:
+    """(media type, details, calls made). Unknown media types are resolved by
+    checking the IMDb id, since TV and movie ids overlap."""
+    calls = 0
+    for media_type in ([task.media_type] if task.media_type else MEDIA_TYPES):
+        get_details = client.get_tv_details if media_type == "tv" else client.get_movie_details
+        calls += 1
+        try:
+            details = get_details(task.tmdb_id)
+        except Exception as e:
+            if task.media_type:
+                console.print(f"[red]Error fetching {task.title}: {e}[/]")
+            continue
+        if details.get("external_ids", {}).get("imdb_id") == task.show_id:
+            return media_type, details, calls
+    return None, None, calls
+
+
+def apply_details(client: TMDBClient, show: Dict, details: Dict, media_type: str) -> bool:
+    """Update every field group from a detail response; returns True if anything changed"""
+    updates = {
+        "platforms": client.extract_platforms(details.get("watch/providers", {})),
+        "releaseYear": client.format_year_range(details, media_type),
+    }
+    if details.get("overview"):
+        updates["synopsis"] = details["overview"]
+    cast = [actor["name"] for actor in details.get("credits", {}).get("cast", [])[:3]]
+    if cast:
+        updates["cast"] = cast
+    if media_type == "tv":
+        runtimes = details.get("episode_run_time", [])
+        runtime = client.format_runtime(runtimes[0]) if runtimes else ""
+    else:
+        runtime = client.format_runtime(details.get("runtime"))
+    if runtime:
+        updates["runtime"] = runtime
+
+    changed = {key: value for key, value in updates.items() if show.get(key) != value}
+    show.update(changed)
+    return bool(changed)
+
+
+def print_plan(plan: RefreshPlan, budget: Optional[float]) -> None:
+    table = Table(title="Refresh plan (highest priority first)")
+    table.add_column("Title")
+    table.add_column("Stale groups")
+    table.add_column("Calls", justify="right")
+    table.add_column("Score", justify="right")
+    for task in plan.tasks[:20]:
+        table.add_row(task.title, ", ".join(task.groups), str(task.cost), f"{task.score:.1f}")
+    console.print(table)
+
+    if plan.bulk_platforms:
+        console.print(f"[cyan]Bulk platform refresh: ~{plan.bulk_platform_calls} calls[/]")
+    console.print(
+        f"Planned calls: {plan.calls} (budget left today: {'unlimited' if budget is None else int(budget)}) | "
+        f"Title fetches: {len(plan.tasks)} | Deferred: {plan.deferred} | Fresh: {plan.fresh}"
+    )
+
+
+def main():
+    console.rule("[bold blue]Catalog Refresh Scheduler[/]")
+
+    daily_budget = TMDB_DAILY_REQUEST_BUDGET
+    if "--budget" in sys.argv:
+        daily_budget = int(sys.argv[sys.argv.index("--budget") + 1])
+    region = "US"
+    if "--region" in sys.argv:
+        region = sys.argv[sys.argv.index("--region") + 1]
+
+    shows = load_json(SHOWS_FILE)
+    if not shows:
+        console.print(f"[red]No shows found in {SHOWS_FILE}[/]")
+        return
+
+    ledger = BudgetLedger()
+    state: Dict = load_json(REFRESH_STATE_FILE) or {}
+    enriched = [item for item in load_json(ENRICHED_FILE) or [] if item.get("imdb_id")]
+    media_types = {item["imdb_id"]: item["media_type"] for item in enriched}
+    popularity = {item["imdb_id"]: item["popularity"] for item in enriched if item.get("popularity")}
+    budget = ledger.remaining("tmdb", daily_budget)
+
+    plan = plan_refresh(shows, state, budget, media_types, popularity)
+    print_plan(plan, budget)
+    if "--plan" in sys.argv or not (plan.tasks or plan.bulk_platforms):
+        return
+
+    if not TMDB_API_KEY:
+        console.print("[red]TMDB_API_KEY not found in .env file. Please add it and try again.[/]")
+        return
+
+    client = TMDBClient(TMDB_API_KEY, TMDB_BASE_URL, TMDB_IMAGE_BASE)
+    changed = 0
+
+    if plan.bulk_platforms:
+        providers = select_providers(client, shows, region)
+        availability, failed_queries, calls = collect_availability(client, providers, region)
+        updated, found, _ = apply_availability(shows, providers, availability, False, failed_queries)
+        if failed_queries:
+            names = ", ".join(f"{name} ({media_type})" for media_type, name in sorted(failed_queries))
+            console.print(f"[yellow]Incomplete platform results for {names}; those shows stay due[/]")
+        # Partial results are not a fresh fetch; the scheduler keeps these shows due
+        record_refresh([] if failed_queries else found, calls + len(MEDIA_TYPES))
+        state = load_json(REFRESH_STATE_FILE) or {}
+        changed += updated
+
+    shows_by_id = {show["id"]: show for show in shows}
+    failed = 0
+    for index, task in enumerate(track(plan.tasks, description="Refreshing titles"), start=1):
+        if ledger.exhausted("tmdb", daily_budget):
+            console.print("[yellow]Daily TMDB budget reached; the rest will run next time.[/]")
+            break
+
+        media_type, details, calls = fetch_details(client, task)
+        ledger.record("tmdb", requests=calls)
+        if not details:
+            failed += 1
+            continue
+
+        show = shows_by_id[task.show_id]
+        if apply_details(client, show, details, media_type):
+            changed += 1
+        entry = state.setdefault(task.show_id, {})
+        entry["mediaType"] = media_type
+        entry["popularity"] = details.get("popularity")
+        mark_fetched(state, task.show_id, list(FIELD_GROUPS), now_iso())
+
+        if index % SAVE_EVERY == 0:
+            save_json(REFRESH_STATE_FILE, state)
+            save_json(SHOWS_FILE, shows)
+
+    save_json(REFRESH_STATE_FILE, state)
+    if changed:
+        save_json(SHOWS_FILE, shows)
+        export_catalog(shows, CATALOG_EXPORT_DIR)
+
+    console.print(f"Used today: {int(ledger.used('tmdb'))} TMDB requests | Failed: {failed}")
+    console.print(f"[bold green]✓ Refreshed {changed} shows[/]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Bulk-refresh streaming platforms without per-title detail calls.
+
+Inverts the lookup: for each provider in the catalog, page through
+/discover/tv and /discover/movie filtered by with_watch_providers and
+watch_region, collect id -> platforms, then rewrite `platforms` for every
+catalog entry in one pass. Calls scale with providers x pages, not titles.
+
+    python refresh_platforms.py [--region US] [--clear-missing] [--dry-run]
+
+Titles that no provider query returned keep their platforms unless
+--clear-missing is given (they may sit outside the discovery genres,
+e.g. shows added manually with add_show.py).
+
+If a provider's pagination fails part-way, its availability is unknown:
+titles keep that provider in their platforms if they had it, nothing is
+cleared, and the run is not recorded as a fresh platform fetch.
+"""
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+from rich.console import Console
+from rich.progress import Progress
+from shared.budget_ledger import BudgetLedger
+from shared.catalog_export import export_catalog
+from shared.config import (
+    TMDB_API_KEY, TMDB_BASE_URL, TMDB_IMAGE_BASE, TMDB_WATCH_PROVIDERS, TV_DISCOVERY_FILTERS,
+    MOVIE_DISCOVERY_FILTERS, SHOWS_FILE, ENRICHED_FILE, REFRESH_STATE_FILE, CATALOG_EXPORT_DIR
+)
+from shared.io_utils import load_json, save_json
+from shared.refresh_scheduler import mark_fetched, now_iso
+from shared.tmdb_client import TMDBClient
+
+console = Console()
+
+MEDIA_TYPES = ("tv", "movie")
+MAX_PAGES = 500  # TMDB's discover page cap
+# Same availability the detail endpoint's flatrate/free/ads buckets cover
+MONETIZATION_TYPES = "flatrate|free|ads"
+
+
+def provider_filters(media_type: str, provider_id: int, region: str) -> Dict:
+    """Discovery filters scoped to one provider; quality thresholds are dropped so
+    titles already in the catalog still match if their votes have shifted"""
+    base = TV_DISCOVERY_FILTERS if media_type == "tv" else MOVIE_DISCOVERY_FILTERS
+    return {
+        "with_genres": base["with_genres"],
+        "with_watch_providers": str(provider_id),
+        "watch_region": region,
+        "with_watch_monetization_types": MONETIZATION_TYPES,
+        "sort_by": "popularity.desc",
+    }
+
+
+def select_providers(
+    client: TMDBClient,
+    shows: List[Dict],
+    region: str
+) -> Dict[str, List[Tuple[int, str, int]]]:
+    """Per media type: (provider id, name, display priority) for providers the
+    catalog already lists, plus any configured in TMDB_WATCH_PROVIDERS"""
+    catalog_names = {name for show in shows for name in show.get("platforms") or []}
+    configured_ids = {int(value) for value in TMDB_WATCH_PROVIDERS.replace(",", "|").split("|") if value.strip()}
+
+    selected = {}
+    for media_type in MEDIA_TYPES:
+        selected[media_type] = [
+            (
+                provider["provider_id"],
+                provider["provider_name"],
+                provider.get("display_priorities", {}).get(region, provider.get("display_priority", 999)),
+            )
+            for provider in client.get_watch_providers(media_type, region)
+            if provider["provider_name"] in catalog_names or provider["provider_id"] in configured_ids
+        ]
+    return selected
+
+
+def collect_availability(
+    client: TMDBClient,
+    providers: Dict[str, List[Tuple[int, str, int]]],
+    region: str
+) -> Tuple[Dict[Tuple[str, int], Set[str]], Set[Tuple[str, str]], int]:
+    """
+    (media type, tmdb id) -> provider names, the (media type, provider name)
+    queries that failed (their results are incomplete), and the API calls made
+    """
+    availability: Dict[Tuple[str, int], Set[str]] = {}
+    failed: Set[Tuple[str, str]] = set()
+    calls = 0
+
+    with Progress(console=console) as progress:
+        total = sum(len(items) for items in providers.values())
+        task = progress.add_task("Provider queries", total=total)
+        for media_type, items in providers.items():
+            discover = client.discover_tv if media_type == "tv" else client.discover_movies
+            for provider_id, name, _ in items:
+                page, total_pages = 1, 1
+                while page <= min(total_pages, MAX_PAGES):
+                    try:
+                        response = discover(page=page, **provider_filters(media_type, provider_id, region))
+                    except Exception as e:
+                        console.print(f"[red]Error querying {name} ({media_type}) page {page}: {e}[/]")
+                        failed.add((media_type, name))
+                        break
+                    calls += 1
+                    for result in response.get("results", []):
+                        availability.setdefault((media_type, result["id"]), set()).add(name)
+                    total_pages = response.get("total_pages", 1)
+                    page += 1
+                progress.advance(task)
+
+    return availability, failed, calls
+
+
+def resolve_platforms(
+    show: Dict,
+    known_media_type: Optional[str],
+    availability: Dict[Tuple[str, int], Set[str]]
+) -> Optional[Set[str]]:
+    """Platforms for a show, or None when it wasn't found (or is ambiguous)"""
+    tmdb_id = int(show["tmdbId"])
+    if known_media_type:
+        return availability.get((known_media_type, tmdb_id))
+    # shows.json doesn't record the media type and TV/movie ids overlap:
+    # only trust a match that exists on one side
+    matches = [availability[key] for key in (("tv", tmdb_id), ("movie", tmdb_id)) if key in availability]
+    return matches[0] if len(matches) == 1 else None
+
+
+def apply_availability(
+    shows: List[Dict],
+    providers: Dict[str, List[Tuple[int, str, int]]],
+    availability: Dict[Tuple[str, int], Set[str]],
+    clear_missing: bool,
+    failed: Set[Tuple[str, str]] = frozenset()
+) -> Tuple[int, List[str], int]:
+    """
+    Rewrite platforms in place. Returns (shows changed, ids found, ids not
+    found/ambiguous). Providers whose query failed are left as they were on
+    each show, and nothing is cleared when any query failed.
+    """
+    # Order platforms the way TMDB ranks providers in this region
+    priority = {name: rank for items in providers.values() for _, name, rank in items}
+    media_types = {item["imdb_id"]: item["media_type"] for item in load_json(ENRICHED_FILE) or []}
+
+    failed_names = {media_type: {name for failed_type, name in failed if failed_type == media_type}
+                    for media_type in MEDIA_TYPES}
+    clear_missing = clear_missing and not failed
+
+    updated = missing = 0
+    found: List[str] = []
+    for show in shows:
+        if not show.get("tmdbId"):
+            continue
+        known_media_type = media_types.get(show["id"])
+        platforms = resolve_platforms(show, known_media_type, availability)
+        if platforms is None:
+            missing += 1
+            if not clear_missing:
+                continue
+            platforms = set()
+        else:
+            found.append(show["id"])
+
+        # Unknown availability on a failed provider: keep whatever the show had
+        unknown = failed_names[known_media_type] if known_media_type else set().union(*failed_names.values())
+        platforms = set(platforms) | (set(show.get("platforms") or []) & unknown)
+
+        ordered = sorted(platforms, key=lambda name: (priority.get(name, 999), name))
+        if ordered != (show.get("platforms") or []):
+            show["platforms"] = ordered
+            updated += 1
+
+    return updated, found, missing
+
+
+def record_refresh(found: List[str], calls: int) -> None:
+    """Mark platforms fresh for the refresh scheduler and log the API calls"""
+    state = load_json(REFRESH_STATE_FILE) or {}
+    fetched_at = now_iso()
+    for show_id in found:
+        mark_fetched(state, show_id, ["platforms"], fetched_at)
+    state.setdefault("_meta", {})["bulkPlatformCalls"] = calls
+    save_json(REFRESH_STATE_FILE, state)
+    BudgetLedger().record("tmdb", requests=calls)
+
+
+def main():
+    console.rule("[bold blue]Bulk Platform Refresh[/]")
+
+    region = "US"
+    if "--region" in sys.argv:
+        region = sys.argv[sys.argv.index("--region") + 1]
+    clear_missing = "--clear-missing" in sys.argv
+    dry_run = "--dry-run" in sys.argv
+
+    if not TMDB_API_KEY:
+        console.print("[red]TMDB_API_KEY not found in .env file. Please add it and try again.[/]")
+        return
+
+    shows = load_json(SHOWS_FILE)
+    if not shows:
+        console.print(f"[red]No shows found in {SHOWS_FILE}[/]")
+        return
+
+    client = TMDBClient(TMDB_API_KEY, TMDB_BASE_URL, TMDB_IMAGE_BASE)
+    providers = select_providers(client, shows, region)
+    console.print(
+        f"[cyan]{len(providers['tv'])} TV and {len(providers['movie'])} movie providers "
+        f"for {len(shows)} catalog titles ({region})[/]"
+    )
+
+    availability, failed, calls = collect_availability(client, providers, region)
+    calls += len(MEDIA_TYPES)  # Provider list lookups
+    updated, found, missing = apply_availability(shows, providers, availability, clear_missing, failed)
+
+    console.print(
+        f"API calls: {calls} | Found: {len(found)} | Not found/ambiguous: {missing} "
+        f"({'cleared' if clear_missing and not failed else 'kept'})"
+    )
+    if failed:
+        names = ", ".join(f"{name} ({media_type})" for media_type, name in sorted(failed))
+        console.print(f"[yellow]Incomplete results for {names}: those providers were left unchanged "
+                      f"and nothing was cleared[/]")
+
+    if dry_run:
+        console.print(f"[yellow]Dry run: {updated} shows would change[/]")
+        return
+
+    # Partial results are not a fresh fetch; the scheduler keeps these shows due
+    record_refresh([] if failed else found, calls)
+    if updated:
+        save_json(SHOWS_FILE, shows)
+        export_catalog(shows, CATALOG_EXPORT_DIR)
+    console.print(f"[bold green]✓ Updated platforms on {updated} shows[/]")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from rich.console import Console
 from rich.prompt import Confirm
 from shared.config import DATA_DIR, DISCOVERED_FILE, ENRICHED_FILE, ASSESSED_FILE, REVIEWED_FILE
-import os
+from shared.io_utils import remove_json
 
 console = Console()
 
@@ -17,8 +17,7 @@ def main():
     removed = 0
 
     for path in files:
-        if os.path.exists(path):
-            os.remove(path)
+        if remove_json(path):
             removed += 1
 
     console.print(f"[bold green]✓ Removed {removed} file(s)[/]")
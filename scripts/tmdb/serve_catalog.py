@@ -0,0 +1,267 @@
+"""
+Read-only catalog query server for internal tools and QA.
+
+Serves shows.json through an in-memory CatalogIndex (bitmap + interval
+indexes, title search, classifyShow policy) and hot-reloads when the file
+changes on disk.
+
+    python serve_catalog.py [--port 8765]
+    python serve_catalog.py --bench
+
+Endpoints:
+    GET /shows?q=paw&age=4&tags=Educational&platforms=Netflix,Hulu
+              &rating=Safe&stimulation=Low&age_min=3&age_max=5
+              &exclude_tags=Violence&safe_above_max=6
+              &sort=title&desc=1&offset=0&limit=20
+    GET /shows/<id>?age=4
+    GET /health
+"""
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit
+from rich.console import Console
+from shared.catalog_query import CatalogIndex, SORT_KEYS
+from shared.config import SHOWS_FILE, CATALOG_SERVER_PORT
+from shared.io_utils import load_json
+
+console = Console()
+RELOAD_CHECK_SECONDS = 1.0
+MAX_PAGE_SIZE = 200
+
+
+class CatalogStore:
+    """Holds the current index and swaps in a rebuilt one when shows.json changes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.index: Optional[CatalogIndex] = None
+        self.signature = None
+        self.last_check = 0.0
+        self.reload()
+
+    def _stat_signature(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self) -> None:
+        signature = self._stat_signature()
+        started = time.perf_counter()
+        index = CatalogIndex(load_json(self.path) or [])
+        self.index, self.signature = index, signature
+        elapsed = (time.perf_counter() - started) * 1000
+        console.print(f"[dim]Indexed {len(index.shows)} shows in {elapsed:.0f} ms[/]")
+
+    def current(self) -> CatalogIndex:
+        now = time.monotonic()
+        if now - self.last_check >= RELOAD_CHECK_SECONDS:
+            with self.lock:
+                if now - self.last_check >= RELOAD_CHECK_SECONDS:
+                    self.last_check = now
+                    try:
+                        if self._stat_signature() != self.signature:
+                            console.print("[yellow]shows.json changed, reloading...[/]")
+                            self.reload()
+                    except (OSError, ValueError) as e:
+                        # Mid-write or briefly missing: keep serving the old index
+                        console.print(f"[red]Reload failed, keeping previous index: {e}[/]")
+        return self.index
+
+
+def parse_query(query: str) -> Dict:
+    params = parse_qs(query)
+
+    def one(name: str) -> Optional[str]:
+        values = params.get(name)
+        return values[-1] if values else None
+
+    def many(name: str) -> List[str]:
+        return [item for value in params.get(name, []) for item in value.split(",") if item]
+
+    def number(name: str) -> Optional[float]:
+        value = one(name)
+        return float(value) if value not in (None, "") else None
+
+    sort = one("sort") or "title"
+    if sort not in SORT_KEYS:
+        raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+
+    return {
+        "q": one("q") or "",
+        "age": number("age"),
+        "age_min": number("age_min"),
+        "age_max": number("age_max"),
+        "safe_above_max": number("safe_above_max"),
+        "tags": many("tags"),
+        "exclude_tags": many("exclude_tags"),
+        "platforms": many("platforms"),
+        "ratings": many("rating"),
+        "stimulation": many("stimulation"),
+        "sort": sort,
+        "descending": one("desc") in ("1", "true"),
+        "offset": max(0, int(one("offset") or 0)),
+        "limit": min(MAX_PAGE_SIZE, max(0, int(one("limit") or 20))),
+    }
+
+
+def make_handler(store: CatalogStore):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive for tool clients
+        # Headers and body go out in separate writes; don't let Nagle hold the body
+        disable_nagle_algorithm = True
+
+        def _send(self, status: int, body: Dict) -> None:
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            index = store.current()
+            try:
+                if url.path == "/health":
+                    self._send(200, {"shows": len(index.shows)})
+                elif url.path == "/shows":
+                    started = time.perf_counter()
+                    total, items = index.query(**parse_query(url.query))
+                    elapsed_us = (time.perf_counter() - started) * 1e6
+                    self._send(200, {"total": total, "items": items, "took_us": round(elapsed_us)})
+                elif url.path.startswith("/shows/"):
+                    age = parse_query(url.query)["age"]
+                    show = index.get(url.path[len("/shows/"):], age)
+                    if show is None:
+                        self._send(404, {"error": "not found"})
+                    else:
+                        self._send(200, show)
+                else:
+                    self._send(404, {"error": "not found"})
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+
+        def do_POST(self):
+            self._send(405, {"error": "read-only"})
+
+        do_PUT = do_PATCH = do_DELETE = do_POST
+
+        def log_message(self, format, *args):
+            pass  # Keep benchmark and tool output readable
+
+    return Handler
+
+
+def random_queries(index: CatalogIndex, count: int, seed: int = 7) -> List[Dict]:
+    """Representative mixes of the filters the app and QA tools use"""
+    rng = random.Random(seed)
+    tags = list(index.tags)
+    platforms = sorted(index.platforms, key=lambda name: -bin(index.platforms[name]).count("1"))[:20]
+    titles = [title for title in index.titles if len(title) >= 4]
+
+    queries = []
+    for _ in range(count):
+        query: Dict = {"limit": 20, "sort": rng.choice(list(SORT_KEYS))}
+        if rng.random() < 0.6:
+            query["age"] = rng.choice([1, 2, 3, 4, 5, 6, 7, 8, 10, 12])
+        if rng.random() < 0.4:
+            query["tags"] = [rng.choice(tags)]
+        if rng.random() < 0.4:
+            query["platforms"] = rng.sample(platforms, 2)
+        if rng.random() < 0.5:
+            query["ratings"] = ["Safe"]
+        if rng.random() < 0.3:
+            query["stimulation"] = [rng.choice(["Low", "Medium", "High"])]
+        if rng.random() < 0.4:
+            title = rng.choice(titles)
+            start = rng.randrange(0, len(title) - 3)
+            query["q"] = title[start:start + rng.randint(3, 6)]
+        queries.append(query)
+    return queries
+
+
+def to_query_string(query: Dict) -> str:
+    return urlencode({
+        {"ratings": "rating"}.get(key, key): ",".join(value) if isinstance(value, list) else value
+        for key, value in query.items()
+    })
+
+
+def benchmark(store: CatalogStore, count: int = 5000, clients: int = 8) -> None:
+    index = store.current()
+    queries = random_queries(index, count)
+
+    console.rule("[bold blue]In-process query benchmark[/]")
+    timings = []
+    started = time.perf_counter()
+    for query in queries:
+        query_started = time.perf_counter()
+        index.query(**query)
+        timings.append((time.perf_counter() - query_started) * 1e6)
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    console.print(f"{count} queries: {count / elapsed:,.0f} queries/s")
+    console.print(
+        f"latency µs: p50={statistics.median(timings):.0f} "
+        f"p95={timings[int(count * 0.95)]:.0f} p99={timings[int(count * 0.99)]:.0f}"
+    )
+
+    console.rule(f"[bold blue]HTTP benchmark ({clients} keep-alive clients)[/]")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(store))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    paths = [f"/shows?{to_query_string(query)}" for query in queries]
+
+    def client(worker: int) -> None:
+        connection = HTTPConnection("127.0.0.1", port)
+        for path in paths[worker::clients]:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(worker,)) for worker in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+    console.print(f"{count} requests: {count / elapsed:,.0f} requests/s")
+
+
+def main():
+    if not os.path.exists(SHOWS_FILE):
+        console.print(f"[red]Shows file not found: {SHOWS_FILE}[/]")
+        return
+
+    store = CatalogStore(SHOWS_FILE)
+
+    if "--bench" in sys.argv:
+        benchmark(store)
+        return
+
+    port = CATALOG_SERVER_PORT
+    if "--port" in sys.argv:
+        port = int(sys.argv[sys.argv.index("--port") + 1])
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(store))
+    console.rule("[bold blue]Catalog Query Server[/]")
+    console.print(f"[green]Serving {SHOWS_FILE} on http://127.0.0.1:{port}/shows[/]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[dim]Stopped.[/]")
+
+
+if __name__ == "__main__":
+    main()
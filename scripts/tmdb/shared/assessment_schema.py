@@ -0,0 +1,164 @@
+"""
+Response schema, validation and local repair for Gemini safety verdicts.
+
+GeminiClient sends RESPONSE_SCHEMA as generationConfig.responseSchema, so
+the model is constrained to the AIAssessment fields and enums. Replies are
+still checked here in one pass: near misses (code fences, "5+" for a number,
+"yes" for a boolean, "medium" for "Medium") are repaired locally, and only
+the fields that stay invalid are asked for again (see
+GeminiClient._follow_up), instead of discarding the whole call.
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+RATINGS = ("Safe", "Caution", "Unsafe")
+STIMULATION_LEVELS = ("Low", "Medium", "High")
+BOOLEAN_FIELDS = ("is_episodic_issue", "has_lgbtq", "has_violence", "has_scary", "is_educational")
+MIN_REASONING_CHARS = 20  # Shorter than this is treated as missing
+
+RESPONSE_SCHEMA: Dict[str, Any] = {
+    "type": "OBJECT",
+    "properties": {
+        "rating": {"type": "STRING", "enum": list(RATINGS)},
+        "min_age": {"type": "NUMBER"},
+        "max_age": {"type": "NUMBER"},
+        "safe_above_age": {"type": "NUMBER", "nullable": True},
+        "is_episodic_issue": {"type": "BOOLEAN"},
+        "stimulation_level": {"type": "STRING", "enum": list(STIMULATION_LEVELS)},
+        "has_lgbtq": {"type": "BOOLEAN"},
+        "has_violence": {"type": "BOOLEAN"},
+        "has_scary": {"type": "BOOLEAN"},
+        "is_educational": {"type": "BOOLEAN"},
+        "reasoning": {"type": "STRING"},
+    },
+    "required": [
+        "rating", "min_age", "max_age", "safe_above_age", "is_episodic_issue", "stimulation_level",
+        "has_lgbtq", "has_violence", "has_scary", "is_educational", "reasoning",
+    ],
+}
+RESPONSE_SCHEMA["propertyOrdering"] = list(RESPONSE_SCHEMA["properties"])
+
+FENCE_PATTERN = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+
+
+def schema_for(fields: List[str]) -> Dict[str, Any]:
+    """RESPONSE_SCHEMA restricted to some fields (for follow-up requests)"""
+    return {
+        "type": "OBJECT",
+        "properties": {field: RESPONSE_SCHEMA["properties"][field] for field in fields},
+        "required": list(fields),
+        "propertyOrdering": list(fields),
+    }
+
+
+def parse_json_text(text: str) -> Optional[Dict]:
+    """The JSON object in a reply, tolerating fences, surrounding prose and trailing commas"""
+    cleaned = FENCE_PATTERN.sub("", (text or "").strip())
+    start, end = cleaned.find("{"), cleaned.rfind("}")
+    if start < 0 or end < start:
+        return None
+    candidate = cleaned[start:end + 1]
+    for attempt in (candidate, TRAILING_COMMA_PATTERN.sub(r"\1", candidate)):
+        try:
+            data = json.loads(attempt)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, list) and data and isinstance(data[0], dict):
+            data = data[0]  # Occasionally wrapped in a one-element array
+        return data if isinstance(data, dict) else None
+    return None
+
+
+def _enum(value: Any, choices: Tuple[str, ...]) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    text = value.strip().lower()
+    for choice in choices:
+        if text == choice.lower() or (len(text) >= 3 and choice.lower().startswith(text)):
+            return choice
+    return None
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        match = NUMBER_PATTERN.search(value)  # "5+", "5 years", "ages 3-7" -> first number
+        if match:
+            return float(match.group(0))
+    return None
+
+
+def _boolean(value: Any) -> Optional[bool]:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ("true", "yes", "y", "1"):
+            return True
+        if text in ("false", "no", "n", "0", "none"):
+            return False
+    return None
+
+
+def validate(data: Dict) -> Tuple[Dict, List[str]]:
+    """
+    (repaired copy, invalid field names). Repairs are local and lossless
+    where possible; anything that can't be repaired is listed as invalid
+    and left out of the copy.
+    """
+    repaired: Dict[str, Any] = {key: value for key, value in data.items() if key not in RESPONSE_SCHEMA["properties"]}
+    invalid: List[str] = []
+
+    rating = _enum(data.get("rating"), RATINGS)
+    stimulation = _enum(data.get("stimulation_level"), STIMULATION_LEVELS)
+    for field, value in (("rating", rating), ("stimulation_level", stimulation)):
+        if value is None:
+            invalid.append(field)
+        else:
+            repaired[field] = value
+
+    for field in ("min_age", "max_age"):
+        value = _number(data.get(field))
+        if value is None or value < 0:
+            invalid.append(field)
+        else:
+            repaired[field] = value
+    if "min_age" in repaired and "max_age" in repaired and repaired["max_age"] < repaired["min_age"]:
+        repaired["min_age"], repaired["max_age"] = repaired["max_age"], repaired["min_age"]
+
+    safe_above = data.get("safe_above_age")
+    if safe_above is None or (isinstance(safe_above, str) and safe_above.strip().lower() in ("", "null", "none", "n/a")):
+        repaired["safe_above_age"] = None
+    elif _number(safe_above) is not None:
+        repaired["safe_above_age"] = _number(safe_above)
+    else:
+        invalid.append("safe_above_age")
+    if repaired.get("rating") in ("Safe", "Unsafe"):
+        repaired["safe_above_age"] = None  # Only meaningful for Caution
+
+    for field in BOOLEAN_FIELDS:
+        value = _boolean(data.get(field))
+        if value is None and field == "is_episodic_issue" and field not in data:
+            value = False  # Optional in practice; the prompt defines false as the default
+        if value is None:
+            invalid.append(field)
+        else:
+            repaired[field] = value
+
+    reasoning = data.get("reasoning")
+    if isinstance(reasoning, list):
+        reasoning = " ".join(str(part) for part in reasoning)
+    if isinstance(reasoning, str) and len(reasoning.strip()) >= MIN_REASONING_CHARS:
+        repaired["reasoning"] = reasoning.strip()
+    else:
+        invalid.append("reasoning")
+
+    return repaired, invalid
@@ -0,0 +1,109 @@
+"""
+Persistent per-day API usage ledger.
+
+    {"2026-10-19": {
+        "tmdb": {"requests": 812},
+        "gemini": {"requests": 40, "tokens": 61000, ...,
+                   "models": {"gemini-2.5-flash": {"requests": 40, "tokens": 61000, ...}}}
+    }}
+
+Days are UTC dates (provider quotas reset on UTC midnight), so a run that
+stops at its budget picks up again the next day.
+"""
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from .config import BUDGET_LEDGER_FILE, GEMINI_DAILY_REQUEST_BUDGET, GEMINI_DAILY_TOKEN_BUDGET
+
+KEEP_DAYS = 60  # Older days are dropped on save
+
+
+def today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class BudgetLedger:
+    def __init__(self, path: str = BUDGET_LEDGER_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.days: Dict[str, Dict[str, Dict]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.days = json.load(f)
+
+    def used(self, service: str, metric: str = "requests", day: Optional[str] = None, model: Optional[str] = None) -> float:
+        usage = self.days.get(day or today(), {}).get(service, {})
+        if model:
+            usage = usage.get("models", {}).get(model, {})
+        return usage.get(metric, 0)
+
+    def history(self, service: str) -> Dict[str, float]:
+        """Totals per metric across all kept days (for averages such as tokens per request)"""
+        totals: Dict[str, float] = {}
+        for services in self.days.values():
+            for metric, value in services.get(service, {}).items():
+                if metric != "models":
+                    totals[metric] = totals.get(metric, 0) + value
+        return totals
+
+    def remaining(self, service: str, limit: int, metric: str = "requests") -> Optional[float]:
+        """Budget left today, or None when the limit is 0 (unlimited)"""
+        if limit <= 0:
+            return None
+        return max(0, limit - self.used(service, metric))
+
+    def exhausted(self, service: str, limit: int, metric: str = "requests") -> bool:
+        left = self.remaining(service, limit, metric)
+        return left is not None and left <= 0
+
+    def record(self, service: str, requests: int = 1, model: Optional[str] = None, **metrics: float) -> None:
+        """Add usage for today (and per model, if given) and persist immediately"""
+        with self.lock:
+            self._load()  # Another process (e.g. add_show.py) may have recorded usage meanwhile
+            usage = self.days.setdefault(today(), {}).setdefault(service, {})
+            targets = [usage]
+            if model:
+                targets.append(usage.setdefault("models", {}).setdefault(model, {}))
+            for target in targets:
+                target["requests"] = target.get("requests", 0) + requests
+                for metric, value in metrics.items():
+                    target[metric] = target.get(metric, 0) + value
+            self._save()
+
+    def _save(self) -> None:
+        for day in sorted(self.days)[:-KEEP_DAYS]:
+            del self.days[day]
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.days, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class QuotaExceeded(RuntimeError):
+    """A configured daily ceiling has been reached"""
+
+
+def gemini_usage(result: Dict) -> Dict[str, int]:
+    """Token counts from a generateContent response's usageMetadata"""
+    usage = result.get("usageMetadata", {})
+    return {
+        "completed": 1,  # Responses with usage, for per-response averages
+        "prompt_tokens": usage.get("promptTokenCount", 0),
+        "cached_tokens": usage.get("cachedContentTokenCount", 0),  # Included in prompt_tokens, billed at a discount
+        "output_tokens": usage.get("candidatesTokenCount", 0),
+        "tokens": usage.get("totalTokenCount", 0),
+    }
+
+
+def ensure_gemini_quota(ledger: BudgetLedger) -> None:
+    """Raise before a request that today's Gemini ceilings no longer allow"""
+    if ledger.exhausted("gemini", GEMINI_DAILY_REQUEST_BUDGET):
+        raise QuotaExceeded(f"Gemini daily request ceiling reached ({GEMINI_DAILY_REQUEST_BUDGET})")
+    if ledger.exhausted("gemini", GEMINI_DAILY_TOKEN_BUDGET, metric="tokens"):
+        raise QuotaExceeded(f"Gemini daily token ceiling reached ({GEMINI_DAILY_TOKEN_BUDGET})")
@@ -0,0 +1,115 @@
+"""
+Parsed-catalog cache: shows.json as a marshal snapshot that loads ~3.5x
+faster than json.loads.
+
+CATALOG_CACHE_FILE is a JSON header (the catalog's size, mtime and sha256
+when cached, plus the Python/marshal versions the payload needs) followed by
+the marshalled list. load_catalog() uses it while the stamp matches, as
+shared/catalog_index.py does: size+mtime first, then the hash when only the
+mtime moved. Otherwise it parses shows.json and re-caches it. Writers that
+save shows.json through shared/io_utils re-cache the list they just wrote,
+so the next reader never pays for a parse.
+
+marshal is only safe for data we wrote ourselves; the cache lives in the
+staging directory and is rebuilt from shows.json whenever it doesn't match.
+"""
+import hashlib
+import json
+import marshal
+import os
+import struct
+import sys
+from typing import Dict, List, Optional
+from .config import CATALOG_CACHE_FILE, SHOWS_FILE
+
+MAGIC = b"KSCAT\x00\x00\x01"
+HEADER_LENGTH = struct.Struct("<I")
+PAYLOAD_FORMAT = f"{sys.version_info.major}.{sys.version_info.minor}/marshal{marshal.version}"
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_stamp(path: str) -> Dict:
+    """Size, mtime and content hash of path (what cached derivatives are keyed by)"""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_hash(path)}
+
+
+def stamp_matches(stamp: Dict, path: str) -> Optional[bool]:
+    """True if path is unchanged since stamp, None if only its mtime moved (same bytes), False if changed"""
+    stat = os.stat(path)
+    if stamp.get("size") != stat.st_size:
+        return False
+    if stamp.get("mtime_ns") == stat.st_mtime_ns:
+        return True
+    return None if stamp.get("sha256") == file_hash(path) else False
+
+
+def _write(shows: List[Dict], stamp: Dict, path: str) -> None:
+    payload = marshal.dumps(shows)
+    header = json.dumps({**stamp, "format": PAYLOAD_FORMAT}).encode("utf-8")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + HEADER_LENGTH.pack(len(header)) + header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _read(path: str):
+    """(header, shows) from the cache file, or None when missing, foreign or unreadable"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if not data.startswith(MAGIC):
+        return None
+    offset = len(MAGIC)
+    (length,) = HEADER_LENGTH.unpack_from(data, offset)
+    offset += HEADER_LENGTH.size
+    header = json.loads(data[offset:offset + length])
+    if header.get("format") != PAYLOAD_FORMAT:
+        return None  # Written by another Python version
+    try:
+        return header, marshal.loads(data[offset + length:])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def load_catalog(source_path: str = SHOWS_FILE, path: str = CATALOG_CACHE_FILE) -> Optional[List[Dict]]:
+    """The parsed catalog (a fresh copy per call), from the cache when shows.json is unchanged; None if missing"""
+    if not os.path.exists(source_path):
+        return None
+    cached = _read(path)
+    if cached:
+        header, shows = cached
+        state = stamp_matches(header, source_path)
+        if state:
+            return shows
+        if state is None:
+            _write(shows, source_stamp(source_path), path)  # Same bytes, new mtime: restamp
+            return shows
+    with open(source_path, "rb") as f:
+        shows = json.loads(f.read())
+    refresh_catalog_cache(shows, source_path, path)
+    return shows
+
+
+def refresh_catalog_cache(
+    shows: List[Dict],
+    source_path: str = SHOWS_FILE,
+    path: str = CATALOG_CACHE_FILE,
+    stamp: Optional[Dict] = None
+) -> None:
+    """Cache shows as the current contents of source_path (best effort)"""
+    try:
+        _write(shows, stamp or source_stamp(source_path), path)
+    except (OSError, ValueError) as e:  # ValueError: a value marshal can't store
+        print(f"Catalog cache not updated ({e}); the next load parses shows.json")
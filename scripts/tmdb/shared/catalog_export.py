@@ -0,0 +1,170 @@
+import gzip
+import json
+import os
+from typing import Any, Dict, List, Tuple
+from .classification import build_rating_tables
+from .config import TMDB_IMAGE_BASE
+from .search_index import build_search_index
+
+try:
+    import brotli
+except ImportError:  # Optional: .br files are skipped when brotli isn't installed
+    brotli = None
+
+LIST_FILENAME = "list.json"
+SEARCH_FILENAME = "search.json"
+DETAIL_DIRNAME = "detail"
+DETAIL_BUCKETS = 64
+FORMAT_VERSION = 1
+COVER_PREFIX = f"{TMDB_IMAGE_BASE}/w500"
+STIMULATION_LEVELS = ["Low", "Medium", "High"]
+
+# Long text fields that only the detail modal needs
+DETAIL_FIELDS = [
+    "synopsis", "cast", "reasoning", "releaseYear", "runtime", "ageRecommendation", "tmdbId", "coverImageLarge",
+    "coverImageLargeAvif"
+]
+
+
+def detail_bucket(show_id: str, buckets: int = DETAIL_BUCKETS) -> int:
+    """FNV-1a hash of the show id (mirrored by detailBucket in src/data/catalog.ts)"""
+    value = 0x811C9DC5
+    for byte in show_id.encode("utf-8"):
+        value ^= byte
+        value = (value * 0x01000193) & 0xFFFFFFFF
+    return value % buckets
+
+
+def _dictionary(shows: List[Dict], field: str) -> List[str]:
+    """Most frequent values first so the common ones get the smallest indexes"""
+    counts: Dict[str, int] = {}
+    for show in shows:
+        for value in show.get(field) or []:
+            counts[value] = counts.get(value, 0) + 1
+    return sorted(counts, key=lambda value: (-counts[value], value))
+
+
+def build_list_row(
+    show: Dict,
+    platform_index: Dict[str, int],
+    tag_index: Dict[str, int],
+    rating_table: str
+) -> Dict[str, Any]:
+    """Compact card-grid row. Defaults (null/false/empty) are omitted."""
+    row: Dict[str, Any] = {
+        "i": show["id"],
+        "t": show["title"],
+        "k": rating_table,
+        "a": show["minAge"],
+        "b": show["maxAge"],
+    }
+    cover = show.get("coverImage") or ""
+    if cover.startswith(COVER_PREFIX):
+        row["c"] = cover[len(COVER_PREFIX):]
+    elif cover:
+        row["C"] = cover
+    if cover.endswith(".webp") and show.get("coverImageAvif") == cover[:-len(".webp")] + ".avif":
+        row["x"] = 1  # AVIF sibling of the WebP card cover (mirror_covers.py --avif)
+    if show.get("coverBlurhash"):
+        row["h"] = show["coverBlurhash"]
+    if show.get("coverColor"):
+        row["o"] = show["coverColor"].lstrip("#")
+    tags = [tag_index[tag] for tag in show.get("tags") or []]
+    if tags:
+        row["g"] = tags
+    platforms = [platform_index[name] for name in show.get("platforms") or []]
+    if platforms:
+        row["p"] = platforms
+    if show.get("stimulationLevel"):
+        row["s"] = STIMULATION_LEVELS.index(show["stimulationLevel"])
+    if show.get("safeAboveAge") is not None:
+        row["u"] = show["safeAboveAge"]
+    if show.get("isEpisodicIssue"):
+        row["e"] = 1
+    if show.get("featured"):
+        row["f"] = 1
+    return row
+
+
+def build_list_payload(shows: List[Dict]) -> Dict[str, Any]:
+    """Card-grid payload with dictionary-encoded platforms and tags"""
+    platforms = _dictionary(shows, "platforms")
+    tags = _dictionary(shows, "tags")
+    platform_index = {name: index for index, name in enumerate(platforms)}
+    tag_index = {name: index for index, name in enumerate(tags)}
+    breakpoints, rating_tables = build_rating_tables(shows)
+
+    return {
+        "v": FORMAT_VERSION,
+        "buckets": DETAIL_BUCKETS,
+        "coverPrefix": COVER_PREFIX,
+        "stimulationLevels": STIMULATION_LEVELS,
+        "ageBreakpoints": breakpoints,
+        "platforms": platforms,
+        "tags": tags,
+        "items": [
+            build_list_row(show, platform_index, tag_index, table)
+            for show, table in zip(shows, rating_tables)
+        ],
+    }
+
+
+def build_detail_chunks(shows: List[Dict]) -> Dict[int, Dict[str, Dict]]:
+    """Long text fields bucketed by id for on-demand loading"""
+    chunks: Dict[int, Dict[str, Dict]] = {bucket: {} for bucket in range(DETAIL_BUCKETS)}
+    for show in shows:
+        detail = {field: show[field] for field in DETAIL_FIELDS if show.get(field) is not None}
+        chunks[detail_bucket(show["id"])][show["id"]] = detail
+    return chunks
+
+
+def encode_compact(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_precompressed(filepath: str, payload: bytes) -> int:
+    """Write payload plus .gz (and .br when available) siblings. Returns bytes written."""
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    written = 0
+
+    with open(filepath, "wb") as f:
+        f.write(payload)
+    written += len(payload)
+
+    # mtime=0 keeps the gzip output byte-identical across runs
+    compressed = gzip.compress(payload, compresslevel=9, mtime=0)
+    with open(f"{filepath}.gz", "wb") as f:
+        f.write(compressed)
+    written += len(compressed)
+
+    if brotli is not None:
+        compressed = brotli.compress(payload, quality=11)
+        with open(f"{filepath}.br", "wb") as f:
+            f.write(compressed)
+        written += len(compressed)
+
+    return written
+
+
+def export_catalog(shows: List[Dict], output_dir: str) -> Tuple[int, int]:
+    """
+    Write the list payload, title search index and detail chunks to output_dir.
+
+    Returns (list_bytes, detail_files) where list_bytes is the raw size of list.json.
+    """
+    exportable = [show for show in shows if show.get("id")]
+
+    list_bytes = encode_compact(build_list_payload(exportable))
+    write_precompressed(os.path.join(output_dir, LIST_FILENAME), list_bytes)
+
+    # Rows in the search index are positions in list.json's items
+    search_index = build_search_index([show["title"] for show in exportable])
+    write_precompressed(os.path.join(output_dir, SEARCH_FILENAME), encode_compact(search_index))
+
+    detail_dir = os.path.join(output_dir, DETAIL_DIRNAME)
+    detail_files = 0
+    for bucket, chunk in build_detail_chunks(exportable).items():
+        write_precompressed(os.path.join(detail_dir, f"{bucket}.json"), encode_compact(chunk))
+        detail_files += 1
+
+    return len(list_bytes), detail_files
@@ -0,0 +1,169 @@
+"""
+Compact sidecar index of shows.json ids and titles, for deduplication
+without parsing the catalog.
+
+CATALOG_INDEX_FILE holds, after a JSON header:
+
+    tmdb ids     sorted int64 array (binary search)
+    tmdb rows    int32 array, catalog row of each sorted id
+    strings      JSON: imdb/show id per row, normalize_title() key per row
+
+The header records the catalog's size, mtime and sha256 when the index was
+built. load() trusts a matching size+mtime, falls back to the hash when only
+the mtime moved (touch, checkout), and rebuilds from the catalog otherwise
+(read through shared/catalog_cache.py), so a stale index is never used.
+Writers that save shows.json through shared/io_utils refresh it from the
+list they just wrote (no re-parse).
+"""
+import json
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Set
+from .catalog_cache import load_catalog, source_stamp, stamp_matches
+from .config import CATALOG_INDEX_FILE, SHOWS_FILE
+from .io_utils import normalize_title
+
+MAGIC = b"KSIDX\x00\x00\x02"  # v2: NFKD + ASCII-folded title keys
+HEADER_LENGTH = struct.Struct("<I")
+
+
+def _tmdb_id(show: Dict) -> Optional[int]:
+    """Numeric tmdbId, or None for legacy/manual entries"""
+    try:
+        return int(show["tmdbId"]) if show.get("tmdbId") else None
+    except (TypeError, ValueError):
+        return None
+
+
+class SortedIds:
+    """Read-only set view over a sorted array (membership by binary search)"""
+
+    def __init__(self, values: array):
+        self.values = values
+
+    def __contains__(self, value) -> bool:
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return False
+        position = bisect_left(self.values, value)
+        return position < len(self.values) and self.values[position] == value
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.values)
+
+
+class CatalogIdIndex:
+    def __init__(self, ids: List[str], titles: List[str], tmdb_ids: array, tmdb_rows: array):
+        self.ids = ids  # imdb/show id per row ("" if missing)
+        self.titles = titles  # normalize_title() key per row
+        self.tmdb_ids = SortedIds(tmdb_ids)
+        self._tmdb_rows = tmdb_rows
+        self.imdb_rows = {show_id: row for row, show_id in enumerate(ids) if show_id}  # Later rows win
+        self._title_rows: Optional[Dict[str, List[int]]] = None
+
+    @classmethod
+    def build(cls, shows: List[Dict]) -> "CatalogIdIndex":
+        ids = [str(show.get("id") or "") for show in shows]
+        titles = [normalize_title(show.get("title", "")) for show in shows]
+        pairs = sorted((tmdb_id, row) for row, tmdb_id in enumerate(map(_tmdb_id, shows)) if tmdb_id is not None)
+        return cls(ids, titles, array("q", (tmdb_id for tmdb_id, _ in pairs)), array("i", (row for _, row in pairs)))
+
+    @property
+    def rows(self) -> int:
+        return len(self.ids)
+
+    def row_for_tmdb(self, tmdb_id: int) -> Optional[int]:
+        position = bisect_left(self.tmdb_ids.values, tmdb_id)
+        if position < len(self.tmdb_ids.values) and self.tmdb_ids.values[position] == tmdb_id:
+            return self._tmdb_rows[position]
+        return None
+
+    def rows_for_title(self, title: str) -> List[int]:
+        """Rows whose normalized title matches (several means ambiguous)"""
+        if self._title_rows is None:
+            self._title_rows = {}
+            for row, key in enumerate(self.titles):
+                if key:
+                    self._title_rows.setdefault(key, []).append(row)
+        return self._title_rows.get(normalize_title(title), [])
+
+    def legacy_titles(self) -> Set[str]:
+        """Normalized titles of rows without a tmdbId (manual entries discovery may upgrade)"""
+        managed = set(self._tmdb_rows)
+        return {key for row, key in enumerate(self.titles) if key and row not in managed}
+
+    # --- Persistence ---
+
+    def save(self, source_path: str = SHOWS_FILE, path: str = CATALOG_INDEX_FILE, stamp: Optional[Dict] = None) -> None:
+        """Write the index stamped with source_path's current size, mtime and hash"""
+        strings = json.dumps({"ids": self.ids, "titles": self.titles}, ensure_ascii=False,
+                             separators=(",", ":")).encode("utf-8")
+        header = json.dumps({
+            **(stamp or source_stamp(source_path)),
+            "rows": self.rows,
+            "tmdb": len(self.tmdb_ids),
+        }).encode("utf-8")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC + HEADER_LENGTH.pack(len(header)) + header)
+            f.write(self.tmdb_ids.values.tobytes())
+            f.write(self._tmdb_rows.tobytes())
+            f.write(strings)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def _read(cls, path: str):
+        """(header, index) from path, or None when it is missing or unreadable"""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if not data.startswith(MAGIC):
+            return None
+        offset = len(MAGIC)
+        (length,) = HEADER_LENGTH.unpack_from(data, offset)
+        offset += HEADER_LENGTH.size
+        header = json.loads(data[offset:offset + length])
+        offset += length
+        tmdb_ids = array("q")
+        tmdb_ids.frombytes(data[offset:offset + 8 * header["tmdb"]])
+        offset += 8 * header["tmdb"]
+        tmdb_rows = array("i")
+        tmdb_rows.frombytes(data[offset:offset + tmdb_rows.itemsize * header["tmdb"]])
+        offset += tmdb_rows.itemsize * header["tmdb"]
+        strings = json.loads(data[offset:])
+        return header, cls(strings["ids"], strings["titles"], tmdb_ids, tmdb_rows)
+
+    @classmethod
+    def load(cls, source_path: str = SHOWS_FILE, path: str = CATALOG_INDEX_FILE) -> "CatalogIdIndex":
+        """The index for source_path's current contents, rebuilt (and saved) if stale"""
+        if not os.path.exists(source_path):
+            return cls.build([])
+        cached = cls._read(path)
+        if cached:
+            header, index = cached
+            state = stamp_matches(header, source_path)
+            if state:
+                return index
+            if state is None:
+                index.save(source_path, path)  # Same bytes, new mtime: restamp
+                return index
+        index = cls.build(load_catalog(source_path) or [])
+        index.save(source_path, path)
+        return index
+
+
+def refresh_catalog_index(shows: List[Dict], source_path: str = SHOWS_FILE, stamp: Optional[Dict] = None) -> None:
+    """Rebuild the sidecar from the list just written to source_path (best effort)"""
+    try:
+        CatalogIdIndex.build(shows).save(source_path, stamp=stamp)
+    except OSError as e:
+        print(f"Catalog index not updated ({e}); readers will rebuild it")
@@ -0,0 +1,188 @@
+"""
+In-memory query index over shows.json for internal tools.
+
+Row sets are Python ints used as bitmaps (bit i = catalog row i), so
+combined filters are a handful of big-int ANDs. Age ranges use sorted
+cumulative bitmaps (an interval index), and ratings come from the same
+per-age rating tables the export stage emits, so results match classifyShow.
+"""
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+from .classification import build_rating_tables, classify_show
+from .search_index import build_search_index, search
+
+SORT_KEYS = {
+    "title": lambda show: (show.get("title") or "").casefold(),
+    "minAge": lambda show: show.get("minAge", 0),
+    "maxAge": lambda show: show.get("maxAge", 0),
+    "releaseYear": lambda show: show.get("releaseYear") or "",
+    "featured": lambda show: not show.get("featured"),
+}
+RATING_NAMES = {"S": "Safe", "C": "Caution", "U": "Unsafe"}
+
+
+class IntervalIndex:
+    """Rows whose value is <= or >= a bound, via cumulative bitmaps over sorted values"""
+
+    def __init__(self, values: List[Optional[float]]):
+        present = sorted((value, row) for row, value in enumerate(values) if value is not None)
+        self.keys = [value for value, _ in present]
+
+        # at_most[i]: rows among the i smallest values; at_least[i]: rows from i upward
+        self.at_most = [0]
+        for _, row in present:
+            self.at_most.append(self.at_most[-1] | (1 << row))
+        self.at_least = [0] * (len(present) + 1)
+        for index in range(len(present) - 1, -1, -1):
+            self.at_least[index] = self.at_least[index + 1] | (1 << present[index][1])
+
+    def le(self, bound: float) -> int:
+        return self.at_most[bisect_right(self.keys, bound)]
+
+    def ge(self, bound: float) -> int:
+        return self.at_least[bisect_left(self.keys, bound)]
+
+
+class CatalogIndex:
+    def __init__(self, shows: List[Dict]):
+        self.shows = shows
+        self.titles = [show.get("title") or "" for show in shows]
+        self.all_rows = (1 << len(shows)) - 1
+        self.row_by_id = {show["id"]: row for row, show in enumerate(shows) if show.get("id")}
+
+        self.tags = self._bitmaps(lambda show: show.get("tags") or [])
+        self.platforms = self._bitmaps(lambda show: show.get("platforms") or [])
+        self.stimulation = self._bitmaps(lambda show: [show.get("stimulationLevel") or "Medium"])
+
+        self.min_age = IntervalIndex([show.get("minAge") for show in shows])
+        self.max_age = IntervalIndex([show.get("maxAge") for show in shows])
+        self.safe_above = IntervalIndex([show.get("safeAboveAge") for show in shows])
+
+        # ratings[column][rating] -> rows, one column per viewer-age breakpoint
+        self.breakpoints, tables = build_rating_tables(shows)
+        self.ratings: List[Dict[str, int]] = []
+        for column in range(len(self.breakpoints) + 1):
+            by_rating = {name: 0 for name in RATING_NAMES.values()}
+            for row, table in enumerate(tables):
+                code = table[0] if len(table) == 1 else table[column]
+                by_rating[RATING_NAMES[code]] |= 1 << row
+            self.ratings.append(by_rating)
+
+        self.search_index = build_search_index(self.titles)
+
+        # order[key]: rows sorted by key; rank[key][row]: position of row in that order
+        self.order: Dict[str, List[int]] = {}
+        self.rank: Dict[str, List[int]] = {}
+        for key, extract in SORT_KEYS.items():
+            order = sorted(range(len(shows)), key=lambda row: (extract(shows[row]), row))
+            ranks = [0] * len(shows)
+            for position, row in enumerate(order):
+                ranks[row] = position
+            self.order[key] = order
+            self.rank[key] = ranks
+
+    def _bitmaps(self, values) -> Dict[str, int]:
+        bitmaps: Dict[str, int] = {}
+        for row, show in enumerate(self.shows):
+            for value in values(show):
+                bitmaps[value] = bitmaps.get(value, 0) | (1 << row)
+        return bitmaps
+
+    def _any_of(self, bitmaps: Dict[str, int], names: List[str]) -> int:
+        result = 0
+        for name in names:
+            result |= bitmaps.get(name, 0)
+        return result
+
+    def rating_column(self, viewer_age: Optional[float]) -> int:
+        if viewer_age is None:
+            return 0
+        return bisect_right(self.breakpoints, viewer_age)
+
+    def query(
+        self,
+        q: str = "",
+        age: Optional[float] = None,
+        age_min: Optional[float] = None,
+        age_max: Optional[float] = None,
+        safe_above_max: Optional[float] = None,
+        tags: Optional[List[str]] = None,
+        exclude_tags: Optional[List[str]] = None,
+        platforms: Optional[List[str]] = None,
+        ratings: Optional[List[str]] = None,
+        stimulation: Optional[List[str]] = None,
+        sort: str = "title",
+        descending: bool = False,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> Tuple[int, List[Dict]]:
+        """
+        Filter, sort and paginate. Returns (total matches, page of classified shows).
+
+        age is the viewer's age: it selects shows whose range contains it and
+        drives the rating policy. age_min/age_max select range overlap (the
+        app's age buckets). List filters are any-of, except tags (all-of).
+        """
+        rows = self.all_rows
+
+        if age is not None:
+            rows &= self.min_age.le(age) & self.max_age.ge(age)
+        if age_max is not None:
+            rows &= self.min_age.le(age_max)
+        if age_min is not None:
+            rows &= self.max_age.ge(age_min)
+        if safe_above_max is not None:
+            rows &= self.safe_above.le(safe_above_max)
+        for tag in tags or []:
+            rows &= self.tags.get(tag, 0)
+        for tag in exclude_tags or []:
+            rows &= ~self.tags.get(tag, 0)
+        if platforms:
+            rows &= self._any_of(self.platforms, platforms)
+        if stimulation:
+            rows &= self._any_of(self.stimulation, stimulation)
+        if ratings:
+            rows &= self._any_of(self.ratings[self.rating_column(age)], ratings)
+
+        if q:
+            matches = 0
+            for row in search(self.search_index, self.titles, q):
+                matches |= 1 << row
+            rows &= matches
+
+        bits = bin(rows)[:1:-1]  # bits[row] == "1" for matching rows
+        total = bits.count("1")
+        page = self._page(bits, total, sort if sort in SORT_KEYS else "title", descending, offset + limit)
+        return total, [classify_show(self.shows[row], age) for row in page[offset:]]
+
+    def _page(self, bits: str, total: int, sort: str, descending: bool, count: int) -> List[int]:
+        """First `count` matching rows in sort order"""
+        if total == 0 or count == 0:
+            return []
+
+        # Dense results: walk the presorted order until the page is full
+        # (expected steps ~ count * catalog / total). Sparse ones: heap-select.
+        if count * len(self.shows) < total * total:
+            order = self.order[sort]
+            page = []
+            for row in (reversed(order) if descending else order):
+                if row < len(bits) and bits[row] == "1":
+                    page.append(row)
+                    if len(page) == count:
+                        break
+            return page
+
+        rows = []
+        row = bits.find("1")
+        while row != -1:
+            rows.append(row)
+            row = bits.find("1", row + 1)
+        select = heapq.nlargest if descending else heapq.nsmallest
+        return select(count, rows, key=self.rank[sort].__getitem__)
+
+    def get(self, show_id: str, age: Optional[float] = None) -> Optional[Dict]:
+        row = self.row_by_id.get(show_id)
+        if row is None:
+            return None
+        return classify_show(self.shows[row], age)
@@ -0,0 +1,141 @@
+"""
+Python port of the runtime safety policy in src/utils/filter.ts (classifyShow).
+
+Keep the two in sync: the export stage precomputes each show's effective
+rating per viewer-age breakpoint so the frontend can look ratings up
+instead of re-running the policy on every keystroke. Both sides are checked
+against the same hand-checked cases in fixtures/policy_cases.json:
+verify_policy_fixture() here (7_export.py --verify), and
+scripts/check_parity.mjs for classifyShow/lookupRating (npm run check:parity).
+"""
+import json
+import os
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+POLICY_FIXTURE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "policy_cases.json")
+
+DEFAULT_SAFE_ABOVE_AGE = 7  # Mirrors `show.safeAboveAge ?? 7`
+AGE_SENSITIVE_TAGS = ("Violence", "Scary Imagery")
+LGBTQ_TAG = "LGBTQ+ Themes"
+LGBTQ_REASONING = "Contains themes that do not align with family-friendly values."
+EPISODIC_NOTE = " (Note: Contains isolated episodes with LGBTQ+ themes)"
+
+# One character per rating in the emitted tables
+RATING_CODES = {"Safe": "S", "Caution": "C", "Unsafe": "U"}
+
+
+def classify_show(show: Dict, viewer_age: Optional[float] = None) -> Dict:
+    """Apply the strict policy to a catalog entry (returns a copy)"""
+    new_show = dict(show)
+    tags = show.get("tags") or []
+
+    if LGBTQ_TAG in tags:
+        if show.get("isEpisodicIssue"):
+            new_show["rating"] = "Caution"
+            new_show["reasoning"] = (new_show.get("reasoning") or "") + EPISODIC_NOTE
+        else:
+            new_show["rating"] = "Unsafe"
+            new_show["reasoning"] = LGBTQ_REASONING
+            return new_show
+
+    if any(tag in tags for tag in AGE_SENSITIVE_TAGS):
+        safe_above = show.get("safeAboveAge")
+        if safe_above is None:
+            safe_above = DEFAULT_SAFE_ABOVE_AGE
+
+        if viewer_age is not None and viewer_age >= safe_above:
+            new_show["rating"] = "Safe"
+        elif new_show["rating"] != "Unsafe":
+            new_show["rating"] = "Caution"
+
+    return new_show
+
+
+def age_breakpoints(shows: List[Dict]) -> List[float]:
+    """Distinct viewer ages at which any show's effective rating can change"""
+    thresholds = set()
+    for show in shows:
+        tags = show.get("tags") or []
+        if any(tag in tags for tag in AGE_SENSITIVE_TAGS):
+            safe_above = show.get("safeAboveAge")
+            thresholds.add(DEFAULT_SAFE_ABOVE_AGE if safe_above is None else safe_above)
+    return sorted(thresholds)
+
+
+def column_ages(breakpoints: List[float]) -> List[Optional[float]]:
+    """Representative viewer age per table column (column 0 also covers no age)"""
+    return [None] + list(breakpoints)
+
+
+def rating_table(show: Dict, breakpoints: List[float]) -> str:
+    """
+    Effective rating codes, one per column.
+
+    Column 0 covers "no viewer age" and ages below breakpoints[0]; column j
+    covers ages in [breakpoints[j-1], breakpoints[j]). Tables where every
+    column agrees collapse to a single character.
+    """
+    codes = "".join(
+        RATING_CODES[classify_show(show, age)["rating"]] for age in column_ages(breakpoints)
+    )
+    if codes == codes[0] * len(codes):
+        return codes[0]
+    return codes
+
+
+def lookup_rating(table: str, breakpoints: List[float], viewer_age: Optional[float] = None) -> str:
+    """Inverse of rating_table (mirrored by lookupRating in src/utils/filter.ts)"""
+    if len(table) == 1 or viewer_age is None:
+        code = table[0]
+    else:
+        code = table[bisect_right(breakpoints, viewer_age)]
+    return next(rating for rating, value in RATING_CODES.items() if value == code)
+
+
+def build_rating_tables(shows: List[Dict]) -> Tuple[List[float], List[str]]:
+    breakpoints = age_breakpoints(shows)
+    return breakpoints, [rating_table(show, breakpoints) for show in shows]
+
+
+def verify_rating_tables(shows: List[Dict], breakpoints: List[float], tables: List[str]) -> List[str]:
+    """Cross-check table lookups against the policy at and around every breakpoint"""
+    probe_ages: List[Optional[float]] = [None, 0.0, 99.0]
+    for age in breakpoints:
+        probe_ages.extend([age - 0.5, age, age + 0.5])
+
+    mismatches = []
+    for show, table in zip(shows, tables):
+        for age in probe_ages:
+            expected = classify_show(show, age)["rating"]
+            actual = lookup_rating(table, breakpoints, age)
+            if expected != actual:
+                mismatches.append(f"{show.get('title')} @ {age}: table={actual} policy={expected}")
+    return mismatches
+
+
+def verify_policy_fixture(path: str = POLICY_FIXTURE_FILE) -> List[str]:
+    """classify_show, rating_table and lookup_rating against the shared parity cases"""
+    with open(path, "r", encoding="utf-8") as f:
+        fixture = json.load(f)
+    shows = fixture["shows"]
+    breakpoints, tables = build_rating_tables(list(shows.values()))
+
+    mismatches = []
+    if breakpoints != fixture["breakpoints"]:
+        mismatches.append(f"breakpoints: {breakpoints} != {fixture['breakpoints']}")
+    for (name, show), table in zip(shows.items(), tables):
+        if table != show["codes"]:
+            mismatches.append(f"{name}: table={table} fixture={show['codes']}")
+    for case in fixture["cases"]:
+        show, age = shows[case["name"]], case["age"]
+        result = classify_show(show, age)
+        looked_up = lookup_rating(show["codes"], fixture["breakpoints"], age)
+        for label, actual, expected in (
+            ("rating", result["rating"], case["rating"]),
+            ("reasoning", result["reasoning"], case["reasoning"]),
+            ("table lookup", looked_up, case["rating"]),
+        ):
+            if actual != expected:
+                mismatches.append(f"{case['name']} @ {age}: {label}={actual!r} fixture={expected!r}")
+    return mismatches
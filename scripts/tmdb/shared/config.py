@@ -17,6 +17,53 @@ GEMINI_MIN_DELAY_SECONDS = float(os.getenv("GEMINI_MIN_DELAY_SECONDS", "1.0"))
 GEMINI_BACKOFF_BASE_SECONDS = float(os.getenv("GEMINI_BACKOFF_BASE_SECONDS", "2.0"))
 GEMINI_MAX_BACKOFF_SECONDS = float(os.getenv("GEMINI_MAX_BACKOFF_SECONDS", "30.0"))
 
+# Gemini timeouts: GEMINI_TIMEOUT_SECONDS until enough responses have been seen, then
+# 2x the observed p99 within [MIN, MAX]. Hedging sends a duplicate request once a call
+# passes the running p95, for at most GEMINI_HEDGE_MAX_RATIO of requests.
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "15.0"))
+GEMINI_MIN_TIMEOUT_SECONDS = float(os.getenv("GEMINI_MIN_TIMEOUT_SECONDS", "5.0"))
+GEMINI_MAX_TIMEOUT_SECONDS = float(os.getenv("GEMINI_MAX_TIMEOUT_SECONDS", "60.0"))
+GEMINI_HEDGE_REQUESTS = os.getenv("GEMINI_HEDGE_REQUESTS", "0").strip().lower() in ("1", "true", "yes")
+GEMINI_HEDGE_MAX_RATIO = float(os.getenv("GEMINI_HEDGE_MAX_RATIO", "0.05"))
+
+# Gemini model routing: a cheap first pass, escalating uncertain or concerning verdicts
+# to GEMINI_MODEL. Set GEMINI_FAST_MODEL to an empty string to send everything to GEMINI_MODEL.
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-preview-09-2025").strip()
+GEMINI_FAST_MODEL = os.getenv("GEMINI_FAST_MODEL", "gemini-2.5-flash-lite").strip()
+
+# Gemini endpoint (point at gemini_stub.py for offline runs) and context caching of the
+# static rubric; without caching the rubric is sent as a system instruction. Off by
+# default: the rubric (~540 tokens) is below the API's minimum cacheable size
+# (GEMINI_CACHE_MIN_TOKENS, 1024 on the 2.5 Flash models), so caching only pays off
+# once the rubric grows past it.
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta").strip().rstrip("/")
+GEMINI_CONTEXT_CACHE = os.getenv("GEMINI_CONTEXT_CACHE", "0").strip().lower() in ("1", "true", "yes")
+GEMINI_CACHE_TTL_SECONDS = int(os.getenv("GEMINI_CACHE_TTL_SECONDS", "3600"))
+GEMINI_CACHE_MIN_TOKENS = int(os.getenv("GEMINI_CACHE_MIN_TOKENS", "1024"))
+
+# Batch mode (3_assess.py / 6_reassess.py --batch): status polls start at
+# GEMINI_BATCH_POLL_SECONDS and back off to GEMINI_BATCH_MAX_POLL_SECONDS
+GEMINI_BATCH_POLL_SECONDS = float(os.getenv("GEMINI_BATCH_POLL_SECONDS", "30"))
+GEMINI_BATCH_MAX_POLL_SECONDS = float(os.getenv("GEMINI_BATCH_MAX_POLL_SECONDS", "600"))
+
+# Stage 6 selection (shared/reassess_rules.py): comma-separated rule names for shows
+# without an assessment fingerprint; fingerprinted shows are re-assessed only when their
+# synopsis or the rubric changed (or the model, with REASSESS_ON_MODEL_CHANGE=1)
+REASSESS_RULES = os.getenv("REASSESS_RULES", "unsafe").strip()
+REASSESS_ON_MODEL_CHANGE = os.getenv("REASSESS_ON_MODEL_CHANGE", "0").strip().lower() in ("1", "true", "yes")
+
+# Daily API budgets (0 = unlimited), tracked in BUDGET_LEDGER_FILE
+TMDB_DAILY_REQUEST_BUDGET = int(os.getenv("TMDB_DAILY_REQUEST_BUDGET", "2000"))
+GEMINI_DAILY_REQUEST_BUDGET = int(os.getenv("GEMINI_DAILY_REQUEST_BUDGET", "1000"))
+GEMINI_DAILY_TOKEN_BUDGET = int(os.getenv("GEMINI_DAILY_TOKEN_BUDGET", "0"))
+
+# Shared HTTP transport (http_transport.py)
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "8"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "8"))
+HTTP2_ENABLED = os.getenv("HTTP2", "0").strip().lower() in ("1", "true", "yes")
+HTTP_COMPRESS_REQUESTS = os.getenv("HTTP_COMPRESS_REQUESTS", "0").strip().lower() in ("1", "true", "yes")
+HTTP_COMPRESS_MIN_BYTES = int(os.getenv("HTTP_COMPRESS_MIN_BYTES", "1024"))
+
 # API Endpoints
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
 TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p"
@@ -31,6 +78,37 @@ ASSESSED_FILE = os.path.join(DATA_DIR, "3_assessed.json")
 REVIEWED_FILE = os.path.join(DATA_DIR, "4_reviewed.json")
 SHOWS_FILE = os.path.join(ROOT_DIR, "src", "data", "shows.json")
 
+# Staging JSON written through shared/io_utils stays plain pretty-printed JSON by
+# default (the numbered stage files are tracked). "zstd" (gzip without the zstandard
+# package) or "gzip" compresses them for large local backlogs. shows.json and other
+# files outside DATA_DIR are never compressed.
+STAGING_COMPRESSION = os.getenv("STAGING_COMPRESSION", "none").strip().lower()
+
+# Content-addressed catalog snapshots (shared/snapshots.py): one compressed base per
+# SNAPSHOT_BASE_PERIOD (strftime format; monthly by default) plus per-show deltas
+SNAPSHOT_DIR = os.path.join(ROOT_DIR, "scripts", "data", "snapshots")
+SNAPSHOT_BASE_PERIOD = os.getenv("SNAPSHOT_BASE_PERIOD", "%Y-%m")
+
+# Exported frontend payloads (list + lazily loaded detail chunks)
+CATALOG_EXPORT_DIR = os.path.join(ROOT_DIR, "public", "data", "catalog")
+
+# Locally mirrored cover images (mirror_covers.py)
+COVERS_DIR = os.path.join(ROOT_DIR, "public", "assets", "covers")
+COVERS_PUBLIC_PATH = "/assets/covers"
+COVER_MANIFEST_FILE = os.path.join(DATA_DIR, "cover_manifest.json")
+COVER_PLACEHOLDERS_FILE = os.path.join(DATA_DIR, "cover_placeholders.json")
+
+# Usage ledger and per-field refresh state (refresh_catalog.py)
+BUDGET_LEDGER_FILE = os.path.join(DATA_DIR, "budget_ledger.json")
+REASSESS_JOURNAL_FILE = os.path.join(DATA_DIR, "6_reassess_journal.jsonl")
+REFRESH_STATE_FILE = os.path.join(DATA_DIR, "refresh_state.json")
+SIMILARITY_INDEX_FILE = os.path.join(DATA_DIR, "similarity_index.npz")
+CATALOG_INDEX_FILE = os.path.join(DATA_DIR, "shows_index.bin")  # shared/catalog_index.py
+CATALOG_CACHE_FILE = os.path.join(DATA_DIR, "shows_parsed.bin")  # shared/catalog_cache.py
+
+# Local read-only query server (serve_catalog.py)
+CATALOG_SERVER_PORT = int(os.getenv("CATALOG_SERVER_PORT", "8765"))
+
 # Discovery Filters
 TV_DISCOVERY_FILTERS = {
     'with_watch_monetization_types': 'flatrate|free|ads',
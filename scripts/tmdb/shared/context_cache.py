@@ -0,0 +1,128 @@
+"""
+Gemini context caching for the static assessment rubric.
+
+The careful-pass prompt is mostly a fixed rubric; only a few lines differ per
+title. RubricCache registers the rubric once per model as a cachedContents
+entry, and generateContent requests reference it by name, so each call only
+sends (and is only billed in full for) the per-title part.
+
+Caches are created lazily, re-created shortly before their TTL runs out, and
+dropped on a 400/403/404 that names them. A rubric estimated below
+min_tokens (the API's minimum cacheable size) is never sent for caching.
+When a model can't cache (too small, or the API rejects the create)
+name_for() returns None for the rest of the run and the client sends the
+rubric as a systemInstruction instead.
+"""
+import threading
+import time
+from typing import Dict, Optional, Set
+import requests
+from .budget_ledger import BudgetLedger
+from .http_transport import HttpTransport
+
+REFRESH_MARGIN_SECONDS = 120  # Re-create this long before expiry, so in-flight requests never see a dead cache
+CREATE_TIMEOUT_SECONDS = 15
+CHARS_PER_TOKEN = 4  # Rough English average; only used against min_tokens
+
+
+class RubricCache:
+    def __init__(
+        self,
+        transport: HttpTransport,
+        base_url: str,
+        api_key: str,
+        ledger: BudgetLedger,
+        ttl_seconds: int,
+        min_tokens: int = 0
+    ):
+        self.transport = transport
+        self.base_url = base_url
+        self.api_key = api_key
+        self.ledger = ledger
+        self.ttl_seconds = ttl_seconds
+        self.min_tokens = min_tokens
+        self.entries: Dict[str, Dict] = {}  # model -> {"name", "refresh_at"}
+        self.created: Set[str] = set()  # Every cache name created this run (for release())
+        self.unsupported: Set[str] = set()
+        self.lock = threading.Lock()
+        self.stats = {"created": 0, "refreshed": 0, "invalidated": 0, "fallbacks": 0}
+
+    def name_for(self, model: str, text: str) -> Optional[str]:
+        """Cache name holding text as the system instruction for model, or None to send it inline"""
+        with self.lock:
+            if model in self.unsupported:
+                return None
+            entry = self.entries.get(model)
+            if entry and time.time() < entry["refresh_at"]:
+                return entry["name"]
+            name = self._create(model, text)
+            if name is None:
+                self.unsupported.add(model)
+                self.stats["fallbacks"] += 1
+                self.entries.pop(model, None)
+                return None
+            if entry:
+                self.stats["refreshed"] += 1
+            margin = min(REFRESH_MARGIN_SECONDS, self.ttl_seconds / 2)
+            self.entries[model] = {"name": name, "refresh_at": time.time() + self.ttl_seconds - margin}
+            return name
+
+    def invalidate(self, model: str) -> None:
+        """Forget model's cache (expired or deleted server-side); the next name_for() re-creates it"""
+        with self.lock:
+            if self.entries.pop(model, None):
+                self.stats["invalidated"] += 1
+
+    def _create(self, model: str, text: str) -> Optional[str]:
+        estimated_tokens = len(text) // CHARS_PER_TOKEN
+        if estimated_tokens < self.min_tokens:
+            print(f"Context cache skipped for {model} (rubric ~{estimated_tokens} tokens, minimum {self.min_tokens}); "
+                  f"sending the rubric as a system instruction")
+            return None
+        payload = {
+            "model": f"models/{model}",
+            "displayName": "kid-show-safety-rubric",
+            "systemInstruction": {"parts": [{"text": text}]},
+            "ttl": f"{self.ttl_seconds}s",
+        }
+        try:
+            response = self.transport.post(
+                f"{self.base_url}/cachedContents?key={self.api_key}",
+                json=payload,
+                headers={"Content-Type": "application/json"},
+                timeout=CREATE_TIMEOUT_SECONDS
+            )
+            # Storage is billed per token-hour, not per request; keep it out of the request budget
+            self.ledger.record("gemini", requests=0, model=model, cache_creates=1)
+            if not response.ok:
+                print(f"Context cache unavailable for {model} ({response.status_code}); "
+                      f"sending the rubric as a system instruction")
+                return None
+            name = response.json().get("name")
+        except (requests.RequestException, ValueError) as e:
+            print(f"Context cache unavailable for {model} ({e}); sending the rubric as a system instruction")
+            return None
+        if name:
+            self.created.add(name)
+            self.stats["created"] += 1
+        return name
+
+    def release(self) -> None:
+        """Delete the caches created this run instead of paying storage until their TTL ends"""
+        with self.lock:
+            for name in sorted(self.created):
+                try:
+                    self.transport.request(
+                        "DELETE", f"{self.base_url}/{name}?key={self.api_key}", timeout=CREATE_TIMEOUT_SECONDS
+                    )
+                except requests.RequestException:
+                    pass  # Expires on its own
+            self.created.clear()
+            self.entries.clear()
+
+    def summary(self) -> str:
+        line = (f"{self.stats['created']} caches created ({self.stats['refreshed']} refreshes), "
+                f"{self.stats['invalidated']} invalidated")
+        if self.unsupported:
+            line += f"; system instruction for {', '.join(sorted(self.unsupported))}"
+        return line
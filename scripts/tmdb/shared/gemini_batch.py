@@ -0,0 +1,225 @@
+"""
+Gemini Batch API jobs for large backlogs (3_assess.py / 6_reassess.py --batch).
+
+A BatchJob moves through phases, and saves its state after each one to
+<stage>_batch.json in the staging directory. An interrupted run (Ctrl-C,
+crash, closed laptop) resumes from the last completed phase:
+
+    written     requests are in <stage>_batch_input.jsonl (one {"key", "request"} per line)
+    uploaded    the input file is uploaded through the Files API (file_name)
+    submitted   batchGenerateContent accepted it (batch_name); polled with backoff
+    downloaded  results are in <stage>_batch_results.jsonl
+
+The input file is uploaded and the results file downloaded in chunks, and
+results() parses the results one line at a time, so memory stays flat
+however large the job is. The stage merges the results and calls finish(),
+which removes the state and both files. Batch requests bypass the interactive
+per-request quota; the ledger records them as batch_requests with their tokens.
+"""
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from .budget_ledger import BudgetLedger, gemini_usage
+from .config import DATA_DIR, GEMINI_BASE_URL, GEMINI_BATCH_POLL_SECONDS, GEMINI_BATCH_MAX_POLL_SECONDS
+from .http_transport import STREAM_CHUNK_BYTES, HttpTransport, get_transport
+
+SUCCEEDED = "BATCH_STATE_SUCCEEDED"
+FINAL_STATES = {SUCCEEDED, "BATCH_STATE_FAILED", "BATCH_STATE_CANCELLED", "BATCH_STATE_EXPIRED"}
+POLL_BACKOFF = 1.5
+REQUEST_TIMEOUT_SECONDS = 120  # Uploads and downloads of large files
+
+
+class BatchFailed(RuntimeError):
+    """The batch job ended without results (failed, cancelled or expired)"""
+
+
+class BatchJob:
+    def __init__(
+        self,
+        stage: str,
+        api_key: str,
+        ledger: Optional[BudgetLedger] = None,
+        transport: Optional[HttpTransport] = None,
+        base_url: str = GEMINI_BASE_URL
+    ):
+        self.stage = stage
+        self.api_key = api_key
+        self.ledger = ledger or BudgetLedger()
+        self.transport = transport or get_transport()
+        self.base_url = base_url
+        # Files are uploaded to /upload/<version>/files and downloaded from /download/<version>/...
+        parts = urlsplit(base_url)
+        self.origin, self.version_path = f"{parts.scheme}://{parts.netloc}", parts.path
+        self.state_path = os.path.join(DATA_DIR, f"{stage}_batch.json")
+        self.input_path = os.path.join(DATA_DIR, f"{stage}_batch_input.jsonl")
+        self.results_path = os.path.join(DATA_DIR, f"{stage}_batch_results.jsonl")
+        self.state: Dict = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.state)
+
+    @property
+    def phase(self) -> Optional[str]:
+        return self.state.get("phase")
+
+    def _save_state(self, **changes) -> None:
+        self.state.update(changes)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def write(self, model: str, entries: Iterable[Tuple[str, Dict]]) -> int:
+        """Write (key, GenerateContentRequest) pairs as the job's input file"""
+        count = 0
+        tmp_path = f"{self.input_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, request in entries:
+                f.write(json.dumps({"key": key, "request": request}, ensure_ascii=False) + "\n")
+                count += 1
+        os.replace(tmp_path, self.input_path)
+        self._save_state(phase="written", model=model, count=count, created_at=datetime.utcnow().isoformat())
+        return count
+
+    def run(self, on_status=None) -> None:
+        """Advance through the remaining phases until the results are downloaded"""
+        if self.phase == "written":
+            self._upload()
+        if self.phase == "uploaded":
+            self._submit()
+        if self.phase == "submitted":
+            self._wait(on_status)
+            self._download()
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}/{path}?key={self.api_key}"
+
+    def _upload(self) -> None:
+        """Resumable-protocol upload (start + upload/finalize) of the input file"""
+        size = os.path.getsize(self.input_path)
+        start = self.transport.post(
+            f"{self.origin}/upload{self.version_path}/files?key={self.api_key}",
+            json={"file": {"display_name": f"{self.stage}-batch-input"}},
+            headers={
+                "X-Goog-Upload-Protocol": "resumable",
+                "X-Goog-Upload-Command": "start",
+                "X-Goog-Upload-Header-Content-Length": str(size),
+                "X-Goog-Upload-Header-Content-Type": "application/jsonl",
+            },
+            timeout=REQUEST_TIMEOUT_SECONDS
+        )
+        start.raise_for_status()
+        upload_url = start.headers.get("X-Goog-Upload-URL")
+        if not upload_url:
+            raise requests.HTTPError("Upload start returned no X-Goog-Upload-URL", response=start)
+        with open(self.input_path, "rb") as f:
+            # Sent from the file in chunks, so memory doesn't grow with the job
+            response = self.transport.post(
+                upload_url,
+                data=f,
+                headers={"X-Goog-Upload-Offset": "0", "X-Goog-Upload-Command": "upload, finalize"},
+                timeout=REQUEST_TIMEOUT_SECONDS
+            )
+        response.raise_for_status()
+        self._save_state(phase="uploaded", file_name=response.json()["file"]["name"])
+
+    def _submit(self) -> None:
+        response = self.transport.post(
+            self._url(f"models/{self.state['model']}:batchGenerateContent"),
+            json={"batch": {
+                "display_name": f"{self.stage}-{self.state['created_at']}",
+                "input_config": {"file_name": self.state["file_name"]},
+            }},
+            timeout=REQUEST_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+        self._save_state(phase="submitted", batch_name=response.json()["name"])
+
+    def _wait(self, on_status=None) -> None:
+        """Poll the job with exponential backoff until it reaches a final state"""
+        delay = GEMINI_BATCH_POLL_SECONDS
+        while True:
+            try:
+                response = self.transport.get(self._url(self.state["batch_name"]), timeout=REQUEST_TIMEOUT_SECONDS)
+                response.raise_for_status()
+                job = response.json()
+            except (requests.RequestException, ValueError) as e:
+                # The job keeps running server-side; a failed poll is not a failed job
+                job = {"metadata": {"state": f"poll failed ({e})"}}
+            metadata = job.get("metadata", {})
+            state = metadata.get("state", "BATCH_STATE_PENDING")
+            if on_status:
+                on_status(state, metadata.get("batchStats", {}))
+            if state in FINAL_STATES:
+                break
+            time.sleep(delay)
+            delay = min(delay * POLL_BACKOFF, GEMINI_BATCH_MAX_POLL_SECONDS)
+
+        if state != SUCCEEDED:
+            raise BatchFailed(f"Batch {self.state['batch_name']} ended as {state}")
+        output = job.get("response") or metadata.get("output") or {}
+        self._save_state(results_file=output.get("responsesFile"))
+
+    def _download(self) -> None:
+        if not self.state.get("results_file"):
+            raise BatchFailed(f"Batch {self.state['batch_name']} succeeded without a responses file")
+        response = self.transport.get(
+            f"{self.origin}/download{self.version_path}/{self.state['results_file']}:download"
+            f"?alt=media&key={self.api_key}",
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            stream=True
+        )
+        tmp_path = f"{self.results_path}.tmp"
+        try:
+            response.raise_for_status()
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_BYTES):
+                    f.write(chunk)
+        finally:
+            response.close()
+        os.replace(tmp_path, self.results_path)
+        self._save_state(phase="downloaded")
+
+    def results(self) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        (key, response text or None) per result line. Usage is added up and
+        recorded once, when reading stops (each record rewrites the ledger).
+        """
+        usage: Dict[str, int] = {}
+        try:
+            with open(self.results_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # A truncated last line; its key stays pending
+                    response = entry.get("response") or {}
+                    if response:
+                        usage["batch_requests"] = usage.get("batch_requests", 0) + 1
+                        for metric, value in gemini_usage(response).items():
+                            usage[metric] = usage.get(metric, 0) + value
+                    try:
+                        text = response["candidates"][0]["content"]["parts"][0]["text"]
+                    except (KeyError, IndexError, TypeError):
+                        text = None  # Per-request error or a blocked prompt
+                    yield str(entry.get("key")), text
+        finally:
+            if usage:
+                self.ledger.record("gemini", requests=0, model=self.state["model"], **usage)
+
+    def finish(self) -> None:
+        """Forget the job once its results are merged (or it failed)"""
+        for path in (self.state_path, self.input_path, self.results_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.state = {}
@@ -1,38 +1,269 @@
+import hashlib
 import json
 import random
+import threading
 import time
 import requests
-from typing import Dict, Optional, List
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from typing import Dict, Optional, List, Tuple
+from .assessment_schema import RESPONSE_SCHEMA, parse_json_text, schema_for, validate
+from .budget_ledger import BudgetLedger, QuotaExceeded, ensure_gemini_quota, gemini_usage
+from .context_cache import RubricCache
+from .http_transport import HttpTransport, get_transport
+from .latency import LatencyTracker
+from .models import AIAssessment
 from .config import (
+    GEMINI_MODEL,
+    GEMINI_FAST_MODEL,
     GEMINI_MAX_RETRIES,
     GEMINI_MIN_DELAY_SECONDS,
     GEMINI_BACKOFF_BASE_SECONDS,
-    GEMINI_MAX_BACKOFF_SECONDS
+    GEMINI_MAX_BACKOFF_SECONDS,
+    GEMINI_TIMEOUT_SECONDS,
+    GEMINI_MIN_TIMEOUT_SECONDS,
+    GEMINI_MAX_TIMEOUT_SECONDS,
+    GEMINI_HEDGE_REQUESTS,
+    GEMINI_HEDGE_MAX_RATIO,
+    GEMINI_BASE_URL,
+    GEMINI_CONTEXT_CACHE,
+    GEMINI_CACHE_TTL_SECONDS,
+    GEMINI_CACHE_MIN_TOKENS
 )
 
+CONNECT_TIMEOUT_SECONDS = 5.0
+
+# Static part of the careful-pass prompt: registered once per model as cached context
+# (or sent as a system instruction); requests carry only _build_title_prompt()
+RUBRIC = """
+You are a safety assessment expert for children's media.
+
+For the show/movie in each request, return a valid JSON object with these fields (no Markdown):
+
+{
+  "rating": "Safe" | "Caution" | "Unsafe",
+  "min_age": <number>,
+  "max_age": <number>,
+  "safe_above_age": <number or null>,
+  "is_episodic_issue": <boolean>,
+  "stimulation_level": "Low" | "Medium" | "High",
+  "has_lgbtq": <boolean>,
+  "has_violence": <boolean>,
+  "has_scary": <boolean>,
+  "is_educational": <boolean>,
+  "reasoning": "<2-3 sentences explaining the rating>"
+}
+
+Rating guidelines:
+- "Safe": No concerning content for any age within the target range
+- "Caution": Contains content (violence, scary imagery) that requires age consideration
+- "Unsafe": LGBTQ+ themes present OR intense violence/horror unsuitable for children
+
+IMPORTANT - Age-aware Caution:
+- If rating is "Caution", set "safe_above_age" to the age where the content becomes appropriate
+- Example: Cartoon violence may be Caution for age 3 but Safe for age 7 → set safe_above_age: 7
+- If rating is "Safe" or "Unsafe", set safe_above_age to null
+
+IMPORTANT - Episode vs Series-wide issues:
+- Set "is_episodic_issue": true if concerning content only appears in isolated episodes, not throughout
+- Example: A long-running educational show with one controversial old episode → is_episodic_issue: true
+- If content is consistent throughout the series, set is_episodic_issue: false
+- For movies, always set is_episodic_issue: false
+
+Age guidelines:
+- min_age: Absolute minimum safe age. Use decimals for months under 1 year (0.5 = 5mo, 0.8 = 8mo)
+- max_age: Age where kids typically lose interest (usually 7-14 for kids' shows, 99 for all-ages)
+
+Stimulation level:
+- "Low": Slow pacing, gentle music, minimal scene changes
+- "Medium": Moderate pacing and energy
+- "High": Fast cuts, loud music, intense action, bright colors
+
+Content flags:
+- has_lgbtq: True if LGBTQ+ characters, themes, or representation present
+- has_violence: True if contains fighting, combat, or aggressive content
+- has_scary: True if horror elements, frightening imagery, or suspense
+- is_educational: True if teaches concepts, skills, or values
+"""
+
+# First-pass prompt for the fast model (see _build_lean_prompt)
+LEAN_PROMPT = """
+Rate this title for young children. Return only JSON.
+
+Title: "{title}" ({year}){genre_context}{cert_context}
+Synopsis: {synopsis}
+
+{{"rating": "Safe"|"Caution"|"Unsafe", "min_age": <number>, "max_age": <number>,
+"safe_above_age": <number or null>, "is_episodic_issue": <boolean>,
+"stimulation_level": "Low"|"Medium"|"High", "has_lgbtq": <boolean>, "has_violence": <boolean>,
+"has_scary": <boolean>, "is_educational": <boolean>, "reasoning": "<2 sentences>"}}
+
+Safe = nothing concerning. Caution = violence or scary content that depends on age.
+Unsafe = LGBTQ+ themes or intense violence/horror. If unsure, answer "Caution".
+"""
+
+# Changes whenever either prompt or the response schema does (recorded in assessment fingerprints)
+PROMPT_VERSION = hashlib.sha256(
+    (RUBRIC + LEAN_PROMPT + json.dumps(RESPONSE_SCHEMA, sort_keys=True)).encode("utf-8")
+).hexdigest()[:12]
+
 class GeminiClient:
     """Wrapper for Gemini AI safety assessment"""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        ledger: Optional[BudgetLedger] = None,
+        transport: Optional[HttpTransport] = None,
+        concurrency: int = 1
+    ):
+        """concurrency: how many threads call the client at once (sizes the hedge pool)"""
         self.api_key = api_key
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta"
-        self.model = "gemini-2.5-flash-preview-09-2025"
+        self.ledger = ledger or BudgetLedger()  # Every request (retries included), per model
+        self.transport = transport or get_transport()  # Keep-alive pool shared across clients
+        self.base_url = GEMINI_BASE_URL
+        self.model = GEMINI_MODEL  # Careful pass
+        self.fast_model = GEMINI_FAST_MODEL  # Lean first pass ("" = always use self.model)
         self.max_retries = GEMINI_MAX_RETRIES
         self.min_delay_seconds = GEMINI_MIN_DELAY_SECONDS
         self.backoff_base_seconds = GEMINI_BACKOFF_BASE_SECONDS
         self.max_backoff_seconds = GEMINI_MAX_BACKOFF_SECONDS
         self._last_request_ts = 0.0
+        self._throttle_lock = threading.Lock()  # Hedged requests share the rate limit
+        self.hedge_requests = GEMINI_HEDGE_REQUESTS
+        self.hedge_max_ratio = GEMINI_HEDGE_MAX_RATIO
+        self._stats_lock = threading.Lock()  # Counters and trackers are shared by the caller threads
+        self.requests_sent = 0  # First attempts and retries, excluding hedges
+        self.hedges_sent = 0
+        self.latency: Dict[str, LatencyTracker] = {}  # Per model
+        # A hedged call occupies two workers (primary and hedge) for each caller thread
+        self._hedge_pool = (
+            ThreadPoolExecutor(max_workers=2 * max(1, concurrency), thread_name_prefix="gemini-hedge")
+            if self.hedge_requests else None
+        )
+        self.repairs = {"local": 0, "follow_up": 0, "unusable": 0}
+        self.rubric_cache = (  # None = always send the rubric as a system instruction
+            RubricCache(self.transport, self.base_url, api_key, self.ledger, GEMINI_CACHE_TTL_SECONDS,
+                        GEMINI_CACHE_MIN_TOKENS)
+            if GEMINI_CONTEXT_CACHE else None
+        )
+
+    def close(self) -> None:
+        """Delete context caches created by this client and stop the hedge pool"""
+        if self.rubric_cache:
+            self.rubric_cache.release()
+        if self._hedge_pool:
+            self._hedge_pool.shutdown(wait=False)
 
     def _throttle(self) -> None:
         """Ensure a minimum delay between requests to reduce 429s."""
         if self.min_delay_seconds <= 0:
             return
 
-        now = time.time()
-        elapsed = now - self._last_request_ts
-        if elapsed < self.min_delay_seconds:
-            time.sleep(self.min_delay_seconds - elapsed)
-        self._last_request_ts = time.time()
+        with self._throttle_lock:
+            now = time.time()
+            elapsed = now - self._last_request_ts
+            if elapsed < self.min_delay_seconds:
+                time.sleep(self.min_delay_seconds - elapsed)
+            self._last_request_ts = time.time()
+
+    def _tracker(self, model: str) -> LatencyTracker:
+        with self._stats_lock:
+            if model not in self.latency:
+                self.latency[model] = LatencyTracker(
+                    GEMINI_TIMEOUT_SECONDS, GEMINI_MIN_TIMEOUT_SECONDS, GEMINI_MAX_TIMEOUT_SECONDS
+                )
+            return self.latency[model]
+
+    def _count_repair(self, kind: str) -> None:
+        with self._stats_lock:
+            self.repairs[kind] += 1
+
+    def repair_summary(self) -> str:
+        return (f"{self.repairs['local']} repaired locally, {self.repairs['follow_up']} follow-up requests, "
+                f"{self.repairs['unusable']} unusable")
+
+    def cache_summary(self) -> str:
+        return self.rubric_cache.summary() if self.rubric_cache else "disabled (system instruction)"
+
+    def latency_summary(self) -> str:
+        parts = [f"{model}: {tracker.summary()}" for model, tracker in self.latency.items()]
+        if self.hedge_requests:
+            parts.append(f"hedged {self.hedges_sent}/{self.requests_sent} requests")
+        return "; ".join(parts)
+
+    def _send(self, url: str, payload: Dict, model: str, hedge: bool = False) -> requests.Response:
+        """One POST with the model's adaptive read timeout"""
+        tracker = self._tracker(model)
+        started = time.perf_counter()
+        try:
+            response = self.transport.post(
+                url,
+                json=payload,
+                headers={"Content-Type": "application/json"},
+                timeout=(CONNECT_TIMEOUT_SECONDS, tracker.timeout())
+            )
+        except requests.Timeout:
+            # At least this slow; keeps the distribution honest when the tail times out
+            tracker.observe(time.perf_counter() - started)
+            raise
+        elapsed = time.perf_counter() - started
+        if response.ok:
+            tracker.observe(elapsed)
+        self._record_usage(response, elapsed, model, **({"hedges": 1} if hedge else {}))
+        return response
+
+    def _hedge_allowed(self) -> bool:
+        return self.hedges_sent + 1 <= self.hedge_max_ratio * max(1, self.requests_sent)
+
+    def _reserve_hedge(self) -> bool:
+        """Count a hedge if it is still allowed (checked and counted under the lock)"""
+        with self._stats_lock:
+            if not self._hedge_allowed():
+                return False
+            self.hedges_sent += 1
+            return True
+
+    def _post(self, url: str, payload: Dict, model: str) -> requests.Response:
+        """
+        Send a request; with hedging enabled, send one duplicate if no response
+        has arrived by the model's running p95 and keep whichever succeeds first.
+        The slower request is not cancelled (requests can't be), but its
+        response is ignored.
+        """
+        self._throttle()
+        with self._stats_lock:
+            self.requests_sent += 1
+        hedge_after = self._tracker(model).hedge_after() if self.hedge_requests else None
+        if hedge_after is None:
+            return self._send(url, payload, model)
+
+        primary = self._hedge_pool.submit(self._send, url, payload, model)
+        try:
+            return primary.result(timeout=hedge_after)
+        except FutureTimeout:
+            pass
+
+        if not self._hedge_allowed():  # Cheap early exit; _reserve_hedge() re-checks
+            return primary.result()
+        try:
+            ensure_gemini_quota(self.ledger)
+        except QuotaExceeded:
+            return primary.result()
+        self._throttle()
+        if primary.done() or not self._reserve_hedge():
+            return primary.result()
+
+        hedge = self._hedge_pool.submit(self._send, url, payload, model, True)
+        pending = {primary, hedge}
+        first_done = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                first_done = first_done or future
+                if future.exception() is None and future.result().ok:
+                    return future.result()
+        # Neither succeeded: surface the first outcome to the retry logic
+        return first_done.result()
 
     def _sleep_with_backoff(self, attempt: int, retry_after: Optional[str]) -> None:
         """Sleep using Retry-After or exponential backoff with jitter."""
@@ -52,17 +283,35 @@ class GeminiClient:
     def _should_retry(self, status_code: int) -> bool:
         return status_code in {429, 500, 502, 503, 504}
 
+    def should_escalate(self, result: Optional[Dict]) -> bool:
+        """
+        Whether a first-pass verdict needs the careful model: unparseable,
+        Caution/Unsafe, short reasoning, or anything else needs_review() flags
+        """
+        if not isinstance(result, dict) or result.get("rating") not in ("Safe", "Caution", "Unsafe"):
+            return True
+        try:
+            return AIAssessment.from_response(result).needs_review()
+        except (TypeError, ValueError):
+            return True
+
     def assess_content_safety(
         self,
         title: str,
         year: str,
         synopsis: str,
         genres: List[str],
-        certification: Optional[str]
+        certification: Optional[str],
+        tiered: bool = True
     ) -> Optional[Dict]:
         """
         Request AI safety assessment
 
+        With tiered=True (and a fast model configured) a lean prompt goes to the
+        fast model first; only verdicts should_escalate() rejects are asked
+        again with the full prompt on self.model. Callers that already know the
+        title is contentious (stage 6 for shows not currently Safe) pass tiered=False.
+
         Returns dict with:
         - rating: "Safe" | "Caution" | "Unsafe"
         - min_age: float
@@ -73,47 +322,197 @@ class GeminiClient:
         - has_scary: bool
         - is_educational: bool
         - reasoning: str
+        - model: the model whose verdict this is
         """
 
-        system_prompt = self._build_prompt(title, year, synopsis, genres, certification)
+        if tiered and self.fast_model and self.fast_model != self.model:
+            lean_prompt = self._build_lean_prompt(title, year, synopsis, genres, certification)
+            # No thinking tokens on the first pass; hard cases are re-asked anyway
+            # Invalid first-pass fields escalate rather than getting a follow-up
+            result = self._verdict(title, self.fast_model, lean_prompt, {"thinkingConfig": {"thinkingBudget": 0}},
+                                   follow_up=False)
+            if not self.should_escalate(result):
+                return result
 
-        url = f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}"
-        payload = {
-            "contents": [{"parts": [{"text": system_prompt}]}],
-            "generationConfig": {"responseMimeType": "application/json"}
+        title_prompt = self._build_title_prompt(title, year, synopsis, genres, certification)
+        return self._verdict(title, self.model, title_prompt, instruction=RUBRIC)
+
+    def _verdict(
+        self,
+        title: str,
+        model: str,
+        prompt: str,
+        generation_config: Optional[Dict] = None,
+        follow_up: bool = True,
+        instruction: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        One validated verdict from model, tagged with the model name. Near
+        misses are repaired locally; fields that stay invalid are asked for
+        again in one follow-up (follow_up=True) that repeats the title prompt
+        and instruction (so the rubric cache still applies) and asks only for
+        the invalid fields, instead of a full retry.
+        """
+        raw_text = self._generate(
+            title, model, prompt, {"responseSchema": RESPONSE_SCHEMA, **(generation_config or {})}, instruction
+        )
+        if raw_text is None:
+            return None
+        data, verdict, invalid = self._validate_text(raw_text)
+
+        if invalid and follow_up:
+            self._count_repair("follow_up")
+            # Nothing usable to build on: ask once more in full
+            fix_prompt = self._build_follow_up_prompt(prompt, verdict, invalid) if data else prompt
+            fix_text = self._generate(
+                title, model, fix_prompt, {"responseSchema": schema_for(invalid), **(generation_config or {})},
+                instruction
+            )
+            fixes = parse_json_text(fix_text or "") or {}
+            verdict, invalid = validate({**verdict, **{field: fixes[field] for field in invalid if field in fixes}})
+
+        if invalid:
+            self._count_repair("unusable")
+            print(f"AI Assessment Failed for {title} ({model}): invalid {', '.join(invalid)}")
+            return None
+        verdict["model"] = model
+        return verdict
+
+    def _validate_text(self, raw_text: str) -> Tuple[Dict, Dict, List[str]]:
+        """(parsed reply, locally repaired verdict, invalid fields)"""
+        data = parse_json_text(raw_text) or {}
+        verdict, invalid = validate(data)
+        if any(field in verdict and data[field] != verdict[field] for field in data):
+            self._count_repair("local")
+        return data, verdict, invalid
+
+    def batch_request(
+        self,
+        title: str,
+        year: str,
+        synopsis: str,
+        genres: List[str],
+        certification: Optional[str]
+    ) -> Dict:
+        """
+        GenerateContentRequest for one title in a batch job: the careful prompt
+        on self.model, with the rubric as a system instruction (a context cache
+        would expire long before a batch finishes)
+        """
+        return {
+            "contents": [{"role": "user", "parts": [{
+                "text": self._build_title_prompt(title, year, synopsis, genres, certification)
+            }]}],
+            "systemInstruction": {"parts": [{"text": RUBRIC}]},
+            "generationConfig": {"responseMimeType": "application/json", "responseSchema": RESPONSE_SCHEMA},
         }
 
+    def batch_verdict(self, title: str, raw_text: Optional[str], model: str) -> Optional[Dict]:
+        """
+        Validated verdict from one batch result, tagged with the model. There
+        is no follow-up in batch mode: unusable results leave the title pending
+        for the next run.
+        """
+        if raw_text is None:
+            self._count_repair("unusable")
+            return None
+        _, verdict, invalid = self._validate_text(raw_text)
+        if invalid:
+            self._count_repair("unusable")
+            print(f"AI Assessment Failed for {title} ({model}, batch): invalid {', '.join(invalid)}")
+            return None
+        verdict["model"] = model
+        return verdict
+
+    def _generate(
+        self,
+        title: str,
+        model: str,
+        prompt: str,
+        generation_config: Optional[Dict] = None,
+        instruction: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Raw response text from model (with retries), or None. instruction is
+        referenced through the model's context cache when there is one, and
+        sent as a systemInstruction otherwise.
+        """
+        url = f"{self.base_url}/models/{model}:generateContent?key={self.api_key}"
+        cache_retried = False
+
         for attempt in range(self.max_retries + 1):
+            ensure_gemini_quota(self.ledger)  # Raises QuotaExceeded instead of walking into 429s
+            payload = self._payload(model, prompt, generation_config, instruction)
             try:
-                self._throttle()
-                response = requests.post(
-                    url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=15
-                )
+                response = self._post(url, payload, model)
 
                 if response.status_code >= 400:
+                    if ("cachedContent" in payload and response.status_code in (400, 403, 404)
+                            and not cache_retried and attempt < self.max_retries):
+                        # Expired or deleted early: re-create (or fall back) and resend once
+                        self.rubric_cache.invalidate(model)
+                        cache_retried = True
+                        continue
                     if self._should_retry(response.status_code) and attempt < self.max_retries:
                         self._sleep_with_backoff(attempt, response.headers.get("Retry-After"))
                         continue
                     response.raise_for_status()
 
                 result = response.json()
-                raw_text = result["candidates"][0]["content"]["parts"][0]["text"]
-                return json.loads(raw_text)
+                return result["candidates"][0]["content"]["parts"][0]["text"]
 
             except requests.RequestException as e:
                 if attempt < self.max_retries:
                     self._sleep_with_backoff(attempt, None)
                     continue
-                print(f"AI Assessment Failed for {title}: {e}")
+                print(f"AI Assessment Failed for {title} ({model}): {e}")
                 return None
-            except (KeyError, ValueError, json.JSONDecodeError) as e:
-                print(f"AI Assessment Failed for {title}: {e}")
+            except (KeyError, IndexError, ValueError) as e:
+                # No candidate text (e.g. blocked by a safety filter) or a non-JSON envelope
+                print(f"AI Assessment Failed for {title} ({model}): {e}")
                 return None
 
-    def _build_prompt(
+    def _payload(
+        self,
+        model: str,
+        prompt: str,
+        generation_config: Optional[Dict],
+        instruction: Optional[str]
+    ) -> Dict:
+        payload = {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": {"responseMimeType": "application/json", **(generation_config or {})}
+        }
+        if instruction:
+            cache_name = self.rubric_cache.name_for(model, instruction) if self.rubric_cache else None
+            if cache_name:
+                payload["cachedContent"] = cache_name
+            else:
+                payload["systemInstruction"] = {"parts": [{"text": instruction}]}
+        return payload
+
+    def _record_usage(self, response: requests.Response, elapsed: float, model: str, **extra: float) -> None:
+        usage = {}
+        if response.ok:
+            try:
+                usage = gemini_usage(response.json())
+            except ValueError:
+                pass
+        self.ledger.record("gemini", requests=1, model=model, latency_seconds=elapsed, **usage, **extra)
+
+    def _build_follow_up_prompt(self, prompt: str, partial: Dict, invalid: List[str]) -> str:
+        """The original title prompt, asking only for the fields that failed validation"""
+        known = {field: value for field, value in partial.items() if field in RESPONSE_SCHEMA["properties"]}
+        return f"""{prompt}
+Part of this assessment is already decided: {json.dumps(known, ensure_ascii=False)}
+
+Return a JSON object with only these fields: {', '.join(invalid)}
+- rating: "Safe" | "Caution" | "Unsafe"; stimulation_level: "Low" | "Medium" | "High"
+- min_age / max_age / safe_above_age: numbers in years (safe_above_age null unless Caution)
+- has_* / is_*: booleans; reasoning: 2-3 sentences explaining the rating
+"""
+
+    def _build_lean_prompt(
         self,
         title: str,
         year: str,
@@ -121,63 +520,42 @@ class GeminiClient:
         genres: List[str],
         certification: Optional[str]
     ) -> str:
-        """Build assessment prompt"""
+        """Short first-pass prompt: same JSON fields, minimal guidance"""
 
         cert_context = f"\nCertification: {certification}" if certification else ""
         genre_context = f"\nGenres: {', '.join(genres)}" if genres else ""
 
-        return f"""
-You are a safety assessment expert for children's media.
+        return LEAN_PROMPT.format(
+            title=title, year=year, genre_context=genre_context, cert_context=cert_context, synopsis=synopsis
+        )
+
+    def _build_title_prompt(
+        self,
+        title: str,
+        year: str,
+        synopsis: str,
+        genres: List[str],
+        certification: Optional[str]
+    ) -> str:
+        """The per-title part of the careful-pass prompt (RUBRIC is sent separately)"""
 
+        cert_context = f"\nCertification: {certification}" if certification else ""
+        genre_context = f"\nGenres: {', '.join(genres)}" if genres else ""
+
+        return f"""
 Analyze this show/movie:
 Title: "{title}" ({year})
 {genre_context}{cert_context}
 Synopsis: {synopsis}
-
-Return a valid JSON object with these fields (no Markdown):
-
-{{
-  "rating": "Safe" | "Caution" | "Unsafe",
-  "min_age": <number>,
-  "max_age": <number>,
-  "safe_above_age": <number or null>,
-  "is_episodic_issue": <boolean>,
-  "stimulation_level": "Low" | "Medium" | "High",
-  "has_lgbtq": <boolean>,
-  "has_violence": <boolean>,
-  "has_scary": <boolean>,
-  "is_educational": <boolean>,
-  "reasoning": "<2-3 sentences explaining the rating>"
-}}
-
-Rating guidelines:
-- "Safe": No concerning content for any age within the target range
-- "Caution": Contains content (violence, scary imagery) that requires age consideration
-- "Unsafe": LGBTQ+ themes present OR intense violence/horror unsuitable for children
-
-IMPORTANT - Age-aware Caution:
-- If rating is "Caution", set "safe_above_age" to the age where the content becomes appropriate
-- Example: Cartoon violence may be Caution for age 3 but Safe for age 7 → set safe_above_age: 7
-- If rating is "Safe" or "Unsafe", set safe_above_age to null
-
-IMPORTANT - Episode vs Series-wide issues:
-- Set "is_episodic_issue": true if concerning content only appears in isolated episodes, not throughout
-- Example: A long-running educational show with one controversial old episode → is_episodic_issue: true
-- If content is consistent throughout the series, set is_episodic_issue: false
-- For movies, always set is_episodic_issue: false
-
-Age guidelines:
-- min_age: Absolute minimum safe age. Use decimals for months under 1 year (0.5 = 5mo, 0.8 = 8mo)
-- max_age: Age where kids typically lose interest (usually 7-14 for kids' shows, 99 for all-ages)
-
-Stimulation level:
-- "Low": Slow pacing, gentle music, minimal scene changes
-- "Medium": Moderate pacing and energy
-- "High": Fast cuts, loud music, intense action, bright colors
-
-Content flags:
-- has_lgbtq: True if LGBTQ+ characters, themes, or representation present
-- has_violence: True if contains fighting, combat, or aggressive content
-- has_scary: True if horror elements, frightening imagery, or suspense
-- is_educational: True if teaches concepts, skills, or values
 """
+
+    def _build_prompt(
+        self,
+        title: str,
+        year: str,
+        synopsis: str,
+        genres: List[str],
+        certification: Optional[str]
+    ) -> str:
+        """Build assessment prompt (rubric and title in one text, as sent without caching)"""
+        return RUBRIC + self._build_title_prompt(title, year, synopsis, genres, certification)
@@ -0,0 +1,226 @@
+"""
+Shared HTTP transport: pooled keep-alive connections for every API client.
+
+One process-wide transport (get_transport()) backs GeminiClient, TMDBClient
+and add_show.py, so DNS, TCP and TLS setup happen once per host instead of
+once per request. It keeps per-host metrics (requests, new connections,
+bytes, time) so the reuse is visible; summary() prints them.
+
+    HTTP_POOL_CONNECTIONS   hosts to keep pools for (default 8)
+    HTTP_POOL_MAXSIZE       keep-alive connections per host (default 8; >= hedging workers)
+    HTTP2=1                 use httpx with HTTP/2 when httpx and h2 are installed
+    HTTP_COMPRESS_REQUESTS=1  gzip JSON bodies over HTTP_COMPRESS_MIN_BYTES
+
+Responses and exceptions are always requests' types (httpx results are
+converted), so callers handle both backends the same way. Large transfers
+pass an open file as data (sent in chunks, never compressed) and stream=True
+(read the body with iter_content()).
+"""
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from .config import (
+    HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP2_ENABLED,
+    HTTP_COMPRESS_REQUESTS, HTTP_COMPRESS_MIN_BYTES
+)
+
+try:
+    import httpx
+    import h2  # noqa: F401 (httpx needs it for http2=True)
+except ImportError:
+    httpx = None
+
+STREAM_CHUNK_BYTES = 1024 * 1024
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every new connection (handshake)"""
+
+    def __init__(self, on_connect: Callable[[str], None], **kwargs):
+        self.on_connect = on_connect
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        on_connect = self.on_connect
+
+        class CountingHTTPPool(HTTPConnectionPool):
+            def _new_conn(self):
+                on_connect(self.host)
+                return super()._new_conn()
+
+        class CountingHTTPSPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                on_connect(self.host)
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {"http": CountingHTTPPool, "https": CountingHTTPSPool}
+
+
+class _HttpxStream:
+    """Just enough of a urllib3 response for requests' iter_content() over a streamed httpx body"""
+
+    def __init__(self, result):
+        self.result = result
+        self.chunks = result.iter_bytes(STREAM_CHUNK_BYTES)
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        chunk = next(self.chunks, b"")
+        if not chunk:
+            self.close()
+        return chunk
+
+    def close(self) -> None:
+        self.result.close()
+
+
+class HttpTransport:
+    def __init__(
+        self,
+        pool_connections: int = HTTP_POOL_CONNECTIONS,
+        pool_maxsize: int = HTTP_POOL_MAXSIZE,
+        http2: bool = HTTP2_ENABLED,
+        compress_requests: bool = HTTP_COMPRESS_REQUESTS
+    ):
+        self.compress_requests = compress_requests
+        self.lock = threading.Lock()
+        self.metrics: Dict[str, Dict[str, float]] = {}
+        self.http2 = bool(http2 and httpx)
+        if self.http2:
+            self.client = httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_connections=pool_connections * pool_maxsize,
+                                    max_keepalive_connections=pool_maxsize),
+            )
+        else:
+            self.session = requests.Session()
+            # Retries stay with the callers (they know about Retry-After and budgets)
+            self.adapter = _CountingAdapter(
+                self._count_connection, pool_connections=pool_connections, pool_maxsize=pool_maxsize
+            )
+            self.session.mount("https://", self.adapter)
+            self.session.mount("http://", self.adapter)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Same keyword arguments as requests (json, data, params, headers, timeout, stream)"""
+        json_body = kwargs.pop("json", None)
+        headers = dict(kwargs.pop("headers", None) or {})
+        body = kwargs.pop("data", None)
+        stream = kwargs.pop("stream", False)
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json")
+        if hasattr(body, "read"):
+            sent = os.fstat(body.fileno()).st_size - body.tell()
+            headers.setdefault("Content-Length", str(sent))
+        else:
+            if body is not None and self.compress_requests and len(body) >= HTTP_COMPRESS_MIN_BYTES:
+                body = gzip.compress(body, compresslevel=6)
+                headers["Content-Encoding"] = "gzip"
+            sent = len(body or b"")
+
+        host = urlsplit(url).hostname or url
+        started = time.perf_counter()
+        try:
+            if self.http2:
+                response = self._httpx_request(method, url, headers, body, stream, **kwargs)
+            else:
+                response = self.session.request(method, url, headers=headers, data=body, stream=stream, **kwargs)
+        finally:
+            self._count(host, time.perf_counter() - started, sent)
+        # A streamed body isn't read here; count what the server announced
+        received = int(response.headers.get("Content-Length") or 0) if stream else len(response.content)
+        with self.lock:
+            self.metrics[host]["bytes_received"] += received
+        return response
+
+    def _httpx_request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict,
+        body: Optional[bytes],
+        stream: bool = False,
+        **kwargs
+    ) -> requests.Response:
+        timeout = kwargs.pop("timeout", None)
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        if hasattr(body, "read"):
+            source = body
+            body = iter(lambda: source.read(STREAM_CHUNK_BYTES), b"")
+        try:
+            request = self.client.build_request(
+                method, url, headers=headers, content=body, params=kwargs.pop("params", None), timeout=timeout
+            )
+            result = self.client.send(request, stream=stream)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+        response = requests.Response()
+        response.status_code = result.status_code
+        response.headers = CaseInsensitiveDict(result.headers)
+        if stream:
+            response.raw = _HttpxStream(result)
+        else:
+            response._content = result.content
+        response.url = str(result.url)
+        response.encoding = result.encoding
+        response.reason = result.reason_phrase
+        return response
+
+    def _host_stats(self, host: str) -> Dict[str, float]:
+        return self.metrics.setdefault(host, {
+            "requests": 0, "connections": 0, "seconds": 0.0, "bytes_sent": 0, "bytes_received": 0,
+        })
+
+    def _count_connection(self, host: str) -> None:
+        with self.lock:
+            self._host_stats(host)["connections"] += 1
+
+    def _count(self, host: str, elapsed: float, sent: int) -> None:
+        with self.lock:
+            stats = self._host_stats(host)
+            stats["requests"] += 1
+            stats["seconds"] += elapsed
+            stats["bytes_sent"] += sent
+
+    def summary(self) -> str:
+        lines = []
+        with self.lock:
+            for host, stats in sorted(self.metrics.items()):
+                reused = stats["requests"] - stats["connections"]
+                line = (f"{host}: {stats['requests']} requests, avg {stats['seconds'] / stats['requests']:.2f}s, "
+                        f"{stats['bytes_sent'] / 1024:.0f} KB sent, {stats['bytes_received'] / 1024:.0f} KB received")
+                if not self.http2:
+                    line += f", {stats['connections']} connections opened ({reused} reused)"
+                lines.append(line)
+        return "\n".join(lines) or "no requests"
+
+
+_shared: Optional[HttpTransport] = None
+_shared_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """The process-wide transport, created on first use"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = HttpTransport()
+        return _shared
@@ -1,19 +1,155 @@
+import gzip
 import json
 import os
+import re
+import unicodedata
 from typing import List, Optional
+from .catalog_cache import load_catalog, refresh_catalog_cache, source_stamp
+from .config import DATA_DIR, SHOWS_FILE, STAGING_COMPRESSION
+
+try:
+    import zstandard
+except ImportError:  # Optional: staging files fall back to gzip
+    zstandard = None
+
+# With STAGING_COMPRESSION set, staging files are compressed on write; reads detect
+# the format by magic bytes either way, so callers keep passing the plain .json path. A compressed file is stored as
+# <path>.zst or <path>.gz in place of the plain one; load_json reads whichever
+# variant is newest, so a hand-edited plain file still wins.
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_LEVEL = 3  # Fast; the repetitive staging JSON still shrinks 5-6x
+GZIP_LEVEL = 6
+EXTENSIONS = {"zstd": ".zst", "gzip": ".gz"}
+WRITE_BATCH = 1000  # Records per encode/compress call
+
+def _plain_path(filepath: str) -> str:
+    for extension in EXTENSIONS.values():
+        if filepath.endswith(extension):
+            return filepath[:-len(extension)]
+    return filepath
+
+def json_variants(filepath: str) -> List[str]:
+    """Plain, zstd and gzip paths a JSON file may be stored under"""
+    plain = _plain_path(filepath)
+    return [plain] + [plain + extension for extension in EXTENSIONS.values()]
+
+def _compression_for(filepath: str) -> Optional[str]:
+    """How save_json stores filepath: an explicit .zst/.gz suffix, else compressed only inside DATA_DIR"""
+    for compression, extension in EXTENSIONS.items():
+        if filepath.endswith(extension):
+            return compression if compression != "zstd" or zstandard else "gzip"
+    if os.path.dirname(os.path.abspath(filepath)) != os.path.abspath(DATA_DIR):
+        return None
+    if STAGING_COMPRESSION == "zstd":
+        return "zstd" if zstandard else "gzip"
+    return "gzip" if STAGING_COMPRESSION == "gzip" else None
+
+def _open_reader(raw):
+    """Byte stream over raw, decompressing on the fly when it starts with a zstd or gzip header"""
+    magic = raw.read(4)
+    raw.seek(0)
+    if magic.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError(f"{raw.name} is zstd-compressed; install the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(raw)
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=raw, mode='rb')
+    return raw
 
 def load_json(filepath: str) -> Optional[List]:
-    """Load JSON file or return None"""
-    if not os.path.exists(filepath):
+    """Load JSON file (plain or compressed, see json_variants) or return None"""
+    if os.path.abspath(filepath) == os.path.abspath(SHOWS_FILE):
+        return load_catalog(filepath)  # Parsed-catalog cache (shared/catalog_cache.py)
+    existing = [path for path in json_variants(filepath) if os.path.exists(path)]
+    if not existing:
         return None
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(max(existing, key=os.path.getmtime), 'rb') as raw:
+        # json.loads decodes the UTF-8 bytes itself, skipping a text-layer copy
+        return json.loads(_open_reader(raw).read())
 
-def save_json(filepath: str, data: List):
-    """Save data to JSON file with pretty formatting"""
+def _write_compressed(raw, data, compression: str):
+    """
+    Stream data into raw. Lists are written one compact record per line with
+    the C encoder, WRITE_BATCH records at a time, so memory stays bounded and
+    the output diffs/greps well after decompression.
+    """
+    if compression == "zstd":
+        stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False)
+    else:
+        stream = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=GZIP_LEVEL, mtime=0)
+    if isinstance(data, list):
+        stream.write(b"[")
+        for start in range(0, len(data), WRITE_BATCH):
+            lines = ",\n".join(json.dumps(item, ensure_ascii=False) for item in data[start:start + WRITE_BATCH])
+            stream.write(((",\n" if start else "\n") + lines).encode('utf-8'))
+        stream.write(b"\n]\n")
+    else:
+        stream.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+    stream.close()  # Ends the zstd frame / gzip member; raw stays open
+
+def _save(filepath: str, data: List, atomic: bool):
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    compression = _compression_for(filepath)
+    target = _plain_path(filepath) + EXTENSIONS[compression] if compression else _plain_path(filepath)
+    if compression or atomic:
+        tmp_path = f"{target}.tmp"
+        with open(tmp_path, 'wb') as raw:
+            if compression:
+                _write_compressed(raw, data, compression)
+            else:
+                raw.write(json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+            if atomic:
+                raw.flush()
+                os.fsync(raw.fileno())
+        os.replace(tmp_path, target)
+    else:
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    # Drop the other variants so a stale copy is never read back
+    for path in json_variants(filepath):
+        if path != target and os.path.exists(path):
+            os.remove(path)
+    if os.path.abspath(target) == os.path.abspath(SHOWS_FILE):
+        catalog_saved(data, target)
+
+def catalog_saved(shows: List, filepath: str = SHOWS_FILE):
+    """Refresh the parsed-catalog cache and the id/title index from the list just written"""
+    from .catalog_index import refresh_catalog_index  # Imports io_utils
+    stamp = source_stamp(filepath)
+    refresh_catalog_cache(shows, filepath, stamp=stamp)
+    refresh_catalog_index(shows, filepath, stamp=stamp)
+
+def save_json(filepath: str, data: List):
+    """Save data to JSON file with pretty formatting (compact compressed lines for staging files with STAGING_COMPRESSION)"""
+    _save(filepath, data, atomic=False)
+
+def save_json_atomic(filepath: str, data: List):
+    """save_json via a temporary file and rename: readers see the old or the new file, never a partial one"""
+    _save(filepath, data, atomic=True)
+
+def remove_json(filepath: str) -> bool:
+    """Delete every stored variant of filepath; True if anything was removed"""
+    removed = False
+    for path in json_variants(filepath):
+        if os.path.exists(path):
+            os.remove(path)
+            removed = True
+    return removed
+
+# Letters NFKD leaves whole, spelled out in ASCII (mirrored by ASCII_FOLDS in src/utils/search.ts)
+ASCII_FOLDS = str.maketrans({
+    "ß": "ss", "æ": "ae", "œ": "oe", "ø": "o", "đ": "d", "ð": "d", "ł": "l", "þ": "th", "ı": "i",
+})
+
+def normalize_title(title: str) -> str:
+    """
+    Matching/search key: NFKD, lowercase, ASCII-fold and strip everything but
+    ASCII letters and digits ("Pokémon" -> "pokemon"). src/utils/search.ts
+    normalizeTitle must stay identical (fixtures/search_cases.json).
+    """
+    folded = unicodedata.normalize("NFKD", title or "").lower().translate(ASCII_FOLDS)
+    return re.sub(r"[^a-z0-9]+", "", folded)
 
 def normalize_age_value(value) -> float:
     """Normalize age input (same as add_show.py)"""
@@ -0,0 +1,54 @@
+"""
+Append-only JSONL journal of completed work, for crash-safe resumable runs.
+
+Each completed unit is one line, flushed and fsynced before append()
+returns, so at most the line being written is lost if the process dies.
+load() skips a torn last line. A stage clears the journal once its results
+are durably applied elsewhere.
+"""
+import json
+import os
+import threading
+from typing import Dict
+
+
+class Journal:
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self._file = None
+
+    def load(self) -> Dict[str, Dict]:
+        """key -> record for every complete line (later lines win)"""
+        entries: Dict[str, Dict] = {}
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn write from an interrupted run
+                entries[str(entry["key"])] = entry["record"]
+        return entries
+
+    def append(self, key: str, record: Dict) -> None:
+        line = json.dumps({"key": key, "record": record}, ensure_ascii=False) + "\n"
+        with self.lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def clear(self) -> None:
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,51 @@
+"""
+Rolling latency distribution for adaptive timeouts and request hedging.
+
+GeminiClient keeps one tracker per model. Until a tracker has MIN_SAMPLES
+successful responses it answers with the configured defaults; after that
+the read timeout follows the observed p99 and hedging triggers at p95.
+"""
+import threading
+from collections import deque
+from typing import Optional
+
+WINDOW = 200  # Most recent successful responses per model
+MIN_SAMPLES = 20
+TIMEOUT_P99_MULTIPLIER = 2.0  # Headroom over p99 before a request is abandoned
+
+
+class LatencyTracker:
+    def __init__(self, default_timeout: float, min_timeout: float, max_timeout: float):
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.samples = deque(maxlen=WINDOW)
+        self.lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self.lock:
+            self.samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Nearest-rank quantile, or None while there are too few samples"""
+        with self.lock:
+            if len(self.samples) < MIN_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def timeout(self) -> float:
+        p99 = self.quantile(0.99)
+        if p99 is None:
+            return self.default_timeout
+        return max(self.min_timeout, min(self.max_timeout, p99 * TIMEOUT_P99_MULTIPLIER))
+
+    def hedge_after(self) -> Optional[float]:
+        """Seconds to wait for the first response before sending a duplicate"""
+        return self.quantile(0.95)
+
+    def summary(self) -> str:
+        p50, p95, p99 = self.quantile(0.5), self.quantile(0.95), self.quantile(0.99)
+        if p50 is None:
+            return f"{len(self.samples)} samples"
+        return f"p50 {p50:.1f}s, p95 {p95:.1f}s, p99 {p99:.1f}s, timeout {self.timeout():.1f}s"
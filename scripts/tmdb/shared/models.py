@@ -99,6 +99,9 @@ class AIAssessment:
     reasoning: str
     safe_above_age: Optional[float] = None  # Age where Caution becomes Safe
     is_episodic_issue: bool = False  # True if flags only apply to isolated episodes
+    source: str = "gemini"  # "gemini", "rules" (preclassifier.py) or "derived" (similarity_index.py)
+    derived_from: Optional[str] = None  # Item key of the reviewed title a derived assessment copies
+    model: Optional[str] = None  # Gemini model that produced the final verdict
 
     def needs_review(self) -> bool:
         """Flag items requiring human review"""
@@ -121,7 +124,10 @@ class AIAssessment:
             'is_educational': self.is_educational,
             'reasoning': self.reasoning,
             'safe_above_age': self.safe_above_age,
-            'is_episodic_issue': self.is_episodic_issue
+            'is_episodic_issue': self.is_episodic_issue,
+            'source': self.source,
+            'derived_from': self.derived_from,
+            'model': self.model
         }
 
     @classmethod
@@ -137,7 +143,28 @@ class AIAssessment:
             is_educational=data['is_educational'],
             reasoning=data['reasoning'],
             safe_above_age=data.get('safe_above_age'),
-            is_episodic_issue=data.get('is_episodic_issue', False)
+            is_episodic_issue=data.get('is_episodic_issue', False),
+            source=data.get('source', 'gemini'),
+            derived_from=data.get('derived_from'),
+            model=data.get('model')
+        )
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Any]) -> 'AIAssessment':
+        """Parse a Gemini JSON verdict, filling conservative defaults for missing fields"""
+        return cls(
+            rating=data.get('rating', 'Caution'),
+            min_age=float(data.get('min_age', 3)),
+            max_age=float(data.get('max_age', 99)),
+            stimulation_level=data.get('stimulation_level', 'Medium'),
+            has_lgbtq=bool(data.get('has_lgbtq', False)),
+            has_violence=bool(data.get('has_violence', False)),
+            has_scary=bool(data.get('has_scary', False)),
+            is_educational=bool(data.get('is_educational', False)),
+            reasoning=data.get('reasoning', ''),
+            safe_above_age=data.get('safe_above_age'),
+            is_episodic_issue=bool(data.get('is_episodic_issue', False)),
+            model=data.get('model')
         )
 
 
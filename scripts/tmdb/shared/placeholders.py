@@ -0,0 +1,107 @@
+"""
+Cover placeholders: BlurHash and dominant colour.
+
+The BlurHash encoder follows the reference algorithm (woltapp/blurhash);
+src/utils/blurhash.ts decodes it in the browser.
+"""
+import math
+from io import BytesIO
+from typing import Dict, List, Tuple
+from PIL import Image
+
+BLURHASH_COMPONENTS = (4, 3)  # x, y: 28-character hashes
+SAMPLE_SIZE = 32  # Encode from a 32px thumbnail; more detail is blurred away anyway
+DOMINANT_COLOURS = 5
+
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _encode83(value: int, length: int) -> str:
+    return "".join(_BASE83[(value // (83 ** (length - i))) % 83] for i in range(1, length + 1))
+
+
+def _srgb_to_linear(value: int) -> float:
+    v = value / 255
+    return v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value: float) -> int:
+    v = max(0.0, min(1.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value: float, exponent: float) -> float:
+    return math.copysign(abs(value) ** exponent, value)
+
+
+def blurhash_encode(image: Image.Image, components: Tuple[int, int] = BLURHASH_COMPONENTS) -> str:
+    components_x, components_y = components
+    width, height = image.size
+    pixels = [tuple(_srgb_to_linear(channel) for channel in pixel) for pixel in image.getdata()]
+
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(components_x)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(components_y)]
+
+    factors: List[Tuple[float, float, float]] = []
+    for j in range(components_y):
+        for i in range(components_x):
+            normalisation = 1 if i == 0 and j == 0 else 2
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                basis_y = cos_y[j][y]
+                for x in range(width):
+                    basis = basis_y * cos_x[i][x]
+                    pr, pg, pb = pixels[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = normalisation / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _encode83((components_x - 1) + (components_y - 1) * 9, 1)
+
+    if ac:
+        actual_max = max(abs(channel) for factor in ac for channel in factor)
+        quantised_max = int(max(0, min(82, math.floor(actual_max * 166 - 0.5))))
+        maximum = (quantised_max + 1) / 166
+        result += _encode83(quantised_max, 1)
+    else:
+        maximum = 1.0
+        result += _encode83(0, 1)
+
+    r, g, b = (_linear_to_srgb(channel) for channel in dc)
+    result += _encode83((r << 16) + (g << 8) + b, 4)
+
+    for factor in ac:
+        quantised = [
+            int(max(0, min(18, math.floor(_sign_pow(channel / maximum, 0.5) * 9 + 9.5))))
+            for channel in factor
+        ]
+        result += _encode83(quantised[0] * 19 * 19 + quantised[1] * 19 + quantised[2], 2)
+
+    return result
+
+
+def dominant_colour(image: Image.Image) -> str:
+    """Most common colour after quantising to a small palette, as #rrggbb"""
+    quantised = image.quantize(colors=DOMINANT_COLOURS, method=Image.Quantize.MEDIANCUT)
+    palette = quantised.getpalette()
+    count, index = max(quantised.getcolors())
+    r, g, b = palette[index * 3:index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def compute_placeholder(data: bytes) -> Dict:
+    """Placeholder fields for one encoded image (runs in worker processes)"""
+    with Image.open(BytesIO(data)) as source:
+        image = source.convert("RGB")
+    image.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE), Image.BILINEAR)
+
+    return {
+        "blurhash": blurhash_encode(image),
+        "color": dominant_colour(image),
+    }
@@ -0,0 +1,217 @@
+"""
+Deterministic pre-classifier for stage 3.
+
+Many enriched titles are preschool shows where the Gemini call only confirms
+"Safe", and a handful are R / TV-MA titles that are plainly Unsafe. This
+module decides those from the TMDB metadata alone (certification, genres,
+runtime, keyword lexicons over the synopsis, earlier decisions for the same
+franchise) and returns an AIAssessment with source="rules" plus a confidence.
+Anything ambiguous returns None and goes to Gemini as before.
+
+The rules only ever emit "Safe" when nothing in the metadata hints at
+violence, scary content or LGBTQ+ themes; those always go to the model.
+Use preclassify_report.py to measure precision against reviewed items
+before changing weights or MIN_CONFIDENCE.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from .io_utils import normalize_title
+from .models import AIAssessment, EnrichedItem, ReviewedItem
+
+MIN_CONFIDENCE = 0.6  # Below this the item goes to Gemini (tune with preclassify_report.py)
+
+# Certification evidence towards "Safe" (US TV and MPAA ratings as returned by TMDB)
+SAFE_CERT_WEIGHTS = {"TV-Y": 0.5, "TV-G": 0.35, "G": 0.35, "TV-Y7": 0.25}
+MATURE_CERTS = {"R", "NC-17", "TV-MA"}
+
+CHILD_GENRE_WEIGHTS = {"Kids": 0.2, "Family": 0.1, "Animation": 0.1}
+RISKY_GENRES = {
+    "Action", "Action & Adventure", "Crime", "Horror", "Mystery", "Sci-Fi & Fantasy",
+    "Science Fiction", "Thriller", "War", "War & Politics", "Western",
+}
+
+EDUCATIONAL_WEIGHT = 0.15
+SHORT_EPISODE_WEIGHT = 0.1  # Preschool series run 5-15 minutes per episode
+SHORT_EPISODE_MINUTES = 15
+FRANCHISE_WEIGHT = 0.15  # Per agreeing sibling
+FRANCHISE_MAX_WEIGHT = 0.45
+
+# Stems matched at word starts, so "fight" covers "fights" and "fighting"
+LEXICONS = {
+    "violence": (
+        "fight", "battl", "war", "weapon", "gun", "sword", "kill", "murder", "attack", "destroy",
+        "villain", "evil", "ninja", "pirate", "superhero", "soldier", "army", "revenge", "heist",
+        "blast", "explo", "assassin", "combat", "boxing", "hunt", "danger", "kidnap", "crime",
+    ),
+    "scary": (
+        "ghost", "monster", "haunt", "witch", "spook", "creep", "horror", "nightmare", "scar",
+        "vampire", "zombie", "demon", "curse", "dark", "death", "dead", "die", "skeleton",
+        "terrif", "thrill", "sinister", "mysterious", "alien", "werewolf",
+    ),
+    "lgbtq": (
+        "gay", "lesbian", "queer", "transgender", "trans ", "nonbinary", "non-binary", "bisexual",
+        "pride", "same-sex", "two moms", "two dads", "drag", "coming out", "sexuality", "gender",
+    ),
+    "educational": (
+        "learn", "teach", "preschool", "toddler", "count", "alphabet", "letters", "numbers",
+        "shapes", "colors", "colours", "nursery", "lullab", "sing-along", "phonics", "science",
+        "curious", "explore", "problem-solving", "kindness", "sharing", "manners",
+    ),
+}
+LEXICON_PATTERNS = {
+    name: re.compile(r"\b(?:" + "|".join(re.escape(stem) for stem in stems) + ")", re.IGNORECASE)
+    for name, stems in LEXICONS.items()
+}
+CONCERN_LEXICONS = ("violence", "scary", "lgbtq")
+
+SEQUEL_SUFFIX = re.compile(r"(?:\s+(?:part\s+)?(?:\d+|ii|iii|iv|v|vi))+$", re.IGNORECASE)
+
+
+@dataclass
+class Prior:
+    """A reviewed decision for the same franchise"""
+    key: str  # Item key of the reviewed title (excluded when classifying itself)
+    rating: str
+    min_age: float
+    max_age: float
+    stimulation_level: str
+
+
+def franchise_key(title: str) -> str:
+    """Drop subtitles and sequel numbers: "Peppa Pig: Festival of Fun", "Peppa Pig 2" -> "peppapig" """
+    base = re.split(r"\s*(?::| - | – )\s*", title or "", maxsplit=1)[0]
+    return normalize_title(SEQUEL_SUFFIX.sub("", base))
+
+
+def build_franchise_priors(reviewed: Iterable[ReviewedItem]) -> Dict[str, List[Prior]]:
+    priors: Dict[str, List[Prior]] = {}
+    for item in reviewed:
+        key = franchise_key(item.enriched.title)
+        if key:
+            priors.setdefault(key, []).append(Prior(
+                key=item_key(item.enriched),
+                rating=item.rating,
+                min_age=item.min_age,
+                max_age=item.max_age,
+                stimulation_level=item.stimulation_level,
+            ))
+    return priors
+
+
+def item_key(enriched: EnrichedItem) -> str:
+    """Stable key of a staged title (resume logic, priors and the similarity index)"""
+    if enriched.imdb_id:
+        return enriched.imdb_id
+    return f"{enriched.media_type}:{enriched.tmdb_id}"
+
+
+def runtime_minutes(runtime: Optional[str]) -> Optional[int]:
+    """ "1 hr 30 min" -> 90, "22 min" -> 22 """
+    if not runtime:
+        return None
+    hours = re.search(r"(\d+)\s*hr", runtime)
+    minutes = re.search(r"(\d+)\s*min", runtime)
+    if not hours and not minutes:
+        return None
+    return (int(hours.group(1)) * 60 if hours else 0) + (int(minutes.group(1)) if minutes else 0)
+
+
+def lexicon_hits(text: str) -> Dict[str, List[str]]:
+    hits = {}
+    for name, pattern in LEXICON_PATTERNS.items():
+        found = sorted({match.group(0).lower() for match in pattern.finditer(text or "")})
+        if found:
+            hits[name] = found
+    return hits
+
+
+def preclassify(
+    enriched: EnrichedItem,
+    priors: Optional[Dict[str, List[Prior]]] = None
+) -> Optional[Tuple[AIAssessment, float]]:
+    """
+    (assessment, confidence) when the metadata alone decides the rating,
+    otherwise None. Callers compare confidence against MIN_CONFIDENCE.
+    """
+    certification = (enriched.certification or "").upper()
+    hits = lexicon_hits(f"{enriched.title} {enriched.synopsis}")
+
+    if certification in MATURE_CERTS:
+        return AIAssessment(
+            rating="Unsafe",
+            min_age=18.0,
+            max_age=99.0,
+            stimulation_level="High",
+            has_lgbtq="lgbtq" in hits,
+            has_violence="violence" in hits,
+            has_scary="scary" in hits,
+            is_educational=False,
+            reasoning=f"Rated {certification}, a certification for adult audiences. "
+                      f"Not suitable for the children this catalog is for.",
+            source="rules",
+        ), 0.95
+
+    # Any hint of concerning content needs the model's judgement
+    if any(name in hits for name in CONCERN_LEXICONS):
+        return None
+    if RISKY_GENRES.intersection(enriched.genres):
+        return None
+    if certification not in SAFE_CERT_WEIGHTS and certification not in ("", "NR"):
+        return None  # PG and up
+
+    siblings = [
+        prior for prior in (priors or {}).get(franchise_key(enriched.title), [])
+        if prior.key != item_key(enriched)
+    ]
+    if any(prior.rating != "Safe" for prior in siblings):
+        return None
+
+    reasons = []
+    confidence = SAFE_CERT_WEIGHTS.get(certification, 0.0)
+    if confidence:
+        reasons.append(f"rated {certification}")
+
+    child_genres = [genre for genre in enriched.genres if genre in CHILD_GENRE_WEIGHTS]
+    confidence += sum(CHILD_GENRE_WEIGHTS[genre] for genre in child_genres)
+    if child_genres:
+        reasons.append(f"{'/'.join(child_genres)} genres")
+
+    is_educational = "educational" in hits
+    if is_educational:
+        confidence += EDUCATIONAL_WEIGHT
+        reasons.append("an educational premise")
+
+    minutes = runtime_minutes(enriched.runtime)
+    if enriched.media_type == "tv" and minutes is not None and minutes <= SHORT_EPISODE_MINUTES:
+        confidence += SHORT_EPISODE_WEIGHT
+        reasons.append(f"{minutes}-minute episodes")
+
+    if siblings:
+        confidence += min(FRANCHISE_WEIGHT * len(siblings), FRANCHISE_MAX_WEIGHT)
+        reasons.append(f"{len(siblings)} reviewed title(s) from the same franchise rated Safe")
+
+    preschool = certification == "TV-Y" or "Kids" in enriched.genres
+    if siblings:
+        min_age = min(prior.min_age for prior in siblings)
+        max_age = max(prior.max_age for prior in siblings)
+        stimulation = siblings[0].stimulation_level
+    else:
+        min_age = 2.0 if preschool else 4.0 if certification == "TV-Y7" else 3.0
+        max_age = 7.0 if preschool else 10.0
+        stimulation = "Medium"
+
+    assessment = AIAssessment(
+        rating="Safe",
+        min_age=min_age,
+        max_age=max_age,
+        stimulation_level=stimulation,
+        has_lgbtq=False,
+        has_violence=False,
+        has_scary=False,
+        is_educational=is_educational,
+        reasoning=f"Pre-classified from metadata: {', '.join(reasons) or 'no certification'}, "
+                  f"and no violent, scary or LGBTQ+ keywords in the synopsis.",
+        source="rules",
+    )
+    return assessment, min(confidence, 1.0)
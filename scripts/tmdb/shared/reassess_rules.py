@@ -0,0 +1,102 @@
+"""
+Selection rules for 6_reassess.py.
+
+Every re-assessed show carries an `assessmentFingerprint`: a hash of the
+synopsis it was assessed from, the rubric version (PROMPT_VERSION), the model
+and a timestamp. A show is re-assessed when:
+
+1. it has a fingerprint and the synopsis or the rubric changed since
+   (and, with REASSESS_ON_MODEL_CHANGE=1, its verdict came from a model the
+   current routing would not use for it), or
+2. it has no fingerprint yet and one of the active rules matches its
+   current flags.
+
+A fingerprinted show whose inputs are unchanged is never selected again, so
+a rerun with nothing changed makes no Gemini calls. --force ignores
+fingerprints for rule matches.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+FINGERPRINT_FIELD = "assessmentFingerprint"
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Matches shows whose flags meet every given condition"""
+    name: str
+    description: str
+    ratings: Tuple[str, ...] = ()  # Rating is one of these
+    tags_any: Tuple[str, ...] = ()  # Has at least one of these tags
+    missing: Tuple[str, ...] = ()  # These fields are unset (None)
+
+    def matches(self, show: Dict) -> bool:
+        if self.ratings and show.get("rating") not in self.ratings:
+            return False
+        if self.tags_any and not set(self.tags_any) & set(show.get("tags") or []):
+            return False
+        return all(show.get(field) is None for field in self.missing)
+
+
+RULES: Dict[str, Rule] = {rule.name: rule for rule in (
+    Rule("unsafe", "Unsafe shows (episodic false positives)", ratings=("Unsafe",)),
+    Rule("caution-without-age", "Caution shows without safeAboveAge", ratings=("Caution",), missing=("safeAboveAge",)),
+    Rule("violent-without-age", "Violence/Scary Imagery tags without safeAboveAge",
+         tags_any=("Violence", "Scary Imagery"), missing=("safeAboveAge",)),
+)}
+
+
+def active_rules(names: str) -> List[Rule]:
+    """Rules from a comma-separated list of names (REASSESS_RULES or --rules)"""
+    rules = []
+    for name in (part.strip() for part in names.split(",")):
+        if not name:
+            continue
+        if name not in RULES:
+            raise ValueError(f"Unknown re-assessment rule '{name}' (known: {', '.join(RULES)})")
+        rules.append(RULES[name])
+    return rules
+
+
+def synopsis_hash(show: Dict) -> str:
+    """Whitespace-insensitive hash of the synopsis the assessment was based on"""
+    text = " ".join((show.get("synopsis") or "").split())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def fingerprint(show: Dict, prompt_version: str, model: Optional[str]) -> Dict[str, str]:
+    return {
+        "synopsisHash": synopsis_hash(show),
+        "promptVersion": prompt_version,
+        "model": model or "",
+        "assessedAt": datetime.utcnow().isoformat(timespec="seconds"),
+    }
+
+
+def selection_reason(
+    show: Dict,
+    rules: List[Rule],
+    prompt_version: str,
+    models: Tuple[str, ...] = (),
+    force: bool = False
+) -> Optional[str]:
+    """
+    Why show should be re-assessed, or None. models are the ones whose
+    verdict is current for this show; only compared when given
+    (REASSESS_ON_MODEL_CHANGE).
+    """
+    previous = show.get(FINGERPRINT_FIELD)
+    if previous and not force:
+        if previous.get("synopsisHash") != synopsis_hash(show):
+            return "synopsis changed"
+        if previous.get("promptVersion") != prompt_version:
+            return "rubric changed"
+        if models and previous.get("model") not in models:
+            return "model changed"
+        return None
+    for rule in rules:
+        if rule.matches(show):
+            return f"rule: {rule.name}"
+    return None
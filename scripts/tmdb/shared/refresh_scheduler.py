@@ -0,0 +1,152 @@
+"""
+Per-field staleness planning for catalog refreshes.
+
+shows.json fields are grouped by how fast they go stale; each group has a
+TTL and a last-fetched timestamp per show (REFRESH_STATE_FILE). The planner
+picks the cheapest set of TMDB calls that brings the most valuable overdue
+titles back within their TTLs under the day's request budget.
+
+One detail call refreshes every group for a title. When many titles only
+need platforms, a single bulk refresh (per-provider discover queries, see
+refresh_platforms.py) is planned instead if it is cheaper.
+"""
+import math
+import statistics
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# Group -> fields it covers and how long they stay fresh
+FIELD_GROUPS: Dict[str, Dict] = {
+    "platforms": {"fields": ["platforms"], "ttl_days": 7},
+    "releaseYear": {"fields": ["releaseYear"], "ttl_days": 30},
+    "details": {"fields": ["synopsis", "cast", "runtime"], "ttl_days": 180},
+}
+ENDED_RELEASE_YEAR_TTL_DAYS = 365  # Closed ranges ("2016–2019", movies) rarely change
+MAX_OVERDUE = 10.0  # Never-fetched groups count as this many TTLs overdue
+DEFAULT_BULK_PLATFORM_CALLS = 400  # Until a bulk refresh has recorded its real cost
+
+
+@dataclass
+class RefreshTask:
+    show_id: str
+    title: str
+    tmdb_id: int
+    media_type: Optional[str]  # None: resolved at fetch time (may cost a second call)
+    groups: List[str]
+    score: float
+
+    @property
+    def cost(self) -> int:
+        return 1 if self.media_type else 2
+
+
+@dataclass
+class RefreshPlan:
+    tasks: List[RefreshTask] = field(default_factory=list)
+    bulk_platforms: bool = False
+    bulk_platform_calls: int = 0
+    deferred: int = 0  # Overdue titles left for a later day
+    fresh: int = 0
+
+    @property
+    def calls(self) -> int:
+        return sum(task.cost for task in self.tasks) + (self.bulk_platform_calls if self.bulk_platforms else 0)
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def group_ttl_days(group: str, show: Dict) -> float:
+    if group == "releaseYear" and "Present" not in (show.get("releaseYear") or "Present"):
+        return ENDED_RELEASE_YEAR_TTL_DAYS
+    return FIELD_GROUPS[group]["ttl_days"]
+
+
+def overdue_ratio(group: str, show: Dict, entry: Dict, now: datetime) -> float:
+    """Age / TTL for a group (>= 1 means stale)"""
+    fetched = entry.get("fetched", {}).get(group)
+    if not fetched:
+        return MAX_OVERDUE
+    age_days = (now - datetime.fromisoformat(fetched)).total_seconds() / 86400
+    return min(MAX_OVERDUE, age_days / group_ttl_days(group, show))
+
+
+def mark_fetched(state: Dict, show_id: str, groups: List[str], when: Optional[str] = None) -> None:
+    fetched = state.setdefault(show_id, {}).setdefault("fetched", {})
+    for group in groups:
+        fetched[group] = when or now_iso()
+
+
+def show_popularity(show: Dict, entry: Dict, staged: Dict[str, float]) -> Optional[float]:
+    """TMDB popularity from the last detail refresh, else the enriched staging item, else shows.json"""
+    return entry.get("popularity") or staged.get(show.get("id")) or show.get("popularity")
+
+
+def plan_refresh(
+    shows: List[Dict],
+    state: Dict,
+    budget: Optional[float],
+    media_types: Dict[str, str],
+    popularity: Optional[Dict[str, float]] = None
+) -> RefreshPlan:
+    """
+    budget is today's remaining request budget (None = unlimited).
+    media_types maps show id -> "tv"/"movie" where known from staging files,
+    popularity maps show id -> TMDB popularity from the enriched staging file
+    (seeds titles that no detail refresh has scored yet).
+    """
+    now = datetime.now(timezone.utc)
+    plan = RefreshPlan()
+
+    staged = popularity or {}
+    known = [
+        value for value in (show_popularity(show, state.get(show.get("id"), {}), staged) for show in shows)
+        if value
+    ]
+    default_popularity = statistics.median(known) if known else 1.0
+
+    detail_tasks: List[RefreshTask] = []
+    platform_only: List[RefreshTask] = []
+    for show in shows:
+        if not show.get("tmdbId"):
+            continue
+        entry = state.get(show["id"], {})
+        ratios = {group: overdue_ratio(group, show, entry, now) for group in FIELD_GROUPS}
+        stale = [group for group, ratio in ratios.items() if ratio >= 1]
+        if not stale:
+            plan.fresh += 1
+            continue
+
+        weight = math.log1p(show_popularity(show, entry, staged) or default_popularity) + 1
+        if show.get("featured"):
+            weight *= 2
+        task = RefreshTask(
+            show_id=show["id"],
+            title=show.get("title", ""),
+            tmdb_id=int(show["tmdbId"]),
+            media_type=entry.get("mediaType") or media_types.get(show["id"]),
+            groups=stale,
+            score=weight * sum(ratios[group] for group in stale),
+        )
+        (platform_only if stale == ["platforms"] else detail_tasks).append(task)
+
+    # Bulk platform refresh when it beats one detail call per title
+    bulk_calls = state.get("_meta", {}).get("bulkPlatformCalls", DEFAULT_BULK_PLATFORM_CALLS)
+    if platform_only and bulk_calls < sum(task.cost for task in platform_only) and (budget is None or bulk_calls <= budget):
+        plan.bulk_platforms = True
+        plan.bulk_platform_calls = bulk_calls
+        platform_only = []
+
+    # Greedy by value per call: most overdue, most popular titles first
+    remaining = None if budget is None else budget - plan.calls
+    for task in sorted(detail_tasks + platform_only, key=lambda task: -task.score / task.cost):
+        if remaining is not None and task.cost > remaining:
+            plan.deferred += 1
+            continue
+        plan.tasks.append(task)
+        if remaining is not None:
+            remaining -= task.cost
+
+    return plan
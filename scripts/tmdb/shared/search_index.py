@@ -0,0 +1,157 @@
+"""
+Trigram title search index (mirrored by src/utils/search.ts).
+
+Titles are keyed by normalize_title. Every distinct trigram maps to the
+sorted row numbers of the titles containing it, stored as delta-encoded
+lists. Titles shorter than a trigram are indexed under their whole key so
+that short queries can still be answered from the postings alone. Queries
+with no letters or digits left after normalizing ("!!!", CJK) fall back to
+a plain substring scan.
+
+fixtures/search_cases.json holds normalize/search cases that
+src/utils/search.ts is checked against too (npm run check:parity).
+"""
+import json
+import os
+from typing import Dict, List
+from .io_utils import normalize_title
+
+SEARCH_FIXTURE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "search_cases.json")
+
+GRAM_SIZE = 3
+FORMAT_VERSION = 1
+
+
+def title_grams(key: str, n: int = GRAM_SIZE) -> set:
+    if len(key) < n:
+        return {key} if key else set()
+    return {key[i:i + n] for i in range(len(key) - n + 1)}
+
+
+def title_matches(title: str, query: str) -> bool:
+    """Whether query matches title (the linear equivalent of search())"""
+    key = normalize_title(query)
+    if key:
+        return key in normalize_title(title)
+    return query.strip().lower() in (title or "").lower()
+
+
+def delta_encode(rows: List[int]) -> List[int]:
+    return [rows[0]] + [current - previous for previous, current in zip(rows, rows[1:])]
+
+
+def delta_decode(deltas: List[int]) -> List[int]:
+    rows = []
+    total = 0
+    for delta in deltas:
+        total += delta
+        rows.append(total)
+    return rows
+
+
+def build_search_index(titles: List[str]) -> Dict:
+    """Build the index over titles in row order"""
+    postings: Dict[str, List[int]] = {}
+    for row, title in enumerate(titles):
+        for gram in title_grams(normalize_title(title)):
+            postings.setdefault(gram, []).append(row)
+
+    return {
+        "v": FORMAT_VERSION,
+        "n": GRAM_SIZE,
+        "size": len(titles),
+        "grams": {gram: delta_encode(rows) for gram, rows in sorted(postings.items())},
+    }
+
+
+def _intersect(left: List[int], right: List[int]) -> List[int]:
+    result = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i] == right[j]:
+            result.append(left[i])
+            i += 1
+            j += 1
+        elif left[i] < right[j]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def search(index: Dict, titles: List[str], query: str) -> List[int]:
+    """
+    Rows whose normalized title contains the normalized query.
+
+    Long queries intersect their trigram postings (shortest first) and then
+    verify the survivors, so cost tracks the candidate set rather than the
+    catalog. Short queries union the postings of every gram containing them.
+    """
+    key = normalize_title(query)
+    if not key:
+        return [row for row, title in enumerate(titles) if title_matches(title, query)]
+
+    grams = index["grams"]
+    n = index["n"]
+
+    if len(key) < n:
+        rows = set()
+        for gram, deltas in grams.items():
+            if key in gram:
+                rows.update(delta_decode(deltas))
+        return sorted(rows)
+
+    query_grams = title_grams(key, n)
+    if any(gram not in grams for gram in query_grams):
+        return []
+
+    ordered = sorted(query_grams, key=lambda gram: len(grams[gram]))
+    candidates = delta_decode(grams[ordered[0]])
+    for gram in ordered[1:]:
+        if not candidates:
+            break
+        candidates = _intersect(candidates, delta_decode(grams[gram]))
+
+    if len(key) == n:
+        return candidates
+    # Trigrams can all be present without being contiguous
+    return [row for row in candidates if key in normalize_title(titles[row])]
+
+
+def verify_search(index: Dict, titles: List[str]) -> List[str]:
+    """Compare indexed lookups with a linear scan for substrings of every title"""
+    keys = [normalize_title(title) for title in titles]
+    queries = set()
+    for key in keys:
+        for length in (1, 2, 3, 5, 8):
+            queries.add(key[:length])
+            queries.add(key[-length:])
+
+    mismatches = []
+    for query in sorted(queries):
+        expected = [row for row, key in enumerate(keys) if query in key]
+        actual = search(index, titles, query)
+        if expected != actual:
+            mismatches.append(f"'{query}': index={len(actual)} scan={len(expected)}")
+    return mismatches
+
+
+def verify_search_fixture(path: str = SEARCH_FIXTURE_FILE) -> List[str]:
+    """normalize_title and search() against the shared parity cases"""
+    with open(path, "r", encoding="utf-8") as f:
+        fixture = json.load(f)
+    titles = fixture["titles"]
+    index = build_search_index(titles)
+
+    mismatches = []
+    if index != fixture["index"]:
+        mismatches.append("index: build_search_index(titles) differs from the fixture's index")
+    for case in fixture["normalize"]:
+        key = normalize_title(case["title"])
+        if key != case["key"]:
+            mismatches.append(f"normalize {case['title']!r}: {key!r} fixture={case['key']!r}")
+    for case in fixture["search"]:
+        rows = search(index, titles, case["query"])
+        if rows != case["rows"]:
+            mismatches.append(f"search {case['query']!r}: {rows} fixture={case['rows']}")
+    return mismatches
@@ -0,0 +1,241 @@
+"""
+Nearest-neighbour index over reviewed titles and synopses.
+
+Sequels, specials and the movie version of a series usually get the same
+verdict as a title that has already been reviewed. Each reviewed item is
+embedded as a hashed feature vector:
+
+- character trigrams of its franchise key (title minus subtitle and sequel number)
+- word unigrams and bigrams of its synopsis, minus stopwords
+
+Title and synopsis halves are L2-normalised separately and weighted, so the
+dot product of two rows is their cosine similarity (1 = identical). Hashing needs no
+vocabulary, so new reviews are appended without re-embedding the rest.
+Rows are stored feature-major (one contiguous row of scores per hashed
+dimension), so a lookup only reads the dimensions the query actually uses
+(~100 of 2048) instead of the whole matrix.
+
+The index persists to SIMILARITY_INDEX_FILE (rows + item keys) and is
+synced against 4_reviewed.json on load: new keys are embedded, removed keys
+dropped.
+"""
+import json
+import os
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .config import SIMILARITY_INDEX_FILE
+from .models import AIAssessment, EnrichedItem, ReviewedItem
+from .preclassifier import franchise_key, item_key
+
+TITLE_DIMS = 512
+SYNOPSIS_DIMS = 1536
+TITLE_WEIGHT = 0.6  # Share of the similarity carried by the title
+MIN_SIMILARITY = 0.65  # Below this the item goes to Gemini (tune with similarity_report.py)
+MATCH_CANDIDATES = 3  # Neighbours considered when the nearest one has no synopsis
+FORMAT_VERSION = 1
+SIMILARITY_FIXTURE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "similarity_cases.json")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have he her his in into is it its of on or
+she that the their them they this to was when where who will with while after before
+about all out up one two new when what which how they're he's she's
+""".split())
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def _bucket(feature: str, dims: int) -> Tuple[int, float]:
+    """Stable hash (unlike hash(), not salted per process) with a sign bit against collisions"""
+    digest = zlib.crc32(feature.encode("utf-8"))
+    return digest % dims, 1.0 if digest & 0x80000000 else -1.0
+
+
+def _hashed(features: List[str], dims: int) -> np.ndarray:
+    vector = np.zeros(dims, dtype=np.float32)
+    for feature in features:
+        index, sign = _bucket(feature, dims)
+        vector[index] += sign
+    # Sublinear term frequency, so a repeated word doesn't dominate
+    vector = np.sign(vector) * np.log1p(np.abs(vector))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def title_features(title: str) -> List[str]:
+    key = franchise_key(title)
+    if len(key) < 3:
+        return [key] if key else []
+    return [key[i:i + 3] for i in range(len(key) - 2)]
+
+
+def synopsis_features(synopsis: str) -> List[str]:
+    words = [word for word in WORD_PATTERN.findall((synopsis or "").lower()) if word not in STOPWORDS]
+    return words + [f"{left} {right}" for left, right in zip(words, words[1:])]
+
+
+def embed(title: str, synopsis: str) -> np.ndarray:
+    title_vector = _hashed(title_features(title), TITLE_DIMS)
+    synopsis_vector = _hashed(synopsis_features(synopsis), SYNOPSIS_DIMS)
+    # A missing half gives its weight to the other one, so the row stays unit length
+    title_weight = TITLE_WEIGHT if synopsis_vector.any() else 1.0
+    if not title_vector.any():
+        title_weight = 0.0
+    return np.concatenate([
+        title_vector * np.sqrt(title_weight),
+        synopsis_vector * np.sqrt(1.0 - title_weight),
+    ]).astype(np.float32)
+
+
+def assessment_from_review(item: ReviewedItem) -> AIAssessment:
+    """The reviewer's decision in AIAssessment form (tags map back to the content flags)"""
+    return AIAssessment(
+        rating=item.rating,
+        min_age=item.min_age,
+        max_age=item.max_age,
+        stimulation_level=item.stimulation_level,
+        has_lgbtq="LGBTQ+ Themes" in item.tags,
+        has_violence="Violence" in item.tags,
+        has_scary="Scary Imagery" in item.tags,
+        is_educational="Educational" in item.tags,
+        reasoning=item.reasoning,
+        safe_above_age=item.safe_above_age,
+        is_episodic_issue=item.is_episodic_issue,
+    )
+
+
+class SimilarityIndex:
+    def __init__(self, path: str = SIMILARITY_INDEX_FILE):
+        self.path = path
+        self.keys: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self._columns = np.zeros((TITLE_DIMS + SYNOPSIS_DIMS, 0), dtype=np.float32)  # dims x capacity
+        self.items: Dict[str, ReviewedItem] = {}
+
+    @classmethod
+    def load(cls, reviewed: List[ReviewedItem], path: str = SIMILARITY_INDEX_FILE) -> "SimilarityIndex":
+        """Persisted rows plus whatever changed in 4_reviewed.json since the last save"""
+        index = cls(path)
+        if os.path.exists(path):
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["version"]) == FORMAT_VERSION:
+                    index.keys = [str(key) for key in data["keys"]]
+                    index._columns = np.ascontiguousarray(data["matrix"].T, dtype=np.float32)
+                    index.rows = {key: row for row, key in enumerate(index.keys)}
+        index.sync(reviewed)
+        return index
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """One unit-length row per reviewed item"""
+        return self._columns[:, :len(self.keys)].T
+
+    def sync(self, reviewed: List[ReviewedItem]) -> int:
+        """Embed new reviewed items and drop removed ones; returns the number of changes"""
+        current = {item_key(item.enriched): item for item in reviewed}
+        self.items = current
+        removed = [key for key in self.keys if key not in current]
+        if removed:
+            keep = [row for row, key in enumerate(self.keys) if key in current]
+            self.keys = [self.keys[row] for row in keep]
+            self._columns = np.ascontiguousarray(self._columns[:, keep])
+            self.rows = {key: row for row, key in enumerate(self.keys)}
+        added = [item for key, item in current.items() if key not in self.rows]
+        for item in added:
+            self.add(item)
+        return len(removed) + len(added)
+
+    def add(self, item: ReviewedItem) -> None:
+        key = item_key(item.enriched)
+        vector = embed(item.enriched.title, item.enriched.synopsis)
+        self.items[key] = item
+        if key in self.rows:
+            self._columns[:, self.rows[key]] = vector
+            return
+        row = len(self.keys)
+        if row == self._columns.shape[1]:
+            # Grow geometrically so a full rebuild stays linear
+            grown = np.zeros((self._columns.shape[0], max(64, 2 * row)), dtype=np.float32)
+            grown[:, :row] = self._columns
+            self._columns = grown
+        self._columns[:, row] = vector
+        self.rows[key] = row
+        self.keys.append(key)
+
+    def nearest(self, enriched: EnrichedItem, limit: int = 3) -> List[Tuple[ReviewedItem, float]]:
+        """Most similar reviewed items, best first (the item itself is skipped)"""
+        if not self.keys:
+            return []
+        query = embed(enriched.title, enriched.synopsis)
+        dims = np.flatnonzero(query)
+        scores = query[dims] @ self._columns[dims, :len(self.keys)]
+        own_row = self.rows.get(item_key(enriched))
+        if own_row is not None:
+            scores[own_row] = -1.0
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(self.items[self.keys[row]], float(scores[row])) for row in top if scores[row] > 0]
+
+    def match(self, enriched: EnrichedItem, threshold: float = MIN_SIMILARITY) -> Optional[Tuple[AIAssessment, float]]:
+        """
+        The nearest reviewed item's decision, marked as derived, when it is
+        similar enough and both have a synopsis; None sends the item to Gemini.
+        """
+        # Without a synopsis on both sides the title carries all the weight, and
+        # any title of the same franchise would clear the threshold
+        if not synopsis_features(enriched.synopsis):
+            return None
+        neighbours = [
+            (source, score) for source, score in self.nearest(enriched, limit=MATCH_CANDIDATES)
+            if score >= threshold and synopsis_features(source.enriched.synopsis)
+        ]
+        if not neighbours:
+            return None
+        source, score = neighbours[0]
+        assessment = assessment_from_review(source)
+        assessment.source = "derived"
+        assessment.derived_from = item_key(source.enriched)
+        assessment.reasoning = (
+            f"Derived from the reviewed title \"{source.enriched.title}\" "
+            f"(similarity {score:.2f}). {source.reasoning}"
+        )
+        return assessment, score
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(tmp_path, version=FORMAT_VERSION, keys=np.array(self.keys, dtype=str), matrix=self.matrix)
+        os.replace(tmp_path, self.path)
+
+
+def verify_similarity_fixture(path: str = SIMILARITY_FIXTURE_FILE) -> List[str]:
+    """match() against the regression cases: which reviewed item (if any) each query derives from"""
+    with open(path, "r", encoding="utf-8") as f:
+        fixture = json.load(f)
+
+    def enriched(case: Dict) -> EnrichedItem:
+        return EnrichedItem(
+            tmdb_id=case.get("tmdb_id", 0), media_type=case.get("media_type", "tv"), title=case["title"],
+            synopsis=case.get("synopsis", ""), cover_image_url="", imdb_id=case.get("imdb_id"),
+            release_year=None, runtime=None, cast=[], genres=[], certification=None, platforms=[],
+            popularity=0.0, vote_average=0.0,
+        )
+
+    index = SimilarityIndex(path="")
+    index.sync([
+        ReviewedItem(
+            enriched=enriched(case), rating=case["rating"], tags=[], reasoning="", min_age=0, max_age=99,
+            stimulation_level="Medium", featured=False,
+        )
+        for case in fixture["reviewed"]
+    ])
+
+    mismatches = []
+    for case in fixture["cases"]:
+        result = index.match(enriched(case))
+        derived_from = result[0].derived_from if result else None
+        if derived_from != case["derived_from"]:
+            score = f" (similarity {result[1]:.2f})" if result else ""
+            mismatches.append(f"match {case['title']!r}: {derived_from}{score} fixture={case['derived_from']}")
+    return mismatches
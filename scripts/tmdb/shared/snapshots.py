@@ -0,0 +1,303 @@
+"""
+Deduplicated, compressed, content-addressed snapshots of shows.json.
+
+Replaces the full pretty-printed shows_backup_*.json copies. Layout under
+SNAPSHOT_DIR:
+
+    bases/<period>.json.zst         every record of the first snapshot in a period
+    bases/<period>.index.json.zst   order + per-show content hashes of that base
+    packs/<snapshot id>.json.zst    {hash: record} for records no earlier snapshot stored
+    pack_index.json                 hash -> pack holding it
+    manifests/<snapshot id>.json    base, changed {key: hash}, removed keys, order delta
+
+A snapshot stores only the shows whose content differs from its period's base,
+and of those only the records not already in a pack (content-addressed), so
+its size and write time follow what changed. A catalog identical to the
+latest snapshot is not stored twice. Restoring reads one base plus the packs
+its changed records live in; diff compares per-show hashes and only loads
+records that differ.
+
+zstd is used when the zstandard package is installed, gzip otherwise; files
+are read back by extension, so stores written either way stay readable.
+"""
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from .config import SNAPSHOT_DIR, SNAPSHOT_BASE_PERIOD
+
+try:
+    import zstandard
+except ImportError:  # Optional: falls back to gzip
+    zstandard = None
+
+ZSTD_LEVEL = 10
+EXTENSION = ".zst" if zstandard else ".gz"
+
+
+def _compress(data: bytes) -> bytes:
+    if zstandard:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _read_compressed(stem: str):
+    """JSON from stem.zst or stem.gz, whichever exists"""
+    for extension in (".zst", ".gz"):
+        path = stem + extension
+        if not os.path.exists(path):
+            continue
+        with open(path, "rb") as f:
+            raw = f.read()
+        if extension == ".zst":
+            if zstandard is None:
+                raise RuntimeError(f"{path} needs the zstandard package")
+            raw = zstandard.ZstdDecompressor().decompress(raw)
+        else:
+            raw = gzip.decompress(raw)
+        return json.loads(raw)
+    raise FileNotFoundError(stem)
+
+
+def _exists_compressed(stem: str) -> bool:
+    return os.path.exists(stem + ".zst") or os.path.exists(stem + ".gz")
+
+
+def content_hash(record: Dict) -> str:
+    """Key-order-independent hash of one show record"""
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:20]
+
+
+def keyed(shows: List[Dict]) -> List[Tuple[str, Dict]]:
+    """(key, record) in catalog order; key is the show id, made unique if ever repeated"""
+    seen: Dict[str, int] = {}
+    result = []
+    for show in shows:
+        key = str(show.get("id") or show.get("tmdbId") or "")
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] > 1:
+            key = f"{key}#{seen[key]}"
+        result.append((key, show))
+    return result
+
+
+class SnapshotStore:
+    def __init__(self, root: str = SNAPSHOT_DIR):
+        self.root = root
+        self.manifest_dir = os.path.join(root, "manifests")
+        self._indexes: Dict[str, Dict] = {}  # period -> {"order", "hashes"}
+        self._bases: Dict[str, Dict] = {}  # period -> records by key
+        self._packs: Dict[str, Dict] = {}  # pack id -> records by hash
+        self._pack_index: Optional[Dict[str, str]] = None
+
+    # --- Layout ---
+
+    def _base_stem(self, period: str) -> str:
+        return os.path.join(self.root, "bases", f"{period}.json")
+
+    def _index_stem(self, period: str) -> str:
+        return os.path.join(self.root, "bases", f"{period}.index.json")
+
+    def _pack_stem(self, pack_id: str) -> str:
+        return os.path.join(self.root, "packs", f"{pack_id}.json")
+
+    def _pack_index_path(self) -> str:
+        return os.path.join(self.root, "pack_index.json")
+
+    def pack_index(self) -> Dict[str, str]:
+        if self._pack_index is None:
+            path = self._pack_index_path()
+            self._pack_index = {}
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    self._pack_index = json.load(f)
+        return self._pack_index
+
+    def _object(self, digest: str) -> Dict:
+        pack_id = self.pack_index()[digest]
+        if pack_id not in self._packs:
+            self._packs[pack_id] = _read_compressed(self._pack_stem(pack_id))
+        return self._packs[pack_id][digest]
+
+    def _index(self, period: str) -> Dict:
+        if period not in self._indexes:
+            self._indexes[period] = _read_compressed(self._index_stem(period))
+        return self._indexes[period]
+
+    def _base(self, period: str) -> Dict[str, Dict]:
+        if period not in self._bases:
+            self._bases[period] = _read_compressed(self._base_stem(period))
+        return self._bases[period]
+
+    # --- Snapshots ---
+
+    def list(self) -> List[Dict]:
+        """Manifests, oldest first"""
+        if not os.path.isdir(self.manifest_dir):
+            return []
+        manifests = []
+        for name in sorted(os.listdir(self.manifest_dir)):
+            if name.endswith(".json"):
+                with open(os.path.join(self.manifest_dir, name), "r", encoding="utf-8") as f:
+                    manifests.append(json.load(f))
+        return manifests
+
+    def manifest(self, snapshot_id: str) -> Dict:
+        with open(os.path.join(self.manifest_dir, f"{snapshot_id}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def resolve(self, ref: str) -> str:
+        """Snapshot id from an id, a unique id prefix, "latest" or "latest~N" (N before latest)"""
+        ids = [manifest["id"] for manifest in self.list()]
+        if ref.startswith("latest"):
+            back = int(ref.split("~", 1)[1]) if "~" in ref else 0
+            if back >= len(ids):
+                raise ValueError(f"Only {len(ids)} snapshots")
+            return ids[-1 - back]
+        matches = [snapshot_id for snapshot_id in ids if snapshot_id.startswith(ref)]
+        if len(matches) != 1:
+            raise ValueError(f"'{ref}' matches {len(matches)} snapshots")
+        return matches[0]
+
+    def create(self, shows: List[Dict], label: str, created_at: Optional[datetime] = None) -> Tuple[str, bool]:
+        """
+        Snapshot shows. Returns (snapshot id, whether anything new was
+        stored); an unchanged catalog returns the latest snapshot's id.
+        """
+        created_at = created_at or datetime.now()
+        records = keyed(shows)
+        hashes = {key: content_hash(record) for key, record in records}
+        order = [key for key, _ in records]
+        catalog_hash = hashlib.sha256(json.dumps([hashes[key] for key in order]).encode("utf-8")).hexdigest()[:20]
+
+        existing = self.list()
+        if existing and existing[-1]["catalog_hash"] == catalog_hash:
+            return existing[-1]["id"], False
+
+        period = created_at.strftime(SNAPSHOT_BASE_PERIOD)
+        if not _exists_compressed(self._index_stem(period)):
+            # First snapshot of the period becomes its base
+            _write(self._base_stem(period) + EXTENSION, _compress(json.dumps(
+                {key: record for key, record in records}, ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")))
+            _write(self._index_stem(period) + EXTENSION, _compress(json.dumps(
+                {"order": order, "hashes": hashes}, separators=(",", ":")
+            ).encode("utf-8")))
+            self._indexes.pop(period, None)
+            self._bases.pop(period, None)
+
+        index = self._index(period)
+        base_hashes = index["hashes"]
+        changed = {key: digest for key, digest in hashes.items() if base_hashes.get(key) != digest}
+
+        snapshot_id = f"{created_at.strftime('%Y%m%d-%H%M%S')}-{label}".replace(" ", "_").replace("/", "_")
+        while os.path.exists(os.path.join(self.manifest_dir, f"{snapshot_id}.json")):
+            snapshot_id += "+"
+
+        by_key = dict(records)
+        pack_index = self.pack_index()
+        new_records = {digest: by_key[key] for key, digest in changed.items() if digest not in pack_index}
+        if new_records:
+            _write(self._pack_stem(snapshot_id) + EXTENSION, _compress(json.dumps(
+                new_records, ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")))
+            pack_index.update({digest: snapshot_id for digest in new_records})
+            _write(self._pack_index_path(), json.dumps(pack_index, separators=(",", ":")).encode("utf-8"))
+        manifest = {
+            "id": snapshot_id,
+            "label": label,
+            "created_at": created_at.isoformat(timespec="seconds"),
+            "base": period,
+            "count": len(order),
+            "catalog_hash": catalog_hash,
+            "changed": changed,
+            "removed": [key for key in base_hashes if key not in hashes],
+            "order": self._order_delta(index["order"], order),
+        }
+        _write(os.path.join(self.manifest_dir, f"{snapshot_id}.json"), json.dumps(manifest, indent=1).encode("utf-8"))
+        return snapshot_id, True
+
+    @staticmethod
+    def _order_delta(base_order: List[str], order: List[str]) -> Optional[Dict]:
+        """None when the order is the base's minus removals; appended keys or the full order otherwise"""
+        current = set(order)
+        kept = [key for key in base_order if key in current]
+        if order == kept:
+            return None
+        if order[:len(kept)] == kept:
+            return {"appended": order[len(kept):]}
+        return {"full": order}
+
+    def hashes(self, snapshot_id: str) -> Dict[str, str]:
+        """key -> content hash for every show in a snapshot, in catalog order"""
+        manifest = self.manifest(snapshot_id)
+        base_hashes = self._index(manifest["base"])["hashes"]
+        merged = {**base_hashes, **manifest["changed"]}
+        return {key: merged[key] for key in self._order(manifest)}
+
+    def _order(self, manifest: Dict) -> List[str]:
+        delta = manifest["order"] or {}
+        if "full" in delta:
+            return delta["full"]
+        removed = set(manifest["removed"])
+        return [key for key in self._index(manifest["base"])["order"] if key not in removed] + delta.get("appended", [])
+
+    def record(self, snapshot_id: str, key: str) -> Dict:
+        manifest = self.manifest(snapshot_id)
+        if key in manifest["changed"]:
+            return self._object(manifest["changed"][key])
+        return self._base(manifest["base"])[key]
+
+    def restore(self, snapshot_id: str) -> List[Dict]:
+        """The catalog as it was at snapshot_id"""
+        manifest = self.manifest(snapshot_id)
+        base = self._base(manifest["base"])
+        shows = []
+        for key in self._order(manifest):
+            if key in manifest["changed"]:
+                shows.append(self._object(manifest["changed"][key]))
+            else:
+                shows.append(base[key])
+        return shows
+
+    def diff(self, old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[str]]:
+        """Keys added, removed and changed between two key -> hash maps (see hashes())"""
+        return {
+            "added": [key for key in new if key not in old],
+            "removed": [key for key in old if key not in new],
+            "changed": [key for key in new if key in old and old[key] != new[key]],
+        }
+
+    def size(self) -> int:
+        total = 0
+        for directory, _, files in os.walk(self.root):
+            total += sum(os.path.getsize(os.path.join(directory, name)) for name in files)
+        return total
+
+
+def changed_fields(old: Dict, new: Dict) -> List[str]:
+    return sorted(field for field in set(old) | set(new) if old.get(field) != new.get(field))
+
+
+def snapshot_catalog(shows: List[Dict], label: str) -> Optional[str]:
+    """Best-effort snapshot before a writer replaces shows.json; returns the id, or None on failure"""
+    if not shows:
+        return None
+    try:
+        snapshot_id, _ = SnapshotStore().create(shows, label)
+        return snapshot_id
+    except (OSError, ValueError, RuntimeError) as e:
+        # Disk errors, unreadable JSON in the store, or zstd files without zstandard installed
+        print(f"Catalog snapshot failed ({e}); continuing without one")
+        return None
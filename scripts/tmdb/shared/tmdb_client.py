@@ -1,6 +1,6 @@
-import requests
 import time
 from typing import List, Dict, Optional
+from .http_transport import get_transport
 
 class TMDBClient:
     """Wrapper for TMDB API v3"""
@@ -9,7 +9,7 @@ class TMDBClient:
         self.api_key = api_key
         self.base_url = base_url
         self.image_base = image_base
-        self.session = requests.Session()
+        self.session = get_transport()  # Pooled keep-alive connections shared with GeminiClient
         self.last_request_time = 0
         self.min_request_interval = 0.25  # 250ms = ~4 req/sec
 
@@ -75,6 +75,11 @@ class TMDBClient:
         })
         return details
 
+    def get_watch_providers(self, media_type: str, region: str = "US") -> List[Dict]:
+        """List streaming providers available in a region (media_type: "tv" or "movie")"""
+        data = self._request(f'/watch/providers/{media_type}', {'watch_region': region})
+        return data.get('results', [])
+
     def get_image_url(self, path: Optional[str], size: str = "w500") -> str:
         """Convert image path to full URL"""
         if not path:
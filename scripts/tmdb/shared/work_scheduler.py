@@ -0,0 +1,43 @@
+"""
+Priority ordering for pending stage 2/3 work.
+
+Daily API budgets (see budget_ledger.py) cap how much each run can do, so
+the most valuable titles go first: popular, well rated, recent, and
+legacy catalog entries waiting for a TMDB upgrade.
+"""
+import math
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, TypeVar
+
+LEGACY_UPGRADE_BONUS = 5.0  # Existing catalog entries without TMDB metadata
+RECENCY_YEARS = 20  # Recency bonus fades to zero over this many years
+
+T = TypeVar("T")
+
+
+def priority_score(
+    popularity: Optional[float],
+    vote_average: Optional[float],
+    release: Optional[str],
+    is_legacy_upgrade: bool
+) -> float:
+    """
+    Higher is more valuable. release is a date or year range ("2018-03-01",
+    "2018–Present"); only the first year is used.
+    """
+    score = math.log1p(max(0.0, popularity or 0.0))  # TMDB popularity is long-tailed
+    score += (vote_average or 0.0) / 2  # 0-5
+
+    year = (release or "")[:4]
+    if year.isdigit():
+        age_years = datetime.now(timezone.utc).year - int(year)
+        score += 2 * max(0.0, 1 - age_years / RECENCY_YEARS)
+
+    if is_legacy_upgrade:
+        score += LEGACY_UPGRADE_BONUS
+    return score
+
+
+def order_by_priority(items: List[T], score: Callable[[T], float]) -> List[T]:
+    """Highest score first; ties keep file order so runs are deterministic"""
+    return [item for _, item in sorted(enumerate(items), key=lambda pair: (-score(pair[1]), pair[0]))]
@@ -0,0 +1,123 @@
+"""
+Agreement report and latency benchmark for the similarity index
+(shared/similarity_index.py).
+
+Looks up every reviewed item in 4_reviewed.json against all the others and
+compares the nearest neighbour's decision with the item's own review, per
+similarity threshold. "Less strict" counts neighbours whose rating is
+milder than the reviewer's (Safe for a Caution title, etc.); keep it at
+zero for the threshold used by 3_assess.py.
+
+    python similarity_report.py
+    python similarity_report.py --bench   # lookup latency with shows.json-sized index
+    python similarity_report.py --check   # match() against fixtures/similarity_cases.json
+"""
+import sys
+import time
+from rich.console import Console
+from rich.table import Table
+from shared.config import REVIEWED_FILE, SHOWS_FILE
+from shared.io_utils import load_json
+from shared.models import EnrichedItem, ReviewedItem
+from shared.similarity_index import MIN_SIMILARITY, SimilarityIndex, verify_similarity_fixture
+
+console = Console()
+
+THRESHOLDS = (0.5, 0.6, 0.65, 0.7, 0.8)
+STRICTNESS = {"Safe": 0, "Caution": 1, "Unsafe": 2}
+BENCH_LOOKUPS = 500
+
+
+def show_as_reviewed(show: dict) -> ReviewedItem:
+    """Catalog entries stand in for reviewed items in the benchmark"""
+    enriched = EnrichedItem(
+        tmdb_id=int(show.get("tmdbId") or 0), media_type="", title=show.get("title", ""),
+        synopsis=show.get("synopsis", ""), cover_image_url="", imdb_id=show.get("id"),
+        release_year=show.get("releaseYear"), runtime=show.get("runtime"), cast=[], genres=[],
+        certification=None, platforms=[], popularity=0.0, vote_average=0.0,
+    )
+    return ReviewedItem(
+        enriched=enriched, rating=show.get("rating", "Caution"), tags=show.get("tags", []),
+        reasoning=show.get("reasoning", ""), min_age=show.get("minAge", 0), max_age=show.get("maxAge", 99),
+        stimulation_level=show.get("stimulationLevel", "Medium"), featured=False,
+    )
+
+
+def bench():
+    shows = load_json(SHOWS_FILE) or []
+    reviewed = [show_as_reviewed(show) for show in shows]
+    index = SimilarityIndex(path="")
+
+    started = time.perf_counter()
+    index.sync(reviewed)
+    build_seconds = time.perf_counter() - started
+
+    queries = [item.enriched for item in reviewed[:BENCH_LOOKUPS]]
+    started = time.perf_counter()
+    for enriched in queries:
+        index.match(enriched)
+    per_lookup = (time.perf_counter() - started) / len(queries)
+
+    console.print(f"Indexed {len(reviewed)} titles in {build_seconds * 1000:.0f} ms "
+                  f"({index.matrix.nbytes / 1024 / 1024:.1f} MB)")
+    console.print(f"[bold]Lookup: {per_lookup * 1000:.3f} ms[/] average over {len(queries)} titles")
+
+
+def main():
+    if "--bench" in sys.argv:
+        console.rule("[bold blue]Similarity Index Benchmark[/]")
+        bench()
+        return
+
+    if "--check" in sys.argv:
+        console.rule("[bold blue]Similarity Regression Cases[/]")
+        mismatches = verify_similarity_fixture()
+        if mismatches:
+            console.print(f"[red]{len(mismatches)} similarity mismatches:[/]")
+            for line in mismatches:
+                console.print(f"  - {line}")
+            sys.exit(1)
+        console.print("[green]match() agrees with fixtures/similarity_cases.json[/]")
+        return
+
+    console.rule("[bold blue]Similarity Reuse Agreement[/]")
+    reviewed = [ReviewedItem.from_dict(item) for item in load_json(REVIEWED_FILE) or []]
+    if not reviewed:
+        console.print("[red]No reviewed items found. Run stage 4 first.[/]")
+        return
+
+    index = SimilarityIndex(path="")
+    index.sync(reviewed)
+    matches = []  # (item, neighbour, score)
+    for item in reviewed:
+        neighbours = index.nearest(item.enriched, limit=1)
+        if neighbours:
+            matches.append((item, *neighbours[0]))
+
+    table = Table(title=f"{len(reviewed)} reviewed items")
+    for column in ("Threshold", "Reused", "Coverage", "Same rating", "Less strict"):
+        table.add_column(column, justify="right")
+    for level in sorted(set(THRESHOLDS) | {MIN_SIMILARITY}):
+        reused = [(item, neighbour) for item, neighbour, score in matches if score >= level]
+        same = sum(1 for item, neighbour in reused if neighbour.rating == item.rating)
+        milder = sum(1 for item, neighbour in reused if STRICTNESS[neighbour.rating] < STRICTNESS[item.rating])
+        table.add_row(
+            f"{level:.2f}{' *' if level == MIN_SIMILARITY else ''}",
+            str(len(reused)),
+            f"{len(reused) / len(reviewed):.0%}",
+            f"{same / len(reused):.0%}" if reused else "-",
+            f"[red]{milder}[/]" if milder else "0",
+        )
+    console.print(table)
+    console.print("[dim]* current MIN_SIMILARITY[/]")
+
+    for item, neighbour, score in sorted(matches, key=lambda match: -match[2]):
+        if score < MIN_SIMILARITY:
+            break
+        marker = "[green]✓[/]" if neighbour.rating == item.rating else "[red]✗[/]"
+        console.print(f"{marker} {score:.2f} {item.enriched.title} [dim]← {neighbour.enriched.title} "
+                      f"({neighbour.rating})[/]")
+
+
+if __name__ == "__main__":
+    main()
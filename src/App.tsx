@@ -1,6 +1,7 @@
-import { useState, useMemo } from "react";
+import { useState, useMemo, useEffect } from "react";
 import { Show, StimulationLevel } from "./types";
-import { mockShows } from "./data/mockShows";
+import { loadCatalog, loadSearchIndex } from "./data/catalog";
+import { SearchIndex } from "./utils/search";
 import { filterShows } from "./utils/filter";
 import { ShowCard } from "./components/ShowCard";
 import { AgeFilter, AGE_BUCKETS, AgeBucket } from "./components/AgeFilter";
@@ -19,16 +20,35 @@ function App() {
   const [selectedStimulation, setSelectedStimulation] =
     useState<StimulationFilterValue>("All");
   const [selectedShow, setSelectedShow] = useState<Show | null>(null);
+  const [catalog, setCatalog] = useState<Show[]>([]);
+  const [isLoading, setIsLoading] = useState(true);
+  const [searchIndex, setSearchIndex] = useState<SearchIndex | null>(null);
+
+  useEffect(() => {
+    loadCatalog()
+      .then(setCatalog)
+      .finally(() => setIsLoading(false));
+  }, []);
+
+  // The title index is only needed once the user starts typing
+  useEffect(() => {
+    if (searchTerm && !isLoading && !searchIndex) {
+      loadSearchIndex().then((index) => {
+        if (index) setSearchIndex(index);
+      });
+    }
+  }, [searchTerm, isLoading, searchIndex]);
+
   const homePicks = useMemo(() => {
-    const base = filterShows(mockShows, "").filter(
+    const base = filterShows(catalog, "").filter(
       (show) => show.rating === "Safe",
     );
     const shuffled = [...base].sort(() => Math.random() - 0.5);
     return shuffled.slice(0, 6);
-  }, []);
+  }, [catalog]);
 
   const filteredShows = useMemo(() => {
-    let shows = filterShows(mockShows, searchTerm);
+    let shows = filterShows(catalog, searchTerm, undefined, searchIndex);
     const isHomepage =
       !searchTerm &&
       selectedBucket.label === "All Ages" &&
@@ -54,7 +74,14 @@ function App() {
     }
 
     return shows;
-  }, [searchTerm, selectedBucket, selectedStimulation, homePicks]);
+  }, [
+    catalog,
+    searchTerm,
+    searchIndex,
+    selectedBucket,
+    selectedStimulation,
+    homePicks,
+  ]);
 
   return (
     <div className="app-container">
@@ -109,7 +136,11 @@ function App() {
           />
 
           <div className="shows-grid">
-            {filteredShows.length > 0 ? (
+            {isLoading ? (
+              <div className="no-results">
+                <h3>Loading shows...</h3>
+              </div>
+            ) : filteredShows.length > 0 ? (
               filteredShows.map((show) => (
                 <ShowCard
                   key={show.id}
@@ -1,5 +1,6 @@
-import React from "react";
+import React, { useMemo, useState } from "react";
 import { Show } from "../types";
+import { blurhashToDataUrl } from "../utils/blurhash";
 import { formatAgeRange } from "../utils/format";
 import styles from "./ShowCard.module.css";
 
@@ -21,16 +22,33 @@ export const ShowCard: React.FC<ShowCardProps> = ({ show, onClick }) => {
   }
 
   const ageString = formatAgeRange(show.minAge, show.maxAge);
+  const [imageLoaded, setImageLoaded] = useState(false);
+  const placeholder = useMemo(
+    () => (show.coverBlurhash ? blurhashToDataUrl(show.coverBlurhash) : undefined),
+    [show.coverBlurhash],
+  );
 
   return (
     <div className={`${styles.card} ${cardStyle}`} onClick={onClick}>
-      <div className={styles.imageContainer}>
-        <img
-          src={show.coverImage}
-          alt={show.title}
-          className={styles.image}
-          loading="lazy"
-        />
+      <div
+        className={styles.imageContainer}
+        style={show.coverColor ? { backgroundColor: show.coverColor } : undefined}
+      >
+        {placeholder && !imageLoaded && (
+          <img src={placeholder} alt="" className={styles.placeholder} />
+        )}
+        <picture>
+          {show.coverImageAvif && (
+            <source srcSet={show.coverImageAvif} type="image/avif" />
+          )}
+          <img
+            src={show.coverImage}
+            alt={show.title}
+            className={styles.image}
+            loading="lazy"
+            onLoad={() => setImageLoaded(true)}
+          />
+        </picture>
         <div className={styles.ratingBadge}>{badgeText}</div>
       </div>
       <div className={styles.content}>
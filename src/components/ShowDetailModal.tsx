@@ -1,8 +1,17 @@
-import React, { useEffect } from "react";
-import { Show } from "../types";
+import React, { useEffect, useState } from "react";
+import { Show, ShowDetail } from "../types";
 import { formatAgeRange } from "../utils/format";
+import { classifyShow } from "../utils/filter";
+import { loadShowDetail } from "../data/catalog";
 import styles from "./ShowDetailModal.module.css";
 import { platformLogos, platformAliases } from "../constants/platforms";
+import providerSprite from "../constants/providerSprite.json";
+
+// Logos render at 32px from the 64px sprite cells (2x for retina)
+const LOGO_DISPLAY_SIZE = 32;
+const spriteScale = LOGO_DISPLAY_SIZE / providerSprite.size;
+const spriteIcons: Record<string, { x: number; y: number }> =
+  providerSprite.icons;
 
 interface ShowDetailModalProps {
   show: Show | null;
@@ -10,9 +19,28 @@ interface ShowDetailModalProps {
 }
 
 export const ShowDetailModal: React.FC<ShowDetailModalProps> = ({
-  show,
+  show: listShow,
   onClose,
 }) => {
+  const [detail, setDetail] = useState<{
+    id: string;
+    data: ShowDetail;
+  } | null>(null);
+
+  // Long text fields live in lazily loaded detail chunks
+  useEffect(() => {
+    if (!listShow) return;
+    let cancelled = false;
+    loadShowDetail(listShow.id)
+      .then((data) => {
+        if (!cancelled && data) setDetail({ id: listShow.id, data });
+      })
+      .catch(() => undefined);
+    return () => {
+      cancelled = true;
+    };
+  }, [listShow]);
+
   // Close on Escape key
   useEffect(() => {
     const handleEsc = (e: KeyboardEvent) => {
@@ -22,7 +50,13 @@ export const ShowDetailModal: React.FC<ShowDetailModalProps> = ({
     return () => window.removeEventListener("keydown", handleEsc);
   }, [onClose]);
 
-  if (!show) return null;
+  if (!listShow) return null;
+
+  // Re-apply the policy so reasoning overrides cover the loaded detail text
+  const show =
+    detail && detail.id === listShow.id
+      ? classifyShow({ ...listShow, ...detail.data })
+      : listShow;
 
   const stimLevel = show.stimulationLevel || "Medium"; // Default
 
@@ -42,7 +76,17 @@ export const ShowDetailModal: React.FC<ShowDetailModalProps> = ({
   const resolvePlatform = (platform: string) => {
     const normalized = normalizePlatform(platform);
     const alias = platformAliases[normalized] || normalized.replace(/\s+/g, "");
-    return platformLogos[alias];
+    return platformLogos[alias] && { slug: alias, ...platformLogos[alias] };
+  };
+
+  const spriteStyle = (slug: string): React.CSSProperties | undefined => {
+    const icon = spriteIcons[slug];
+    if (!icon) return undefined;
+    return {
+      backgroundImage: `url(${providerSprite.url})`,
+      backgroundSize: `${providerSprite.width * spriteScale}px ${providerSprite.height * spriteScale}px`,
+      backgroundPosition: `-${icon.x * spriteScale}px -${icon.y * spriteScale}px`,
+    };
   };
 
   const platforms =
@@ -59,11 +103,16 @@ export const ShowDetailModal: React.FC<ShowDetailModalProps> = ({
 
         <div className={styles.header}>
           <div className={styles.imageContainer}>
-            <img
-              src={show.coverImage}
-              alt={show.title}
-              className={styles.coverImage}
-            />
+            <picture>
+              {show.coverImageLargeAvif && (
+                <source srcSet={show.coverImageLargeAvif} type="image/avif" />
+              )}
+              <img
+                src={show.coverImageLarge ?? show.coverImage}
+                alt={show.title}
+                className={styles.coverImage}
+              />
+            </picture>
           </div>
 
           <div className={styles.headerInfo}>
@@ -120,6 +169,7 @@ export const ShowDetailModal: React.FC<ShowDetailModalProps> = ({
                       return null;
                     }
 
+                    const sprite = spriteStyle(meta.slug);
                     return (
                       <span
                         key={`${platform}-${meta.name}`}
@@ -127,12 +177,21 @@ export const ShowDetailModal: React.FC<ShowDetailModalProps> = ({
                         title={meta.name} // Added tooltip
                         aria-label={`${meta.name} logo`}
                       >
-                        <img
-                          className={styles.platformLogo}
-                          src={meta.file}
-                          alt={`${meta.name} logo`}
-                          loading="lazy"
-                        />
+                        {sprite ? (
+                          <span
+                            className={styles.platformSprite}
+                            style={sprite}
+                            role="img"
+                            aria-label={`${meta.name} logo`}
+                          />
+                        ) : (
+                          <img
+                            className={styles.platformLogo}
+                            src={meta.file}
+                            alt={`${meta.name} logo`}
+                            loading="lazy"
+                          />
+                        )}
                       </span>
                     );
                   })}
@@ -0,0 +1,130 @@
+import { ContentTag, Show, ShowDetail, StimulationLevel } from "../types";
+import { lookupRating } from "../utils/filter";
+import { SearchIndex } from "../utils/search";
+
+// Generated by scripts/tmdb/7_export.py (see shared/catalog_export.py)
+const CATALOG_BASE = "/data/catalog";
+
+interface ListRow {
+  i: string; // id
+  t: string; // title
+  c?: string; // cover path relative to coverPrefix
+  C?: string; // absolute cover URL
+  x?: 1; // cover has an AVIF sibling (same path, .avif instead of .webp)
+  h?: string; // cover BlurHash
+  o?: string; // dominant cover colour (hex, no "#")
+  k: string; // rating table codes (see RatingTable)
+  a: number; // minAge
+  b: number; // maxAge
+  g?: number[]; // indexes into tags
+  p?: number[]; // indexes into platforms
+  s?: number; // index into stimulationLevels
+  u?: number; // safeAboveAge
+  e?: 1; // isEpisodicIssue
+  f?: 1; // featured
+}
+
+interface ListPayload {
+  v: number;
+  buckets: number;
+  coverPrefix: string;
+  stimulationLevels: StimulationLevel[];
+  ageBreakpoints: number[];
+  platforms: string[];
+  tags: ContentTag[];
+  items: ListRow[];
+}
+
+let bucketCount = 0;
+// True when we fell back to the bundled shows.json (details already present)
+let hasFullRecords = false;
+const detailChunks = new Map<number, Promise<Record<string, ShowDetail>>>();
+
+// FNV-1a, mirrored by detail_bucket in scripts/tmdb/shared/catalog_export.py
+export const detailBucket = (id: string, buckets: number): number => {
+  let hash = 0x811c9dc5;
+  for (const byte of new TextEncoder().encode(id)) {
+    hash ^= byte;
+    hash = Math.imul(hash, 0x01000193) >>> 0;
+  }
+  return hash % buckets;
+};
+
+const decodeRow = (row: ListRow, payload: ListPayload): Show => {
+  const ratingTable = { breakpoints: payload.ageBreakpoints, codes: row.k };
+  const coverImage = row.C ?? (row.c ? payload.coverPrefix + row.c : "");
+  return {
+    id: row.i,
+    title: row.t,
+    coverImage,
+    coverImageAvif: row.x ? coverImage.replace(/\.webp$/, ".avif") : undefined,
+    coverBlurhash: row.h,
+    coverColor: row.o ? `#${row.o}` : undefined,
+    // Already classified (no viewer age), so classifyShow rarely has to copy
+    rating: lookupRating(ratingTable),
+    minAge: row.a,
+    maxAge: row.b,
+    tags: (row.g ?? []).map((index) => payload.tags[index]),
+    platforms: (row.p ?? []).map((index) => payload.platforms[index]),
+    stimulationLevel:
+      row.s !== undefined ? payload.stimulationLevels[row.s] : undefined,
+    safeAboveAge: row.u,
+    isEpisodicIssue: row.e === 1,
+    featured: row.f === 1,
+    ratingTable,
+    // Filled in by loadShowDetail when the modal opens
+    synopsis: "",
+    cast: [],
+    reasoning: "",
+    ageRecommendation: "",
+  };
+};
+
+export const loadCatalog = async (): Promise<Show[]> => {
+  try {
+    const response = await fetch(`${CATALOG_BASE}/list.json`);
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    const payload: ListPayload = await response.json();
+    bucketCount = payload.buckets;
+    return payload.items.map((row) => decodeRow(row, payload));
+  } catch {
+    // Export hasn't been run (e.g. fresh dev checkout) - use the full catalog
+    const { default: showsData } = await import("./shows.json");
+    hasFullRecords = true;
+    return showsData as unknown as Show[];
+  }
+};
+
+export const loadShowDetail = async (
+  id: string,
+): Promise<ShowDetail | null> => {
+  if (hasFullRecords || bucketCount === 0) return null;
+
+  const bucket = detailBucket(id, bucketCount);
+  let chunk = detailChunks.get(bucket);
+  if (!chunk) {
+    chunk = fetch(`${CATALOG_BASE}/detail/${bucket}.json`).then((response) => {
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      return response.json();
+    });
+    detailChunks.set(bucket, chunk);
+    // Allow a retry if the request failed
+    chunk.catch(() => detailChunks.delete(bucket));
+  }
+
+  return (await chunk)[id] ?? null;
+};
+
+let searchIndex: Promise<SearchIndex | null> | null = null;
+
+// Fetched on the first search; null means "scan titles instead"
+export const loadSearchIndex = (): Promise<SearchIndex | null> => {
+  if (!searchIndex) {
+    searchIndex = hasFullRecords
+      ? Promise.resolve(null)
+      : fetch(`${CATALOG_BASE}/search.json`)
+          .then((response) => (response.ok ? response.json() : null))
+          .catch(() => null);
+  }
+  return searchIndex;
+};
@@ -16,7 +16,13 @@ export interface Show {
   tmdbId?: string; // NEW: TMDB ID for future updates
   title: string;
   synopsis: string;
-  coverImage: string; // URL mock
+  coverImage: string; // Card-sized cover (local mirror or remote URL)
+  coverImageLarge?: string; // Modal-sized cover from mirror_covers.py
+  coverImageAvif?: string; // AVIF of coverImage (mirror_covers.py --avif)
+  coverImageLargeAvif?: string; // AVIF of coverImageLarge
+  coverSource?: string; // Original remote cover URL
+  coverBlurhash?: string; // Placeholder painted until the cover loads
+  coverColor?: string; // Dominant cover colour (#rrggbb)
   cast: string[];
   tags: ContentTag[];
   platforms?: string[]; // NEW: Streaming platforms
@@ -31,4 +37,29 @@ export interface Show {
   releaseYear?: string; // "2018" or "2018–Present"
   runtime?: string; // "7 min" or "22 min"
   stimulationLevel?: StimulationLevel;
+  ratingTable?: RatingTable; // Precomputed by the export stage (see filter.ts)
 }
+
+// Effective rating per viewer-age column, one code ("S" | "C" | "U") each.
+// Column 0 covers "no age" and ages below breakpoints[0]; a single code
+// means the rating doesn't depend on age.
+export interface RatingTable {
+  breakpoints: number[];
+  codes: string;
+}
+
+// Long text fields loaded on demand by the detail modal
+export type ShowDetail = Partial<
+  Pick<
+    Show,
+    | "synopsis"
+    | "cast"
+    | "reasoning"
+    | "releaseYear"
+    | "runtime"
+    | "ageRecommendation"
+    | "tmdbId"
+    | "coverImageLarge"
+    | "coverImageLargeAvif"
+  >
+>;
@@ -0,0 +1,98 @@
+// BlurHash decoder (woltapp/blurhash), encoded by scripts/tmdb/shared/placeholders.py
+const BASE83 =
+  "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~";
+const PLACEHOLDER_SIZE = 32;
+
+const decode83 = (value: string): number => {
+  let result = 0;
+  for (const char of value) result = result * 83 + BASE83.indexOf(char);
+  return result;
+};
+
+const srgbToLinear = (value: number): number => {
+  const v = value / 255;
+  return v <= 0.04045 ? v / 12.92 : Math.pow((v + 0.055) / 1.055, 2.4);
+};
+
+const linearToSrgb = (value: number): number => {
+  const v = Math.max(0, Math.min(1, value));
+  return v <= 0.0031308
+    ? Math.round(v * 12.92 * 255)
+    : Math.round((1.055 * Math.pow(v, 1 / 2.4) - 0.055) * 255);
+};
+
+const signPow = (value: number, exponent: number): number =>
+  Math.sign(value) * Math.pow(Math.abs(value), exponent);
+
+export const decodeBlurhash = (
+  hash: string,
+  width: number,
+  height: number,
+): Uint8ClampedArray => {
+  const sizeFlag = decode83(hash[0]);
+  const componentsX = (sizeFlag % 9) + 1;
+  const componentsY = Math.floor(sizeFlag / 9) + 1;
+  const maximum = (decode83(hash[1]) + 1) / 166;
+
+  const colors: [number, number, number][] = [];
+  const dc = decode83(hash.slice(2, 6));
+  colors.push([
+    srgbToLinear(dc >> 16),
+    srgbToLinear((dc >> 8) & 255),
+    srgbToLinear(dc & 255),
+  ]);
+  for (let i = 1; i < componentsX * componentsY; i++) {
+    const ac = decode83(hash.slice(4 + i * 2, 6 + i * 2));
+    colors.push([
+      signPow((Math.floor(ac / 361) - 9) / 9, 2) * maximum,
+      signPow(((Math.floor(ac / 19) % 19) - 9) / 9, 2) * maximum,
+      signPow(((ac % 19) - 9) / 9, 2) * maximum,
+    ]);
+  }
+
+  const pixels = new Uint8ClampedArray(width * height * 4);
+  for (let y = 0; y < height; y++) {
+    for (let x = 0; x < width; x++) {
+      let r = 0;
+      let g = 0;
+      let b = 0;
+      for (let j = 0; j < componentsY; j++) {
+        const basisY = Math.cos((Math.PI * y * j) / height);
+        for (let i = 0; i < componentsX; i++) {
+          const basis = Math.cos((Math.PI * x * i) / width) * basisY;
+          const color = colors[i + j * componentsX];
+          r += color[0] * basis;
+          g += color[1] * basis;
+          b += color[2] * basis;
+        }
+      }
+      const offset = 4 * (x + y * width);
+      pixels[offset] = linearToSrgb(r);
+      pixels[offset + 1] = linearToSrgb(g);
+      pixels[offset + 2] = linearToSrgb(b);
+      pixels[offset + 3] = 255;
+    }
+  }
+  return pixels;
+};
+
+const dataUrls = new Map<string, string>();
+
+// Tiny PNG data URL for a hash; the browser scales it up smoothly as a blur
+export const blurhashToDataUrl = (hash: string): string | undefined => {
+  const cached = dataUrls.get(hash);
+  if (cached) return cached;
+
+  const canvas = document.createElement("canvas");
+  canvas.width = PLACEHOLDER_SIZE;
+  canvas.height = PLACEHOLDER_SIZE;
+  const context = canvas.getContext("2d");
+  if (!context) return undefined;
+
+  const image = context.createImageData(PLACEHOLDER_SIZE, PLACEHOLDER_SIZE);
+  image.data.set(decodeBlurhash(hash, PLACEHOLDER_SIZE, PLACEHOLDER_SIZE));
+  context.putImageData(image, 0, 0);
+  const url = canvas.toDataURL();
+  dataUrls.set(hash, url);
+  return url;
+};
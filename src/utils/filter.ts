@@ -1,6 +1,54 @@
-import { Show } from "../types";
+import { RatingTable, SafetyRating, Show } from "../types";
+import { SearchIndex, searchTitles, titleMatches } from "./search";
+
+const RATING_CODES: Record<string, SafetyRating> = {
+  S: "Safe",
+  C: "Caution",
+  U: "Unsafe",
+};
+
+// Mirrors lookup_rating in scripts/tmdb/shared/classification.py
+export const lookupRating = (
+  table: RatingTable,
+  viewerAge?: number,
+): SafetyRating => {
+  const { breakpoints, codes } = table;
+  if (codes.length === 1 || viewerAge === undefined) {
+    return RATING_CODES[codes[0]];
+  }
+
+  // Column = number of breakpoints <= viewerAge
+  let low = 0;
+  let high = breakpoints.length;
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (breakpoints[mid] <= viewerAge) low = mid + 1;
+    else high = mid;
+  }
+  return RATING_CODES[codes[low]];
+};
+
+// Reasoning half of the policy below, for shows with a precomputed table
+const policyReasoning = (show: Show): string => {
+  if (!show.tags.includes("LGBTQ+ Themes")) return show.reasoning;
+  if (show.isEpisodicIssue) {
+    return (
+      show.reasoning + " (Note: Contains isolated episodes with LGBTQ+ themes)"
+    );
+  }
+  return "Contains themes that do not align with family-friendly values.";
+};
 
 export const classifyShow = (show: Show, viewerAge?: number): Show => {
+  // Fast path: the export stage already applied the policy per age column
+  if (show.ratingTable) {
+    const rating = lookupRating(show.ratingTable, viewerAge);
+    // Reasoning ships with the detail chunk; only rewrite it once loaded
+    const reasoning = show.reasoning ? policyReasoning(show) : show.reasoning;
+    if (rating === show.rating && reasoning === show.reasoning) return show;
+    return { ...show, rating, reasoning };
+  }
+
   const newShow = { ...show };
 
   // STRICT POLICY ENFORCEMENT - LGBTQ+ always Unsafe (per user requirement)
@@ -40,14 +88,20 @@ export const filterShows = (
   shows: Show[],
   searchTerm: string,
   viewerAge?: number,
+  searchIndex?: SearchIndex | null,
 ): Show[] => {
+  // Indexed search: only the matching rows get classified
+  if (searchTerm && searchIndex && searchIndex.size === shows.length) {
+    return searchTitles(searchIndex, (row) => shows[row].title, searchTerm).map(
+      (row) => classifyShow(shows[row], viewerAge),
+    );
+  }
+
   // 1. Classify all shows (Applying the policy with age context)
   const classifiedShows = shows.map((show) => classifyShow(show, viewerAge));
 
   // 2. Filter by search term
   if (!searchTerm) return classifiedShows;
 
-  return classifiedShows.filter((s) =>
-    s.title.toLowerCase().includes(searchTerm.toLowerCase()),
-  );
+  return classifiedShows.filter((s) => titleMatches(s.title, searchTerm));
 };
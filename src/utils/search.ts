@@ -0,0 +1,110 @@
+// Trigram title index built by scripts/tmdb/shared/search_index.py
+export interface SearchIndex {
+  v: number;
+  n: number; // gram size
+  size: number; // rows in list.json
+  grams: Record<string, number[]>; // delta-encoded row numbers
+}
+
+// Letters NFKD leaves whole, spelled out in ASCII (ASCII_FOLDS in io_utils.py)
+const ASCII_FOLDS: Record<string, string> = {
+  ß: "ss", æ: "ae", œ: "oe", ø: "o", đ: "d", ð: "d", ł: "l", þ: "th", ı: "i",
+};
+const FOLDED_LETTERS = new RegExp(`[${Object.keys(ASCII_FOLDS).join("")}]`, "g");
+
+// Same key as normalize_title in scripts/tmdb/shared/io_utils.py: NFKD,
+// lowercase, ASCII-fold, letters and digits only (fixtures/search_cases.json)
+export const normalizeTitle = (title: string): string =>
+  title
+    .normalize("NFKD")
+    .toLowerCase()
+    .replace(FOLDED_LETTERS, (letter) => ASCII_FOLDS[letter])
+    .replace(/[^a-z0-9]+/g, "");
+
+// Linear equivalent of searchTitles (title_matches in search_index.py).
+// Queries with no letters or digits left ("!!!", CJK) match as plain substrings.
+export const titleMatches = (title: string, query: string): boolean => {
+  const key = normalizeTitle(query);
+  if (key) return normalizeTitle(title).includes(key);
+  return title.toLowerCase().includes(query.trim().toLowerCase());
+};
+
+const titleGrams = (key: string, n: number): Set<string> => {
+  const grams = new Set<string>();
+  if (key.length < n) {
+    if (key) grams.add(key);
+    return grams;
+  }
+  for (let i = 0; i <= key.length - n; i++) grams.add(key.slice(i, i + n));
+  return grams;
+};
+
+const decoded = new WeakMap<number[], number[]>();
+
+const postings = (deltas: number[]): number[] => {
+  let rows = decoded.get(deltas);
+  if (!rows) {
+    rows = [];
+    let total = 0;
+    for (const delta of deltas) {
+      total += delta;
+      rows.push(total);
+    }
+    decoded.set(deltas, rows);
+  }
+  return rows;
+};
+
+const intersect = (left: number[], right: number[]): number[] => {
+  const result: number[] = [];
+  let i = 0;
+  let j = 0;
+  while (i < left.length && j < right.length) {
+    if (left[i] === right[j]) {
+      result.push(left[i]);
+      i++;
+      j++;
+    } else if (left[i] < right[j]) {
+      i++;
+    } else {
+      j++;
+    }
+  }
+  return result;
+};
+
+// Rows whose normalized title contains the normalized query (mirrors search())
+export const searchTitles = (
+  index: SearchIndex,
+  titles: (row: number) => string,
+  query: string,
+): number[] => {
+  const key = normalizeTitle(query);
+  if (!key) {
+    return Array.from({ length: index.size }, (_, row) => row).filter((row) =>
+      titleMatches(titles(row), query),
+    );
+  }
+
+  if (key.length < index.n) {
+    const rows = new Set<number>();
+    for (const [gram, deltas] of Object.entries(index.grams)) {
+      if (gram.includes(key)) postings(deltas).forEach((row) => rows.add(row));
+    }
+    return [...rows].sort((a, b) => a - b);
+  }
+
+  const queryGrams = [...titleGrams(key, index.n)];
+  if (queryGrams.some((gram) => !(gram in index.grams))) return [];
+
+  queryGrams.sort((a, b) => index.grams[a].length - index.grams[b].length);
+  let candidates = postings(index.grams[queryGrams[0]]);
+  for (const gram of queryGrams.slice(1)) {
+    if (candidates.length === 0) break;
+    candidates = intersect(candidates, postings(index.grams[gram]));
+  }
+
+  if (key.length === index.n) return candidates;
+  // Trigrams can all be present without being contiguous
+  return candidates.filter((row) => normalizeTitle(titles(row)).includes(key));
+};